@@ -42,6 +42,8 @@ class TrackingService {
     this.socket.on('connect', () => {
       console.log('Socket.IO connected successfully');
       this.reconnectAttempts = 0;
+      // Suscribirse a la sala de la placa (también al reconectar)
+      this.socket?.emit('subscribe_plate', { plate });
     });
 
     this.socket.on('connect_error', (error) => {
@@ -62,14 +64,16 @@ class TrackingService {
       }
     });
 
-    // Escuchar eventos específicos de la placa
-    this.socket.on(plate, (data) => {
+    // El servidor emite a la sala de la placa un frame por tick
+    this.socket.on('positions', (frame) => {
       try {
-        console.log('Received data for plate', plate, ':', data);
-        if (data && typeof data === 'object' && 'lat' in data && 'lng' in data) {
+        if (!Array.isArray(frame)) {
+          console.warn('Received invalid positions frame:', frame);
+          return;
+        }
+        const data = frame.find((item) => item && item.plate === plate);
+        if (data && 'lat' in data && 'lng' in data) {
           this.notifyListeners({ lat: data.lat, lng: data.lng });
-        } else {
-          console.warn('Received invalid coordinate data:', data);
         }
       } catch (error) {
         console.error('Error processing coordinate data:', error);
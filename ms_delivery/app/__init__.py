@@ -22,6 +22,9 @@ def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
 
+    from app.business.services import json_provider
+    json_provider.init_app(app)
+
     # Configuración CORS global
     CORS(app, 
          resources={r"/*": {
@@ -35,21 +38,55 @@ def create_app(config_class=Config):
          supports_credentials=True
     )
 
+    from app.business.services import database_profile
+    database_profile.configure(app)
     db.init_app(app)
+    with app.app_context():
+        database_profile.apply(app, db.engine)
     socketio.init_app(app, 
                      cors_allowed_origins=["http://localhost:5173", "http://127.0.0.1:5173", "http://localhost:5000", "http://127.0.0.1:5000"],
-                     async_mode="eventlet")
+                     async_mode="eventlet",
+                     # Con varios workers las emisiones pasan por la cola compartida
+                     message_queue=app.config.get('SOCKETIO_MESSAGE_QUEUE'))
 
     from app.presentation.routes import main_bp
     app.register_blueprint(main_bp)
 
+    # Eventos de suscripción del tracking en tiempo real
+    from app.presentation import sockets
+
+    from app.business.controllers.motorcycle_controller import (
+        eta_service, fleet_scheduler, init_tracking, position_history, route_planner
+    )
+    init_tracking(app)
+    position_history.init_app(app)
+    fleet_scheduler.init_app(app)
+    route_planner.init_app(app)
+    eta_service.init_app(app)
+
+    from app.business.controllers.menu_controller import catalog_cache, menu_cache
+    menu_cache.init_app(app, socketio.start_background_task)
+    catalog_cache.init_app(app, socketio.start_background_task)
+
+    from app.business.controllers.order_controller import order_events
+    order_events.init_app(app, socketio)
+
+    from app.business.controllers.dispatch_controller import dispatch_engine
+    dispatch_engine.init_app(app, socketio)
+
     from app.business.models import restaurant, product, menu, customer, order, address
-    from app.business.models import motorcycle, driver, shift, issue, photo
+    from app.business.models import motorcycle, driver, shift, issue, photo, order_rollup
 
     basedir = os.path.abspath(os.path.dirname(__file__))
     app.config['UPLOAD_FOLDER'] = os.path.join(basedir, 'uploads')
     
+    from app import migrations
+    migrations.init_app(app)
+
     with app.app_context():
         db.create_all()
+        # Aplicar las migraciones pendientes sobre bases existentes
+        if app.config.get('AUTO_MIGRATE', True):
+            migrations.upgrade(db.engine)
 
     return app
@@ -1,12 +1,15 @@
 from app import db
 from app.business.models.address import Address
 from flask import jsonify
+from app.business.services.list_query import list_page
 
 class AddressController:
+    # Columnas filtrables en el listado (ver services/list_query.py)
+    LIST_FILTERS = ('order_id', 'city', 'created_at')
+
     @staticmethod
-    def get_all():
-        addresses = Address.query.all()
-        return [address.to_dict() for address in addresses]
+    def get_all(args=None, stream=False):
+        return list_page(Address.query, Address, args, filters=AddressController.LIST_FILTERS, stream=stream)
     
     @staticmethod
     def get_by_id(address_id):
@@ -22,7 +25,9 @@ class AddressController:
                 city=data.get('city'),
                 state=data.get('state'),
                 postal_code=data.get('postal_code'),
-                additional_info=data.get('additional_info')
+                additional_info=data.get('additional_info'),
+                latitude=data.get('latitude'),
+                longitude=data.get('longitude')
             )
             
             db.session.add(new_address)
@@ -47,6 +52,10 @@ class AddressController:
             address.postal_code = data['postal_code']
         if 'additional_info' in data:
             address.additional_info = data['additional_info']
+        if 'latitude' in data:
+            address.latitude = data['latitude']
+        if 'longitude' in data:
+            address.longitude = data['longitude']
         
         db.session.commit()
         
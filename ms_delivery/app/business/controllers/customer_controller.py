@@ -1,12 +1,17 @@
 from app import db
 from app.business.models.customer import Customer
+from app.business.models.order import Order
 from flask import jsonify
+from app.business.services.list_query import list_page
+from app.business.services import order_rollups
 
 class CustomerController:
+    # Columnas filtrables en el listado (ver services/list_query.py)
+    LIST_FILTERS = ('email', 'created_at')
+
     @staticmethod
-    def get_all():
-        customers = Customer.query.all()
-        return [customer.to_dict() for customer in customers]
+    def get_all(args=None, stream=False):
+        return list_page(Customer.query, Customer, args, filters=CustomerController.LIST_FILTERS, stream=stream)
     
     @staticmethod
     def get_by_id(customer_id):
@@ -44,6 +49,8 @@ class CustomerController:
     @staticmethod
     def delete(customer_id):
         customer = Customer.query.get_or_404(customer_id)
+        # Las órdenes del cliente se borran en cascada: descontarlas de los reportes
+        order_rollups.remove(Order.customer_id == customer_id)
         
         db.session.delete(customer)
         db.session.commit()
@@ -0,0 +1,17 @@
+from app.business.controllers.motorcycle_controller import fleet_scheduler
+from app.business.controllers.order_controller import order_events
+from app.business.services.dispatch import DispatchEngine
+
+# Despacho por lotes con las posiciones vivas del tracking; se configura en create_app
+dispatch_engine = DispatchEngine(fleet_scheduler.index, order_events)
+
+
+class DispatchController:
+    @staticmethod
+    def run():
+        """Ejecuta un ciclo de despacho ahora, sin esperar al intervalo"""
+        return dispatch_engine.run_once()
+
+    @staticmethod
+    def status():
+        return dispatch_engine.status()
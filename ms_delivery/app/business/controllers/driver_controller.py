@@ -1,12 +1,15 @@
 from app import db
 from app.business.models.driver import Driver
 from flask import jsonify
+from app.business.services.list_query import list_page
 
 class DriverController:
+    # Columnas filtrables en el listado (ver services/list_query.py)
+    LIST_FILTERS = ('status', 'created_at')
+
     @staticmethod
-    def get_all():
-        drivers = Driver.query.all()
-        return [driver.to_dict() for driver in drivers]
+    def get_all(args=None, stream=False):
+        return list_page(Driver.query, Driver, args, filters=DriverController.LIST_FILTERS, stream=stream)
     
     @staticmethod
     def get_by_id(driver_id):
@@ -2,18 +2,42 @@ from app import db
 from app.business.models.issue import Issue
 from datetime import datetime
 from flask import jsonify
+from sqlalchemy.orm import selectinload, undefer
+from app.business.services.list_query import list_page, parse_fields
 
 class IssueController:
+    # Columnas filtrables en el listado (ver services/list_query.py)
+    LIST_FILTERS = ('status', 'issue_type', 'motorcycle_id', 'date_reported', 'created_at')
 
     @staticmethod
-    def get_by_motorcycle_id(motorcycle_id):
-        issues = Issue.query.filter_by(motorcycle_id=motorcycle_id).all()
-        return [issue.to_dict() for issue in issues]
+    def _list(query, args, stream):
+        args = args or {}
+        fields = parse_fields(args, Issue) or ()
+        if args.get('summary') in ('1', 'true') or ('photo_count' in fields and 'photos' not in fields):
+            # Resumen o photo_count en fields: el conteo de fotos se calcula en la misma consulta
+            return list_page(query.options(undefer(Issue.photo_count)), Issue, args,
+                             filters=IssueController.LIST_FILTERS, stream=stream,
+                             serialize=Issue.to_summary_dict)
+        if 'photo_count' in fields:
+            # Fotos y conteo: to_dict más el conteo calculado en SQL
+            return list_page(query.options(undefer(Issue.photo_count)), Issue, args,
+                             filters=IssueController.LIST_FILTERS, eager=(selectinload(Issue.photos),),
+                             stream=stream, serialize=IssueController._with_photo_count)
+        # Las fotos de todos los reportes de la página se cargan en una sola consulta IN
+        return list_page(query, Issue, args, filters=IssueController.LIST_FILTERS,
+                         eager=(selectinload(Issue.photos),), stream=stream)
 
     @staticmethod
-    def get_all():
-        issues = Issue.query.all()
-        return [issue.to_dict() for issue in issues]
+    def _with_photo_count(issue):
+        return {**issue.to_dict(), 'photo_count': issue.photo_count}
+
+    @staticmethod
+    def get_by_motorcycle_id(motorcycle_id, args=None, stream=False):
+        return IssueController._list(Issue.query.filter_by(motorcycle_id=motorcycle_id), args, stream)
+
+    @staticmethod
+    def get_all(args=None, stream=False):
+        return IssueController._list(Issue.query, args, stream)
     
     @staticmethod
     def get_by_id(issue_id):
@@ -1,12 +1,36 @@
 from app import db
 from app.business.models.menu import Menu
+from app.business.models.order import Order
 from flask import jsonify
+from sqlalchemy.orm import joinedload
+from app.business.services.list_query import list_page
+from app.business.services import order_rollups
+from app.business.services.menu_cache import MenuCache
+from app.business.services.row_serializer import RowSerializer
+from app.business.services.response_cache import ResponseCache
+
+# Precios y disponibilidad de los menús para cotizar órdenes sin ir a la base
+menu_cache = MenuCache()
+
+# Respuestas HTTP del catálogo (restaurantes, productos y menús)
+catalog_cache = ResponseCache('catalog')
 
 class MenuController:
+    # Columnas filtrables en el listado (ver services/list_query.py)
+    LIST_FILTERS = ('restaurant_id', 'product_id', 'availability', 'created_at')
+
+    # Menu.to_dict sobre filas Core para los listados
+    ROWS = RowSerializer(Menu, Menu.product, Menu.restaurant)
+
     @staticmethod
-    def get_all():
-        menus = Menu.query.all()
-        return [menu.to_dict() for menu in menus]
+    def _eager():
+        # Relaciones que serializa Menu.to_dict
+        return (joinedload(Menu.product), joinedload(Menu.restaurant))
+
+    @staticmethod
+    def get_all(args=None, stream=False):
+        return list_page(Menu.query, Menu, args, filters=MenuController.LIST_FILTERS, eager=MenuController._eager(),
+                         stream=stream, row_serializer=MenuController.ROWS)
     
     @staticmethod
     def get_by_id(menu_id):
@@ -24,6 +48,7 @@ class MenuController:
         
         db.session.add(new_menu)
         db.session.commit()
+        catalog_cache.invalidate('menus')
         
         return new_menu.to_dict(), 201
     
@@ -32,6 +57,9 @@ class MenuController:
         menu = Menu.query.get_or_404(menu_id)
         
         if 'restaurant_id' in data:
+            if data['restaurant_id'] != menu.restaurant_id:
+                # Las órdenes del menú pasan a contar para el nuevo restaurante
+                order_rollups.move(Order.menu_id == menu.id, restaurant_id=data['restaurant_id'])
             menu.restaurant_id = data['restaurant_id']
         if 'product_id' in data:
             menu.product_id = data['product_id']
@@ -41,19 +69,33 @@ class MenuController:
             menu.availability = data['availability']
         
         db.session.commit()
+        menu_cache.invalidate(menu.id)
+        catalog_cache.invalidate('menus')
         
         return menu.to_dict()
     
     @staticmethod
     def delete(menu_id):
         menu = Menu.query.get_or_404(menu_id)
+        # Las órdenes del menú se borran en cascada: descontarlas de los reportes
+        order_rollups.remove(Order.menu_id == menu_id)
         
         db.session.delete(menu)
         db.session.commit()
+        menu_cache.invalidate(menu_id)
+        catalog_cache.invalidate('menus')
         
         return {"message": "Menu item deleted successfully"}, 200
     
     @staticmethod
     def get_by_restaurant_id(restaurant_id):
-        menus = Menu.query.filter_by(restaurant_id=restaurant_id).all()
-        return [menu.to_dict() for menu in menus]
\ No newline at end of file
+        menus = Menu.query.filter_by(restaurant_id=restaurant_id).options(*MenuController._eager()).all()
+        return [menu.to_dict() for menu in menus]
+    
+    @staticmethod
+    def get_cache_stats():
+        return menu_cache.stats()
+    
+    @staticmethod
+    def get_catalog_cache_stats():
+        return catalog_cache.stats()
\ No newline at end of file
@@ -1,40 +1,58 @@
 from app import db,socketio
 from app.business.models.motorcycle import Motorcycle
-from flask import jsonify
-import json
-import eventlet
-import math
-
-# Carga las coordenadas una vez y elimina duplicados
-with open("coordinates/routes/example_1.json", "r") as f:
-    coordenadas_raw = json.load(f)
-    # Eliminar coordenadas duplicadas consecutivas
-    coordenadas = []
-    for i, coord in enumerate(coordenadas_raw):
-        if i == 0 or (coord['lat'] != coordenadas_raw[i-1]['lat'] or coord['lng'] != coordenadas_raw[i-1]['lng']):
-            coordenadas.append(coord)
-
-# Control de tareas activas por placa
-tareas_activas = {}
-
-def calcular_distancia(coord1, coord2):
-    """Calcula la distancia entre dos coordenadas en metros"""
-    R = 6371000  # Radio de la Tierra en metros
-    lat1, lon1 = math.radians(coord1['lat']), math.radians(coord1['lng'])
-    lat2, lon2 = math.radians(coord2['lat']), math.radians(coord2['lng'])
-    
-    dlat = lat2 - lat1
-    dlon = lon2 - lon1
-    
-    a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-    return R * c
+from app.business.models.order import Order
+from app.business.models.menu import Menu
+from app.business.models.restaurant import Restaurant
+from app.business.models.address import Address
+from app.business.services.eta import EtaService
+from app.business.services.fleet_scheduler import FleetScheduler
+from app.business.services.position_history import PositionHistory
+from app.business.services.route_loader import load_route
+from app.business.services.route_planner import RoutePlanner
+from app.business.services.row_serializer import first_related
+from flask import abort, jsonify
+from datetime import datetime, timezone
+from config import Config
+from app.business.services.list_query import list_page
+from app.business.services import order_rollups
+
+ROUTE_FILE = "coordinates/routes/example_1.json"
+
+# Carga la ruta una vez: duplicados eliminados, simplificada y con distancias
+# precalculadas; init_tracking la recarga si la app usa otra ROUTE_TOLERANCE
+ruta = load_route(ROUTE_FILE, tolerance=Config.ROUTE_TOLERANCE)
+ruta_tolerance = Config.ROUTE_TOLERANCE
+
+# Historial de posiciones emitidas; se configura en create_app
+position_history = PositionHistory()
+
+# Un solo scheduler avanza todas las placas activas en cada tick; intervalo,
+# velocidad y estado compartido entre workers se configuran en create_app
+fleet_scheduler = FleetScheduler(socketio, history=position_history)
+
+# ETA de las órdenes en reparto con la ruta y la velocidad de cada placa; se configura en create_app
+eta_service = EtaService(fleet_scheduler)
+fleet_scheduler.eta = eta_service
+
+# Secuencia de paradas de las motocicletas con varias órdenes; se configura en create_app
+route_planner = RoutePlanner()
+
+
+def init_tracking(app):
+    """Ruta simulada con la ROUTE_TOLERANCE (metros) de la app"""
+    global ruta, ruta_tolerance
+    tolerance = float(app.config.get('ROUTE_TOLERANCE', ruta_tolerance))
+    if tolerance != ruta_tolerance:
+        ruta = load_route(ROUTE_FILE, tolerance=tolerance)
+        ruta_tolerance = tolerance
 
 class MotorcycleController:
+    # Columnas filtrables en el listado (ver services/list_query.py)
+    LIST_FILTERS = ('status', 'brand', 'created_at')
+
     @staticmethod
-    def get_all():
-        motorcycles = Motorcycle.query.all()
-        return [motorcycle.to_dict() for motorcycle in motorcycles]
+    def get_all(args=None, stream=False):
+        return list_page(Motorcycle.query, Motorcycle, args, filters=MotorcycleController.LIST_FILTERS, stream=stream)
     
     @staticmethod
     def get_by_id(motorcycle_id):
@@ -75,6 +93,8 @@ class MotorcycleController:
     @staticmethod
     def delete(motorcycle_id):
         motorcycle = Motorcycle.query.get_or_404(motorcycle_id)
+        # Sus órdenes quedan sin motocicleta asignada
+        order_rollups.move(Order.motorcycle_id == motorcycle_id, motorcycle_id=None)
         
         db.session.delete(motorcycle)
         db.session.commit()
@@ -84,43 +104,86 @@ class MotorcycleController:
 
 
     @staticmethod
-    def start_tracking_by_plate(plate):
-        motorcycle = Motorcycle.query.filter_by(license_plate=plate).first()
+    def start_tracking_by_plate(plate, speed=None):
+        # Solo el id: la consulta se resuelve con el índice único de license_plate
+        motorcycle = db.session.query(Motorcycle.id).filter_by(license_plate=plate).first()
         if not motorcycle:
             return {"status": "error", "message": "Motocicleta no encontrada"}, 404
 
-        if plate in tareas_activas:
+        if not fleet_scheduler.start(plate, ruta, speed):
             return {"status": "ok", "message": f"Transmisión ya activa para {plate}"}
 
-        # Inicia la transmisión de coordenadas en segundo plano
-        socketio.start_background_task(MotorcycleController._emit_coordinates, plate)
-        tareas_activas[plate] = True
         return {"status": "ok", "message": f"Transmisión iniciada para {plate}"}
 
     @staticmethod
-    def _emit_coordinates(plate):
-        i = 0
-        total = len(coordenadas)
-        ultima_coord = None
-        umbral_distancia = 5  # metros
-
-        while tareas_activas.get(plate, False):
-            coord = coordenadas[i]
-            
-            # Solo emitir si la distancia es significativa
-            if ultima_coord is None or calcular_distancia(ultima_coord, coord) >= umbral_distancia:
-                socketio.emit(plate, coord)
-                print(f"[{plate}] Emitiendo coordenada {i}: {coord}")
-                ultima_coord = coord
-            
-            i = (i + 1) % total
-            eventlet.sleep(3)
+    def get_nearby(lat, lng, k=10, radius=5000):
+        """Motocicletas en transmisión más cercanas al punto, según el índice espacial"""
+        nearby = fleet_scheduler.index.nearest(lat, lng, k=k, radius=radius)
+        return [
+            {"plate": plate, "lat": p_lat, "lng": p_lng, "distance": round(distance, 1)}
+            for distance, plate, p_lat, p_lng in nearby
+        ]
+
+    @staticmethod
+    def get_route_plan(motorcycle_id, budget=None):
+        """
+        Orden de las paradas (recogida en el restaurante y entrega en la
+        dirección) de las órdenes abiertas de la motocicleta, desde su
+        posición actual si está en transmisión
+        """
+        motorcycle = db.session.query(Motorcycle.id, Motorcycle.license_plate).filter_by(id=motorcycle_id).first()
+        if not motorcycle:
+            abort(404)
+        rows = db.session.query(
+            Order.id, Restaurant.latitude, Restaurant.longitude,
+            Address.latitude.label('address_latitude'), Address.longitude.label('address_longitude')
+        ).join(Menu, Order.menu_id == Menu.id).join(Restaurant, Menu.restaurant_id == Restaurant.id) \
+            .outerjoin(first_related(Order.address)) \
+            .filter(Order.motorcycle_id == motorcycle_id, Order.status.in_(('pending', 'in_progress'))) \
+            .order_by(Order.id).all()
+
+        orders, unplanned = [], []
+        for row in rows:
+            if None in (row.latitude, row.longitude, row.address_latitude, row.address_longitude):
+                unplanned.append(row.id)
+                continue
+            orders.append((row.id, (row.latitude, row.longitude), (row.address_latitude, row.address_longitude)))
+
+        position = fleet_scheduler.index.positions.get(motorcycle.license_plate)
+        start = position[:2] if position else None
+        plan = route_planner.plan(orders, start, budget)
+        cumulative = 0.0
+        stops = []
+        for stop, leg in zip(plan.stops, plan.legs):
+            cumulative += leg
+            stops.append({
+                "order_id": stop.order_id, "type": stop.kind, "lat": stop.lat, "lng": stop.lng,
+                "distance": round(leg, 1), "cumulative": round(cumulative, 1)
+            })
+        return {
+            "motorcycle_id": motorcycle.id,
+            "plate": motorcycle.license_plate,
+            "start": {"lat": start[0], "lng": start[1]} if start else None,
+            "stops": stops,
+            "distance": round(plan.distance, 1),
+            "initial_distance": round(plan.initial_distance, 1),
+            # Órdenes sin coordenadas de restaurante o de entrega
+            "unplanned": unplanned,
+            "elapsed_ms": round(plan.elapsed * 1000, 2),
+        }
+
+    @staticmethod
+    def get_track(plate, start=None, end=None, limit=None):
+        """Recorrido histórico de la placa entre dos instantes (segundos epoch)"""
+        track = position_history.replay(plate, start, end, limit)
+        return [
+            {"timestamp": datetime.fromtimestamp(ts, timezone.utc).isoformat(), "lat": lat, "lng": lng}
+            for ts, lat, lng in track
+        ]
 
     @staticmethod
     def stop_tracking_by_plate(plate):
-        if plate in tareas_activas:
-            tareas_activas[plate] = False
-            tareas_activas.pop(plate, None)  # Limpieza
+        if fleet_scheduler.stop(plate):
             return {"status": "ok", "message": f"Transmisión detenida para {plate}"}
         else:
             return {"status": "error", "message": f"No hay transmisión activa para {plate}"}, 404
\ No newline at end of file
@@ -2,23 +2,91 @@ from app import db
 from app.business.models.order import Order
 from app.business.models.menu import Menu
 from app.business.models.address import Address
-from flask import jsonify
+from app.business.models.customer import Customer
+from app.business.models.motorcycle import Motorcycle
+from datetime import datetime
+import time
+from flask import abort, jsonify
+from sqlalchemy import insert, update
+from sqlalchemy.orm import joinedload
+from app.business.services.list_query import list_page
+from app.business.services.row_serializer import RowSerializer, first_related
+from app.business.controllers.menu_controller import menu_cache
+from app.business.controllers.motorcycle_controller import eta_service
+from app.business.services import order_rollups
+from app.business.services.order_events import OrderChange, OrderEventPublisher
+
+# Eventos de estado de las órdenes hacia las salas de Socket.IO
+order_events = OrderEventPublisher()
 
 class OrderController:
+    # Columnas filtrables en el listado (ver services/list_query.py)
+    LIST_FILTERS = ('status', 'customer_id', 'menu_id', 'motorcycle_id', 'created_at')
+
+    # Máximo de órdenes por petición de creación masiva
+    BULK_MAX = 1000
+    ADDRESS_FIELDS = ('street', 'city', 'state', 'postal_code', 'additional_info', 'latitude', 'longitude')
+    ADDRESS_REQUIRED = ('street', 'city', 'state', 'postal_code')
+
+    # Order.to_dict sobre filas Core para los listados
+    ROWS = RowSerializer(Order, Order.address, Order.customer, (Order.menu, Menu.product, Menu.restaurant))
+
+    @staticmethod
+    def _eager():
+        # Carga en la misma consulta todo lo que usa Order.to_dict (dirección,
+        # cliente, menú con su producto y restaurante) para evitar N+1
+        return (
+            joinedload(Order.address),
+            joinedload(Order.customer),
+            joinedload(Order.menu).joinedload(Menu.product),
+            joinedload(Order.menu).joinedload(Menu.restaurant),
+        )
+
+    @staticmethod
+    def _with_relations(query):
+        return query.options(*OrderController._eager())
+
     @staticmethod
-    def get_all():
-        orders = Order.query.all()
-        return [order.to_dict() for order in orders]
+    def get_all(args=None, stream=False):
+        return list_page(Order.query, Order, args, filters=OrderController.LIST_FILTERS, eager=OrderController._eager(),
+                         stream=stream, row_serializer=OrderController.ROWS)
     
     @staticmethod
-    def get_by_customer_id(customer_id):
-        orders = Order.query.filter_by(customer_id=customer_id).all()
-        return [order.to_dict() for order in orders]
+    def get_by_customer_id(customer_id, args=None, stream=False):
+        return list_page(Order.query.filter_by(customer_id=customer_id), Order, args,
+                         filters=OrderController.LIST_FILTERS, eager=OrderController._eager(), stream=stream,
+                         row_serializer=OrderController.ROWS)
     
     @staticmethod
     def get_by_id(order_id):
-        order = Order.query.get_or_404(order_id)
+        order = OrderController._with_relations(Order.query).filter_by(id=order_id).first_or_404()
         return order.to_dict()
+
+    @staticmethod
+    def get_eta(order_id):
+        """
+        Tiempo estimado de llegada de la orden: una lectura por llave primaria y
+        la posición y velocidad de su motocicleta en el tracking
+        """
+        row = db.session.query(
+            Order.id, Order.status, Order.motorcycle_id, Motorcycle.license_plate, Address.latitude, Address.longitude
+        ).outerjoin(Motorcycle, Order.motorcycle_id == Motorcycle.id) \
+            .outerjoin(first_related(Order.address)) \
+            .filter(Order.id == order_id).first()
+        if not row:
+            abort(404)
+        result = {"order_id": row.id, "status": row.status, "motorcycle_id": row.motorcycle_id,
+                  "plate": row.license_plate}
+
+        if row.status not in ('pending', 'in_progress'):
+            return {**result, "eta": None, "reason": "closed"}
+        if row.license_plate is None:
+            return {**result, "eta": None, "reason": "unassigned"}
+        estimate = eta_service.estimate(row.license_plate, row.latitude, row.longitude)
+        if estimate is None:
+            # La motocicleta no transmite o la simula otro worker
+            return {**result, "eta": None, "reason": "not_tracked"}
+        return {**result, **eta_service.describe(estimate, time.time())}
     
     @staticmethod
     def create(data):
@@ -31,9 +99,11 @@ class OrderController:
                     raise Exception("Dirección no encontrada")
 
             # Check if the menu item exists and calculate total price
-            menu_item = Menu.query.get_or_404(data.get('menu_id'))
+            pricing = menu_cache.get(data.get('menu_id'))
+            if pricing is None:
+                abort(404)
             quantity = data.get('quantity', 1)
-            total_price = menu_item.price * quantity
+            total_price = pricing.price * quantity
             
             new_order = Order(
                 customer_id=data.get('customer_id'),
@@ -49,35 +119,175 @@ class OrderController:
                 address.order_id = new_order.id
             
             db.session.add(new_order)
+            db.session.flush()
+            order_rollups.record(added=[order_rollups.facts(new_order, pricing.restaurant_id)])
             db.session.commit()
+            order_events.publish([OrderController._change(new_order, pricing.restaurant_id)])
             
             return new_order.to_dict()
         except Exception as e:
             db.session.rollback()
             raise Exception(f"Error al crear la orden: {str(e)}")
     
+    @staticmethod
+    def _bulk_error(item, menus, customers, addresses):
+        """Motivo por el que un elemento del lote no se puede crear, o None"""
+        if not isinstance(item, dict):
+            return "Cada orden debe ser un objeto"
+        if item.get('customer_id') not in customers:
+            return "Cliente no encontrado"
+        if item.get('menu_id') not in menus:
+            return "Menú no encontrado"
+        quantity = item.get('quantity', 1)
+        if not isinstance(quantity, int) or isinstance(quantity, bool) or quantity < 1:
+            return "quantity debe ser un entero positivo"
+        if 'address_id' in item and item['address_id'] not in addresses:
+            return "Dirección no encontrada"
+        address = item.get('address')
+        if address is not None:
+            if not isinstance(address, dict):
+                return "address debe ser un objeto"
+            missing = [field for field in OrderController.ADDRESS_REQUIRED if not address.get(field)]
+            if missing:
+                return f"Faltan campos de la dirección: {', '.join(missing)}"
+        return None
+
+    @staticmethod
+    def _ids(items, key):
+        return {item[key] for item in items if isinstance(item, dict) and isinstance(item.get(key), int)}
+
+    @staticmethod
+    def create_bulk(items):
+        """
+        Crea varias órdenes en una sola transacción.
+
+        Los precios de todos los menús, los clientes y las direcciones
+        referenciadas se consultan con un IN cada uno; las órdenes y las
+        direcciones nuevas (`address`) se insertan por lotes. Los elementos
+        inválidos se reportan en su posición y no impiden crear los demás.
+        """
+        if not isinstance(items, list) or not items:
+            return {"error": "Se espera una lista de órdenes"}, 400
+        if len(items) > OrderController.BULK_MAX:
+            return {"error": f"Máximo {OrderController.BULK_MAX} órdenes por petición"}, 400
+
+        menu_ids = OrderController._ids(items, 'menu_id')
+        customer_ids = OrderController._ids(items, 'customer_id')
+        address_ids = OrderController._ids(items, 'address_id')
+        menus = menu_cache.get_many(menu_ids)
+        customers = {row.id for row in db.session.query(Customer.id).filter(Customer.id.in_(customer_ids))} if customer_ids else set()
+        addresses = {row.id for row in db.session.query(Address.id).filter(Address.id.in_(address_ids))} if address_ids else set()
+
+        results = [None] * len(items)
+        rows, valid = [], []
+        now = datetime.utcnow()
+        for index, item in enumerate(items):
+            error = OrderController._bulk_error(item, menus, customers, addresses)
+            if error:
+                results[index] = {"index": index, "status": "error", "error": error}
+                continue
+            quantity = item.get('quantity', 1)
+            rows.append({
+                'customer_id': item['customer_id'],
+                'menu_id': item['menu_id'],
+                'motorcycle_id': item.get('motorcycle_id'),
+                'quantity': quantity,
+                'total_price': menus[item['menu_id']].price * quantity,
+                'status': item.get('status', 'pending'),
+                'created_at': now,
+            })
+            valid.append(index)
+
+        if rows:
+            try:
+                # RETURNING en el mismo orden de los parámetros para asociar las direcciones
+                ids = db.session.scalars(
+                    insert(Order).returning(Order.id, sort_by_parameter_order=True), rows
+                ).all()
+                new_addresses, moved_addresses = [], []
+                for index, order_id in zip(valid, ids):
+                    item = items[index]
+                    if item.get('address') is not None:
+                        address = {field: item['address'].get(field) for field in OrderController.ADDRESS_FIELDS}
+                        new_addresses.append({**address, 'order_id': order_id, 'created_at': now})
+                    elif 'address_id' in item:
+                        moved_addresses.append({'id': item['address_id'], 'order_id': order_id})
+                if new_addresses:
+                    db.session.execute(insert(Address), new_addresses)
+                if moved_addresses:
+                    db.session.execute(update(Address), moved_addresses)
+                order_rollups.record(added=[
+                    order_rollups.OrderFacts(now.date(), row['status'], menus[row['menu_id']].restaurant_id,
+                                             row['motorcycle_id'], 1, row['total_price'])
+                    for row in rows
+                ])
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                raise Exception(f"Error al crear las órdenes: {str(e)}")
+
+            for index, order_id, row in zip(valid, ids, rows):
+                order = {**row, 'id': order_id, 'created_at': now.isoformat()}
+                results[index] = {"index": index, "status": "created", "order": order}
+            order_events.publish([
+                OrderChange(order_id, row['status'], None, row['customer_id'],
+                            menus[row['menu_id']].restaurant_id, row['motorcycle_id'], None)
+                for order_id, row in zip(ids, rows)
+            ])
+
+        created = len(rows)
+        summary = {"created": created, "failed": len(items) - created, "results": results}
+        if created == len(items):
+            return summary, 201
+        # 207: resultado mixto, cada elemento trae su propio estado
+        return summary, 207 if created else 400
+
+    @staticmethod
+    def _menu_pricing(menu_id):
+        pricing = menu_cache.get(menu_id)
+        if pricing is None:
+            abort(404)
+        return pricing
+
+    @staticmethod
+    def _menu_price(menu_id):
+        return OrderController._menu_pricing(menu_id).price
+
+    @staticmethod
+    def _facts(order):
+        return order_rollups.facts(order, OrderController._menu_pricing(order.menu_id).restaurant_id)
+
+    @staticmethod
+    def _change(order, restaurant_id, previous=None, previous_motorcycle_id=None, status=None):
+        return OrderChange(order.id, status or order.status, previous, order.customer_id,
+                           restaurant_id, order.motorcycle_id, previous_motorcycle_id)
+
     @staticmethod
     def update(order_id, data):
         order = Order.query.get_or_404(order_id)
+        previous = OrderController._facts(order)
         
         if 'customer_id' in data:
             order.customer_id = data['customer_id']
         if 'menu_id' in data:
             order.menu_id = data['menu_id']
             # Recalculate total price if menu or quantity changes
-            menu_item = Menu.query.get_or_404(data['menu_id'])
-            order.total_price = menu_item.price * order.quantity
+            order.total_price = OrderController._menu_price(data['menu_id']) * order.quantity
         if 'motorcycle_id' in data:
             order.motorcycle_id = data['motorcycle_id']
         if 'quantity' in data:
             order.quantity = data['quantity']
             # Recalculate total price
-            menu_item = Menu.query.get_or_404(order.menu_id)
-            order.total_price = menu_item.price * data['quantity']
+            order.total_price = OrderController._menu_price(order.menu_id) * data['quantity']
         if 'status' in data:
             order.status = data['status']
         
+        current = OrderController._facts(order)
+        order_rollups.record(added=[current], removed=[previous])
         db.session.commit()
+        if (current.status, current.motorcycle_id) != (previous.status, previous.motorcycle_id):
+            order_events.publish([OrderController._change(order, current.restaurant_id, previous.status,
+                                                          previous.motorcycle_id)])
         
         return order.to_dict()
     
@@ -85,7 +295,11 @@ class OrderController:
     def delete(order_id):
         order = Order.query.get_or_404(order_id)
         
+        facts = OrderController._facts(order)
+        change = OrderController._change(order, facts.restaurant_id, order.status, order.motorcycle_id, status='deleted')
+        order_rollups.record(removed=[facts])
         db.session.delete(order)
         db.session.commit()
+        order_events.publish([change])
         
         return {"message": "Order deleted successfully"}, 200
\ No newline at end of file
@@ -6,12 +6,15 @@ from flask import current_app
 from werkzeug.utils import secure_filename
 import os
 from flask import send_file, abort,send_from_directory
+from app.business.services.list_query import list_page
 
 class PhotoController:
+    # Columnas filtrables en el listado (ver services/list_query.py)
+    LIST_FILTERS = ('issue_id', 'taken_at', 'created_at')
+
     @staticmethod
-    def get_all():
-        photos = Photo.query.all()
-        return [photo.to_dict() for photo in photos]
+    def get_all(args=None, stream=False):
+        return list_page(Photo.query, Photo, args, filters=PhotoController.LIST_FILTERS, stream=stream)
     
     @staticmethod
     def get_by_id(photo_id):
@@ -1,12 +1,18 @@
 from app import db
 from app.business.models.product import Product
 from flask import jsonify
+from app.business.models.order import Order
+from app.business.controllers.menu_controller import catalog_cache, menu_cache
+from app.business.services import order_rollups
+from app.business.services.list_query import list_page
 
 class ProductController:
+    # Columnas filtrables en el listado (ver services/list_query.py)
+    LIST_FILTERS = ('category', 'created_at')
+
     @staticmethod
-    def get_all():
-        products = Product.query.all()
-        return [product.to_dict() for product in products]
+    def get_all(args=None, stream=False):
+        return list_page(Product.query, Product, args, filters=ProductController.LIST_FILTERS, stream=stream)
     
     @staticmethod
     def get_by_id(product_id):
@@ -24,6 +30,7 @@ class ProductController:
         
         db.session.add(new_product)
         db.session.commit()
+        catalog_cache.invalidate('products')
         
         return new_product.to_dict(), 201
     
@@ -41,14 +48,23 @@ class ProductController:
             product.category = data['category']
         
         db.session.commit()
+        # Los menús incluyen el producto en su respuesta
+        catalog_cache.invalidate('products', 'menus')
         
         return product.to_dict()
     
     @staticmethod
     def delete(product_id):
         product = Product.query.get_or_404(product_id)
+        # Los menús se borran en cascada: sacarlos también de la caché de precios
+        menu_ids = [menu.id for menu in product.menus]
+        # Y con ellos sus órdenes: descontarlas de los reportes
+        if menu_ids:
+            order_rollups.remove(Order.menu_id.in_(menu_ids))
         
         db.session.delete(product)
         db.session.commit()
+        menu_cache.invalidate(*menu_ids)
+        catalog_cache.invalidate('products', 'menus')
         
         return {"message": "Product deleted successfully"}, 200
\ No newline at end of file
@@ -0,0 +1,78 @@
+from app import db
+from app.business.models.motorcycle import Motorcycle
+from app.business.models.restaurant import Restaurant
+from app.business.services import order_rollups
+from app.business.services.list_query import parse_datetime
+
+
+class ReportController:
+    """
+    Reportes de órdenes para el dashboard, leídos de los rollups
+    (services/order_rollups.py): el costo depende del número de buckets.
+
+    Todos aceptan `from` (inclusive) y `to` (exclusive), fechas ISO 8601 o
+    epoch, sobre el día de creación de las órdenes (UTC).
+    """
+
+    @staticmethod
+    def _range(args):
+        args = args or {}
+        bounds = []
+        for name in ('from', 'to'):
+            value = args.get(name)
+            if not value:
+                bounds.append(None)
+                continue
+            try:
+                bounds.append(parse_datetime(value).date())
+            except ValueError:
+                raise ValueError(f"{name} debe ser una fecha ISO 8601 o epoch")
+        return bounds
+
+    @staticmethod
+    def _rows(dimension, args, by_day=False):
+        day_from, day_to = ReportController._range(args)
+        return order_rollups.report(dimension, day_from, day_to, by_day=by_day)
+
+    @staticmethod
+    def _names(model, column, ids):
+        if not ids:
+            return {}
+        return dict(db.session.query(model.id, column).filter(model.id.in_(ids)))
+
+    @staticmethod
+    def orders_by_status(args=None):
+        return [
+            {'status': status, 'orders': orders, 'revenue': round(revenue, 2)}
+            for status, orders, revenue in ReportController._rows('status', args)
+        ]
+
+    @staticmethod
+    def orders_per_day(args=None):
+        # La suma de los buckets de estado de cada día cubre todas sus órdenes
+        return [
+            {'day': day.isoformat(), 'orders': orders, 'revenue': round(revenue, 2)}
+            for day, orders, revenue in ReportController._rows('status', args, by_day=True)
+        ]
+
+    @staticmethod
+    def orders_per_restaurant(args=None):
+        rows = ReportController._rows('restaurant', args)
+        names = ReportController._names(Restaurant, Restaurant.name, [int(bucket) for bucket, _, _ in rows])
+        return [
+            {'restaurant_id': int(bucket), 'restaurant_name': names.get(int(bucket)),
+             'orders': orders, 'revenue': round(revenue, 2)}
+            for bucket, orders, revenue in rows
+        ]
+
+    @staticmethod
+    def orders_per_motorcycle(args=None):
+        rows = ReportController._rows('motorcycle', args)
+        ids = [int(bucket) for bucket, _, _ in rows if bucket != order_rollups.UNASSIGNED]
+        plates = ReportController._names(Motorcycle, Motorcycle.license_plate, ids)
+        report = []
+        for bucket, orders, revenue in rows:
+            motorcycle_id = None if bucket == order_rollups.UNASSIGNED else int(bucket)
+            report.append({'motorcycle_id': motorcycle_id, 'license_plate': plates.get(motorcycle_id),
+                           'orders': orders, 'revenue': round(revenue, 2)})
+        return report
@@ -1,12 +1,18 @@
 from app import db
 from app.business.models.restaurant import Restaurant
 from flask import jsonify
+from app.business.models.order import Order
+from app.business.controllers.menu_controller import catalog_cache, menu_cache
+from app.business.services import order_rollups
+from app.business.services.list_query import list_page
 
 class RestaurantController:
+    # Columnas filtrables en el listado (ver services/list_query.py)
+    LIST_FILTERS = ('name', 'created_at')
+
     @staticmethod
-    def get_all():
-        restaurants = Restaurant.query.all()
-        return [restaurant.to_dict() for restaurant in restaurants]
+    def get_all(args=None, stream=False):
+        return list_page(Restaurant.query, Restaurant, args, filters=RestaurantController.LIST_FILTERS, stream=stream)
     
     @staticmethod
     def get_by_id(restaurant_id):
@@ -19,11 +25,14 @@ class RestaurantController:
             name=data.get('name'),
             address=data.get('address'),
             phone=data.get('phone'),
-            email=data.get('email')
+            email=data.get('email'),
+            latitude=data.get('latitude'),
+            longitude=data.get('longitude')
         )
         
         db.session.add(new_restaurant)
         db.session.commit()
+        catalog_cache.invalidate('restaurants')
         
         return new_restaurant.to_dict(), 201
     
@@ -39,16 +48,29 @@ class RestaurantController:
             restaurant.phone = data['phone']
         if 'email' in data:
             restaurant.email = data['email']
+        if 'latitude' in data:
+            restaurant.latitude = data['latitude']
+        if 'longitude' in data:
+            restaurant.longitude = data['longitude']
         
         db.session.commit()
+        # Los menús incluyen el restaurante en su respuesta
+        catalog_cache.invalidate('restaurants', 'menus')
         
         return restaurant.to_dict()
     
     @staticmethod
     def delete(restaurant_id):
         restaurant = Restaurant.query.get_or_404(restaurant_id)
+        # Los menús se borran en cascada: sacarlos también de la caché de precios
+        menu_ids = [menu.id for menu in restaurant.menus]
+        # Y con ellos sus órdenes: descontarlas de los reportes
+        if menu_ids:
+            order_rollups.remove(Order.menu_id.in_(menu_ids))
         
         db.session.delete(restaurant)
         db.session.commit()
+        menu_cache.invalidate(*menu_ids)
+        catalog_cache.invalidate('restaurants', 'menus')
         
         return {"message": "Restaurant deleted successfully"}, 200
\ No newline at end of file
@@ -2,8 +2,21 @@ from app import db
 from app.business.models.shift import Shift
 from datetime import datetime
 from flask import jsonify
+from sqlalchemy.orm import joinedload
+from app.business.services.list_query import list_page
+from app.business.services.row_serializer import RowSerializer
 
 class ShiftController:
+    # Columnas filtrables en el listado (ver services/list_query.py)
+    LIST_FILTERS = ('status', 'driver_id', 'motorcycle_id', 'start_time', 'created_at')
+
+    # Shift.to_dict sobre filas Core para los listados
+    ROWS = RowSerializer(Shift, Shift.driver, Shift.motorcycle)
+
+    @staticmethod
+    def _eager():
+        # Relaciones que serializa Shift.to_dict
+        return (joinedload(Shift.driver), joinedload(Shift.motorcycle))
 
     @staticmethod
     def get_by_driver_id(driver_id):
@@ -16,9 +29,9 @@ class ShiftController:
         return [shift.to_dict() for shift in shifts]
 
     @staticmethod
-    def get_all():
-        shifts = Shift.query.all()
-        return [shift.to_dict() for shift in shifts]
+    def get_all(args=None, stream=False):
+        return list_page(Shift.query, Shift, args, filters=ShiftController.LIST_FILTERS, eager=ShiftController._eager(),
+                         stream=stream, row_serializer=ShiftController.ROWS)
     
     @staticmethod
     def get_by_id(shift_id):
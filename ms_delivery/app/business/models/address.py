@@ -5,12 +5,16 @@ class Address(db.Model):
     __tablename__ = 'addresses'
     
     id = db.Column(db.Integer, primary_key=True)
-    order_id = db.Column(db.Integer, db.ForeignKey('orders.id'), nullable=False)
+    # Índice: la dirección se une a cada orden en los listados (migración v0003)
+    order_id = db.Column(db.Integer, db.ForeignKey('orders.id'), nullable=False, index=True)
     street = db.Column(db.String(100), nullable=False)
     city = db.Column(db.String(50), nullable=False)
     state = db.Column(db.String(50), nullable=False)
     postal_code = db.Column(db.String(20), nullable=False)
     additional_info = db.Column(db.Text, nullable=True)
+    # Punto de entrega (migración v0004)
+    latitude = db.Column(db.Float, nullable=True)
+    longitude = db.Column(db.Float, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     # Relationship with Order
@@ -28,5 +32,7 @@ class Address(db.Model):
             'state': self.state,
             'postal_code': self.postal_code,
             'additional_info': self.additional_info,
+            'latitude': self.latitude,
+            'longitude': self.longitude,
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
\ No newline at end of file
@@ -1,8 +1,15 @@
 from app import db
+from app.business.models.photo import Photo
 from datetime import datetime
+from sqlalchemy import func, select
+from sqlalchemy.orm import column_property
 
 class Issue(db.Model):
     __tablename__ = 'issues'
+    # Índices de las consultas frecuentes (migración v0001)
+    __table_args__ = (
+        db.Index('ix_issues_motorcycle_id_id', 'motorcycle_id', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     motorcycle_id = db.Column(db.Integer, db.ForeignKey('motorcycles.id'), nullable=False)
@@ -16,6 +23,12 @@ class Issue(db.Model):
     motorcycle = db.relationship('Motorcycle', back_populates='issues')
     photos = db.relationship('Photo', back_populates='issue', cascade='all, delete-orphan')
     
+    # Cantidad de fotos calculada en SQL; diferida, solo se consulta al pedirla con undefer
+    photo_count = column_property(
+        select(func.count(Photo.id)).where(Photo.issue_id == id).scalar_subquery(),
+        deferred=True
+    )
+    
     def __repr__(self):
         return f'<Issue {self.id}>'
     
@@ -29,4 +42,17 @@ class Issue(db.Model):
             'status': self.status,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'photos': [photo.to_dict() for photo in self.photos] if self.photos else []
+        }
+    
+    def to_summary_dict(self):
+        """Como to_dict pero con photo_count en lugar de las fotos"""
+        return {
+            'id': self.id,
+            'motorcycle_id': self.motorcycle_id,
+            'description': self.description,
+            'issue_type': self.issue_type,
+            'date_reported': self.date_reported.isoformat() if self.date_reported else None,
+            'status': self.status,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'photo_count': self.photo_count
         }
\ No newline at end of file
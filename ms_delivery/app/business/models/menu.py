@@ -3,6 +3,10 @@ from datetime import datetime
 
 class Menu(db.Model):
     __tablename__ = 'menus'
+    # Índices de las consultas frecuentes (migración v0001)
+    __table_args__ = (
+        db.Index('ix_menus_restaurant_id', 'restaurant_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     restaurant_id = db.Column(db.Integer, db.ForeignKey('restaurants.id'), nullable=False)
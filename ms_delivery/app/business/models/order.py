@@ -3,6 +3,12 @@ from datetime import datetime
 
 class Order(db.Model):
     __tablename__ = 'orders'
+    # Índices de las consultas frecuentes (migración v0001)
+    __table_args__ = (
+        db.Index('ix_orders_customer_id_id', 'customer_id', 'id'),
+        db.Index('ix_orders_motorcycle_id', 'motorcycle_id'),
+        db.Index('ix_orders_status_id', 'status', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     customer_id = db.Column(db.Integer, db.ForeignKey('customers.id'), nullable=False)
@@ -0,0 +1,17 @@
+from app import db
+
+
+class OrderRollup(db.Model):
+    """Órdenes y ingresos acumulados por día y por bucket de una dimensión (ver services/order_rollups.py)"""
+    __tablename__ = 'order_rollups'
+
+    day = db.Column(db.Date, primary_key=True)
+    # 'status', 'restaurant' o 'motorcycle'
+    dimension = db.Column(db.String(20), primary_key=True)
+    # Estado, id del restaurante o id de la motocicleta ('' sin motocicleta asignada)
+    bucket = db.Column(db.String(40), primary_key=True)
+    orders = db.Column(db.Integer, nullable=False, default=0)
+    revenue = db.Column(db.Float, nullable=False, default=0.0)
+
+    def __repr__(self):
+        return f'<OrderRollup {self.day} {self.dimension}={self.bucket}>'
@@ -5,7 +5,7 @@ class Photo(db.Model):
     __tablename__ = 'photos'
     
     id = db.Column(db.Integer, primary_key=True)
-    issue_id = db.Column(db.Integer, db.ForeignKey('issues.id'), nullable=False)
+    issue_id = db.Column(db.Integer, db.ForeignKey('issues.id'), nullable=False, index=True)  # ix_photos_issue_id (migración v0001)
     image_url = db.Column(db.String(255), nullable=False)
     caption = db.Column(db.String(200), nullable=True)
     taken_at = db.Column(db.DateTime, nullable=True)
@@ -9,6 +9,9 @@ class Restaurant(db.Model):
     address = db.Column(db.String(200), nullable=False)
     phone = db.Column(db.String(20), nullable=False)
     email = db.Column(db.String(100), nullable=True)
+    # Punto de recogida para el despacho (migración v0004)
+    latitude = db.Column(db.Float, nullable=True)
+    longitude = db.Column(db.Float, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     # Relationship with Menu
@@ -24,5 +27,7 @@ class Restaurant(db.Model):
             'address': self.address,
             'phone': self.phone,
             'email': self.email,
+            'latitude': self.latitude,
+            'longitude': self.longitude,
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
\ No newline at end of file
@@ -3,6 +3,11 @@ from datetime import datetime
 
 class Shift(db.Model):
     __tablename__ = 'shifts'
+    # Índices de las consultas frecuentes (migración v0001)
+    __table_args__ = (
+        db.Index('ix_shifts_driver_id', 'driver_id'),
+        db.Index('ix_shifts_motorcycle_id_status', 'motorcycle_id', 'status'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     driver_id = db.Column(db.Integer, db.ForeignKey('drivers.id'), nullable=False)
@@ -0,0 +1,110 @@
+"""
+Problema de asignación (filas a columnas con costo total mínimo).
+
+Algoritmo de subasta de Bertsekas con escalamiento de epsilon, vectorizado
+con NumPy en su variante Jacobi: en cada ronda todas las filas sin asignar
+pujan a la vez por su mejor columna, y cada columna se queda con la puja
+más alta.
+
+Si la matriz no es cuadrada, el lado menor puja y se completa con filas
+ficticias de costo 0 que se quedan con las columnas sobrantes. Las
+ficticias son idénticas entre sí y pujan en bloque por las columnas más
+baratas (personas similares); pujando una por una, cada ronda asignaría
+solo una y la subasta se alargaría en miles de rondas.
+
+Los costos se redondean a enteros (p. ej. metros); con el epsilon final
+menor que 1/n la asignación es óptima para esos costos enteros. Los pares
+con costo infinito no se asignan nunca.
+"""
+import numpy as np
+
+# Factor de reducción de epsilon entre fases
+SCALING = 5.0
+
+
+def _auction(benefit, scaling=SCALING):
+    """
+    Asignación de beneficio máximo de `benefit` (r x n, r <= n, enteros)
+    completada con n - r filas ficticias de beneficio 0; fila -> columna
+    """
+    r, n = benefit.shape
+    prices = np.zeros(n)
+    span = float(max(benefit.max(), 0) - min(benefit.min(), 0))
+    eps = max(span / scaling, 1.0)
+    final = 1.0 / (n + 1)
+    while True:
+        owner = np.full(n, -1)  # columna -> fila
+        assigned = np.full(n, -1)  # fila -> columna; las filas >= r son ficticias
+        bidders = np.arange(n)
+        while bidders.size:
+            real = bidders[bidders < r]
+            values = benefit[real] - prices
+            best = values.argmax(axis=1)
+            picked = np.arange(real.size)
+            first = values[picked, best]
+            if n > 1:
+                values[picked, best] = -np.inf
+                second = values.max(axis=1)
+            else:
+                second = first
+            bids = prices[best] + (first - second) + eps
+
+            dummies = bidders[bidders >= r]
+            if dummies.size:
+                # Cada ficticia toma una de las columnas más baratas y puja hasta
+                # el precio de la siguiente más barata
+                cheapest = np.argpartition(prices, dummies.size)
+                best = np.concatenate((best, cheapest[:dummies.size]))
+                bids = np.concatenate((bids, np.full(dummies.size, prices[cheapest[dummies.size]] + eps)))
+                bidders = np.concatenate((real, dummies))
+
+            # La puja más alta de cada columna gana; el dueño anterior vuelve a pujar
+            order = np.lexsort((-bids, best))
+            columns = best[order]
+            winning = np.r_[True, columns[1:] != columns[:-1]]
+            columns = columns[winning]
+            winners = bidders[order[winning]]
+            outbid = owner[columns]
+            assigned[outbid[outbid >= 0]] = -1
+            owner[columns] = winners
+            assigned[winners] = columns
+            prices[columns] = bids[order[winning]]
+            bidders = np.flatnonzero(assigned < 0)
+
+        if eps <= final:
+            return assigned[:r]
+        # Las siguientes fases parten de los precios ya aprendidos
+        eps = max(eps / scaling, final)
+
+
+def solve(cost, scaling=SCALING):
+    """
+    Asignación de costo mínimo de `cost` (filas x columnas, np.inf = prohibido).
+
+    Devuelve (filas, columnas) con los pares asignados, como en
+    scipy.optimize.linear_sum_assignment pero sin asignar pares prohibidos.
+    """
+    cost = np.asarray(cost, dtype=np.float64)
+    empty = np.empty(0, dtype=np.intp)
+    allowed = np.isfinite(cost)
+    if not cost.size or not allowed.any():
+        return empty, empty
+
+    transposed = cost.shape[0] > cost.shape[1]
+    if transposed:
+        cost, allowed = cost.T, allowed.T
+    # Todas las filas del lado menor quedan asignadas: restar una constante no cambia la solución
+    costs = np.rint(cost[allowed] - cost[allowed].min())
+    # Un par prohibido cuesta más que cualquier asignación completa de pares permitidos
+    forbidden = (costs.max() + 1) * cost.shape[0] + 1
+    benefit = np.full(cost.shape, -forbidden)
+    benefit[allowed] = -costs
+
+    columns = _auction(benefit, scaling)
+    rows = np.arange(cost.shape[0])
+    keep = allowed[rows, columns]
+    rows, columns = rows[keep], columns[keep]
+    if transposed:
+        order = np.argsort(columns)
+        return columns[order], rows[order]
+    return rows, columns
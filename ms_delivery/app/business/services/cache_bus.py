@@ -0,0 +1,64 @@
+"""
+Difusión de invalidaciones de caché entre procesos worker.
+
+Cada caché en memoria invalida sus propias entradas al escribir y publica
+las llaves invalidadas por este bus para que los demás workers hagan lo
+mismo.
+
+- LocalCacheBus: un solo proceso; no hay a quién avisar.
+- RedisCacheBus: pub/sub de Redis (dependencia opcional `redis`).
+"""
+import json
+
+from app.business.services.tracking_state import default_worker_id
+
+CHANNEL_PREFIX = 'cache:invalidate:'
+
+
+class LocalCacheBus:
+    shared = False
+
+    def publish(self, name, keys):
+        pass
+
+    def subscribe(self, name, handler, start_task=None):
+        pass
+
+
+class RedisCacheBus:
+    """Invalidaciones compartidas vía Redis; ignora los mensajes que publicó este mismo worker"""
+
+    shared = True
+
+    def __init__(self, url, origin=None, client=None):
+        if client is None:
+            try:
+                import redis
+            except ImportError as e:
+                raise RuntimeError("CACHE_BUS_URL requiere el paquete 'redis' (pip install redis)") from e
+            client = redis.Redis.from_url(url, decode_responses=True)
+        self.redis = client
+        self.origin = origin or default_worker_id()
+
+    def publish(self, name, keys):
+        """`keys` es una lista de llaves o None para vaciar la caché completa"""
+        message = {'origin': self.origin, 'keys': None if keys is None else list(keys)}
+        self.redis.publish(f"{CHANNEL_PREFIX}{name}", json.dumps(message))
+
+    def subscribe(self, name, handler, start_task):
+        pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(f"{CHANNEL_PREFIX}{name}")
+
+        def run():
+            for message in pubsub.listen():
+                data = json.loads(message['data'])
+                if data.get('origin') != self.origin:
+                    handler(data.get('keys'))
+
+        start_task(run)
+
+
+def create_cache_bus(url=None, origin=None):
+    if url:
+        return RedisCacheBus(url, origin)
+    return LocalCacheBus()
@@ -0,0 +1,76 @@
+"""
+Perfil del motor de base de datos.
+
+- SQLite: al abrir cada conexión se aplican pragmas (WAL, synchronous,
+  busy_timeout, cache_size, mmap_size). Con WAL los lectores no bloquean al
+  escritor ni al revés; solo los escritores se serializan entre sí.
+- Bases de servidor (PostgreSQL, MySQL, ... vía DATABASE_URL): tamaño del
+  pool, desborde, reciclado y pre-ping de conexiones.
+
+DATABASE_PROFILE='default' deja los valores del driver, como antes.
+"""
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    # NORMAL es seguro con WAL: solo se pueden perder las últimas transacciones ante un corte de energía
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    # Negativo: tamaño en KiB (64 MiB de caché de páginas por conexión)
+    'cache_size': -65536,
+    'mmap_size': 256 * 2 ** 20,
+    'temp_store': 'MEMORY',
+}
+
+
+def _is_sqlite(uri):
+    return make_url(uri).get_backend_name() == 'sqlite'
+
+
+def _is_memory(uri):
+    return make_url(uri).database in (None, '', ':memory:')
+
+
+def engine_options(config):
+    """Opciones de create_engine según el perfil y el tipo de base configurados"""
+    options = dict(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    if config.get('DATABASE_PROFILE', 'tuned') != 'tuned' or _is_sqlite(config['SQLALCHEMY_DATABASE_URI']):
+        return options
+    options.setdefault('pool_size', config.get('DB_POOL_SIZE', 10))
+    options.setdefault('max_overflow', config.get('DB_MAX_OVERFLOW', 20))
+    options.setdefault('pool_recycle', config.get('DB_POOL_RECYCLE', 1800))
+    options.setdefault('pool_timeout', config.get('DB_POOL_TIMEOUT', 30))
+    # Descartar conexiones cerradas por el servidor antes de usarlas
+    options.setdefault('pool_pre_ping', True)
+    return options
+
+
+def sqlite_pragmas(config):
+    pragmas = dict(SQLITE_PRAGMAS)
+    pragmas.update(config.get('SQLITE_PRAGMAS') or {})
+    if _is_memory(config['SQLALCHEMY_DATABASE_URI']):
+        # Una base en memoria no tiene diario ni archivo que mapear
+        pragmas.pop('journal_mode', None)
+        pragmas.pop('mmap_size', None)
+    return pragmas
+
+
+def configure(app):
+    """Antes de db.init_app: opciones del pool para bases de servidor"""
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config)
+
+
+def apply(app, engine):
+    """Después de db.init_app: pragmas de SQLite en cada conexión nueva"""
+    config = app.config
+    if config.get('DATABASE_PROFILE', 'tuned') != 'tuned' or engine.dialect.name != 'sqlite':
+        return
+    pragmas = sqlite_pragmas(config)
+
+    @event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
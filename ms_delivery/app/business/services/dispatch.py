@@ -0,0 +1,203 @@
+"""
+Despacho por lotes de órdenes pendientes.
+
+Cada DISPATCH_INTERVAL segundos el motor:
+
+1. reúne las órdenes `pending` sin motocicleta cuyo restaurante tiene
+   coordenadas (punto de recogida), las más antiguas primero y hasta
+   DISPATCH_BATCH;
+2. reúne las motocicletas `available` con un turno activo y posición viva
+   en el índice espacial del tracking;
+3. arma la matriz de costos (distancia haversine de cada motocicleta a
+   cada restaurante; más allá de DISPATCH_MAX_DISTANCE el par se prohíbe),
+   descuenta DISPATCH_WAIT_WEIGHT metros por segundo de espera de cada
+   orden para que las más antiguas no se queden atrás cuando faltan
+   motocicletas, y resuelve la asignación completa de una vez
+   (services/assignment.py);
+4. en una sola transacción pasa cada orden asignada a `in_progress` con su
+   motocicleta, la motocicleta a `in_use` y actualiza los rollups; después
+   del commit publica los eventos de las órdenes.
+
+Con varios workers cada uno despacha las placas que simula, que son las
+que tiene en su índice. La actualización de cada orden es condicional
+(sigue pendiente y sin motocicleta): si otro worker o una edición
+concurrente se la llevó, la orden sale del lote y la motocicleta queda
+libre para el ciclo siguiente.
+"""
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy import exists, select, update
+
+from app import db
+from app.business.models.menu import Menu
+from app.business.models.motorcycle import Motorcycle
+from app.business.models.order import Order
+from app.business.models.restaurant import Restaurant
+from app.business.models.shift import Shift
+from app.business.services import order_rollups
+from app.business.services.assignment import solve
+from app.business.services.order_events import OrderChange
+from app.business.services.route_loader import haversine
+
+DEFAULT_INTERVAL = 10.0
+# Distancia máxima en metros de una motocicleta al restaurante de la orden
+DEFAULT_MAX_DISTANCE = 10000.0
+DEFAULT_BATCH = 2000
+# Metros de distancia que compensa cada segundo de espera de una orden
+DEFAULT_WAIT_WEIGHT = 1.0
+
+
+class DispatchEngine:
+    def __init__(self, index, events=None, interval=DEFAULT_INTERVAL, max_distance=DEFAULT_MAX_DISTANCE,
+                 batch=DEFAULT_BATCH, wait_weight=DEFAULT_WAIT_WEIGHT):
+        self.index = index  # SpatialGrid con la posición viva de cada placa
+        self.events = events  # OrderEventPublisher opcional
+        self.interval = interval  # segundos entre ciclos; 0 desactiva el ciclo automático
+        self.max_distance = max_distance
+        self.batch = batch
+        self.wait_weight = wait_weight
+        self.last = None  # resumen del último ciclo
+        self.app = None
+        self.socketio = None
+        self._lock = threading.Lock()
+        self._running = False
+
+    def init_app(self, app, socketio):
+        """Lee la configuración e inicia el ciclo periódico si DISPATCH_INTERVAL > 0"""
+        self.app = app
+        self.socketio = socketio
+        self.interval = float(app.config.get('DISPATCH_INTERVAL', self.interval) or 0)
+        self.max_distance = float(app.config.get('DISPATCH_MAX_DISTANCE') or self.max_distance)
+        self.batch = int(app.config.get('DISPATCH_BATCH') or self.batch)
+        self.wait_weight = float(app.config.get('DISPATCH_WAIT_WEIGHT', self.wait_weight) or 0)
+        if self.interval > 0 and not self._running:
+            self._running = True
+            socketio.start_background_task(self._run)
+
+    def pending_orders(self):
+        """Órdenes pendientes sin motocicleta con punto de recogida, las más antiguas primero"""
+        return db.session.execute(
+            select(Order.id, Order.customer_id, Order.created_at, Order.total_price, Menu.restaurant_id,
+                   Restaurant.latitude, Restaurant.longitude)
+            .join(Menu, Order.menu_id == Menu.id)
+            .join(Restaurant, Menu.restaurant_id == Restaurant.id)
+            .where(Order.status == 'pending', Order.motorcycle_id.is_(None),
+                   Restaurant.latitude.isnot(None), Restaurant.longitude.isnot(None))
+            .order_by(Order.id)
+            .limit(self.batch)
+        ).all()
+
+    def available_motorcycles(self, positions):
+        """(id, placa, lat, lng) de las motocicletas disponibles, en turno y con posición viva"""
+        active_shift = exists().where(Shift.motorcycle_id == Motorcycle.id, Shift.status == 'active')
+        rows = db.session.execute(
+            select(Motorcycle.id, Motorcycle.license_plate)
+            .where(Motorcycle.status == 'available', active_shift)
+        ).all()
+        return [
+            (row.id, row.license_plate, *positions[row.license_plate][:2])
+            for row in rows if row.license_plate in positions
+        ]
+
+    def costs(self, orders, motorcycles, now=None):
+        """
+        Distancia en metros de cada motocicleta (columnas) a cada recogida
+        (filas), menos el crédito por espera de la orden; np.inf si excede el máximo
+        """
+        order_lat = np.array([order.latitude for order in orders], dtype=np.float64)[:, None]
+        order_lng = np.array([order.longitude for order in orders], dtype=np.float64)[:, None]
+        moto_lat = np.array([motorcycle[2] for motorcycle in motorcycles], dtype=np.float64)[None, :]
+        moto_lng = np.array([motorcycle[3] for motorcycle in motorcycles], dtype=np.float64)[None, :]
+        cost = haversine(order_lat, order_lng, moto_lat, moto_lng)
+        far = cost > self.max_distance
+        if self.wait_weight:
+            now = now or datetime.utcnow()
+            waits = np.array([(now - order.created_at).total_seconds() if order.created_at else 0.0
+                              for order in orders])
+            cost -= self.wait_weight * np.maximum(waits, 0.0)[:, None]
+        cost[far] = np.inf
+        return cost
+
+    def run_once(self):
+        """Un ciclo de despacho; devuelve su resumen"""
+        with self._lock:
+            start = time.perf_counter()
+            summary = {"orders": 0, "motorcycles": 0, "assigned": 0, "lost": 0, "solve_ms": 0.0}
+            # Copia: el tick del tracking actualiza el índice mientras tanto
+            positions = dict(self.index.positions)
+            motorcycles = self.available_motorcycles(positions) if positions else []
+            orders = self.pending_orders() if motorcycles else []
+            summary["orders"], summary["motorcycles"] = len(orders), len(motorcycles)
+
+            if orders and motorcycles:
+                solve_start = time.perf_counter()
+                rows, columns = solve(self.costs(orders, motorcycles))
+                summary["solve_ms"] = round((time.perf_counter() - solve_start) * 1000, 2)
+                pairs = [(orders[row], motorcycles[column]) for row, column in zip(rows.tolist(), columns.tolist())]
+                changes = self._commit(pairs)
+                summary["assigned"] = len(changes)
+                summary["lost"] = len(pairs) - len(changes)
+                if self.events is not None:
+                    self.events.publish(changes)
+
+            summary["total_ms"] = round((time.perf_counter() - start) * 1000, 2)
+            summary["at"] = datetime.utcnow().isoformat()
+            self.last = summary
+            return summary
+
+    def _commit(self, pairs):
+        """Escribe las asignaciones en una sola transacción; devuelve los cambios confirmados"""
+        changes, added, removed, motorcycle_ids = [], [], [], []
+        try:
+            for order, motorcycle in pairs:
+                result = db.session.execute(
+                    update(Order)
+                    .where(Order.id == order.id, Order.status == 'pending', Order.motorcycle_id.is_(None))
+                    .values(status='in_progress', motorcycle_id=motorcycle[0])
+                    .execution_options(synchronize_session=False)
+                )
+                if not result.rowcount:
+                    continue
+                day = order.created_at.date() if order.created_at else None
+                removed.append(order_rollups.OrderFacts(day, 'pending', order.restaurant_id, None, 1, order.total_price))
+                added.append(order_rollups.OrderFacts(day, 'in_progress', order.restaurant_id, motorcycle[0], 1,
+                                                      order.total_price))
+                changes.append(OrderChange(order.id, 'in_progress', 'pending', order.customer_id,
+                                           order.restaurant_id, motorcycle[0], None))
+                motorcycle_ids.append(motorcycle[0])
+            if motorcycle_ids:
+                db.session.execute(
+                    update(Motorcycle)
+                    .where(Motorcycle.id.in_(motorcycle_ids))
+                    .values(status='in_use')
+                    .execution_options(synchronize_session=False)
+                )
+            order_rollups.record(added=added, removed=removed)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return changes
+
+    def status(self):
+        return {
+            "interval": self.interval,
+            "max_distance": self.max_distance,
+            "batch": self.batch,
+            "wait_weight": self.wait_weight,
+            "last": self.last,
+        }
+
+    def _run(self):
+        next_run = time.monotonic()
+        while True:
+            next_run += self.interval
+            self.socketio.sleep(max(0, next_run - time.monotonic()))
+            try:
+                with self.app.app_context():
+                    self.run_once()
+            except Exception:
+                self.app.logger.exception("Falló el ciclo de despacho")
@@ -0,0 +1,227 @@
+"""
+Tiempo estimado de llegada (ETA) de las órdenes en reparto.
+
+ETA = distancia restante / velocidad reciente de la motocicleta asignada:
+
+- distancia restante: sobre la ruta que recorre la placa, desde su offset
+  actual hasta el offset del destino. Las coordenadas de la dirección de
+  entrega se proyectan una sola vez sobre la ruta (Route.project) y el
+  offset se cachea; con las distancias acumuladas precalculadas de Route
+  la distancia restante es una resta. Sin coordenadas de entrega el
+  destino es el final de la ruta.
+- velocidad: promedio móvil exponencial por placa del avance sobre la
+  ruta entre frames consecutivos del tracking, ponderado por el tiempo
+  entre ellos (vida media ETA_SPEED_HALF_LIFE); sin muestras todavía, la
+  velocidad configurada de la placa. Se mide sobre la ruta y no en línea
+  recta entre posiciones para que quede en las mismas unidades que la
+  distancia restante: en las curvas la cuerda subestima el avance.
+
+Cada consulta cuesta una lectura por llave primaria más aritmética, sin
+recorrer la ruta. En cada tick el scheduler le pasa el frame al servicio:
+actualiza las velocidades y emite 'eta' a la sala de la placa cuando la
+hora de llegada estimada de una de sus órdenes se mueve al menos
+ETA_PUSH_THRESHOLD segundos. Las órdenes vigiladas (abiertas, con
+motocicleta simulada en este worker) se releen cada ETA_REFRESH segundos.
+
+Con varios workers solo el dueño de una placa conoce su offset; en los
+demás la consulta responde sin ETA (reason 'not_tracked').
+"""
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+
+from app import db
+from app.business.models.address import Address
+from app.business.models.motorcycle import Motorcycle
+from app.business.models.order import Order
+from app.business.services.route_planner import point_key
+from app.business.services.row_serializer import first_related
+from app.business.services.tracking_rooms import binary_room, plate_room
+
+EVENT = 'eta'
+# Estados con motocicleta en camino
+OPEN_STATUSES = ('pending', 'in_progress')
+# Vida media en segundos del promedio de velocidad
+DEFAULT_HALF_LIFE = 30.0
+# Segundos que debe moverse la hora de llegada para volver a emitirla
+DEFAULT_PUSH_THRESHOLD = 30.0
+# Segundos entre lecturas de las órdenes vigiladas
+DEFAULT_REFRESH = 15.0
+# Destinos proyectados en la caché
+DEFAULT_CACHE_SIZE = 10000
+# Velocidad mínima (m/s): una placa detenida no da un ETA infinito
+MIN_SPEED = 0.5
+# Saltos más rápidos entre dos frames (m/s) son reubicaciones, no movimiento
+MAX_SPEED = 60.0
+
+Estimate = namedtuple('Estimate', 'remaining speed seconds destination')
+
+
+class SpeedEstimator:
+    """Velocidad reciente de cada placa a partir de su avance sobre la ruta"""
+
+    def __init__(self, half_life=DEFAULT_HALF_LIFE):
+        self.half_life = half_life
+        self._last = {}  # placa -> (offset, ts en segundos)
+        self._speeds = {}  # placa -> m/s
+
+    def observe(self, samples, ts):
+        """
+        Incorpora las posiciones [(placa, offset en metros, longitud de su
+        ruta)] del instante `ts` (segundos epoch)
+        """
+        last, estimates, half_life = self._last, self._speeds, self.half_life
+        for plate, offset, length in samples:
+            before = last.get(plate)
+            last[plate] = (offset, ts)
+            if before is None or ts <= before[1]:
+                continue
+            elapsed = ts - before[1]
+            # La ruta es un ciclo: el avance nunca es negativo
+            speed = ((offset - before[0]) % length if length else 0.0) / elapsed
+            if speed > MAX_SPEED:
+                continue
+            # Peso de la muestra según el tiempo que cubre: frames espaciados pesan más
+            weight = 1.0 - 0.5 ** (elapsed / half_life)
+            estimate = estimates.get(plate)
+            estimates[plate] = speed if estimate is None else estimate + weight * (speed - estimate)
+
+    def speed(self, plate):
+        """m/s estimados de la placa o None sin muestras"""
+        return self._speeds.get(plate)
+
+    def forget(self, plate):
+        self._last.pop(plate, None)
+        self._speeds.pop(plate, None)
+
+
+class EtaService:
+    def __init__(self, scheduler, half_life=DEFAULT_HALF_LIFE, threshold=DEFAULT_PUSH_THRESHOLD,
+                 refresh=DEFAULT_REFRESH, cache_size=DEFAULT_CACHE_SIZE):
+        self.scheduler = scheduler  # FleetScheduler con la ruta y el offset de cada placa
+        self.speeds = SpeedEstimator(half_life)
+        self.threshold = threshold
+        self.refresh = refresh
+        self.cache_size = cache_size
+        self.watched = {}  # placa -> [(order_id, lat, lng)]
+        self.pushed = {}  # order_id -> hora de llegada (epoch) de la última emisión
+        self.app = None
+        self._destinations = OrderedDict()  # (ruta, lat, lng) -> offset
+        self._lock = threading.Lock()
+        self._refreshed = None
+
+    def init_app(self, app):
+        self.app = app
+        self.speeds.half_life = float(app.config.get('ETA_SPEED_HALF_LIFE') or self.speeds.half_life)
+        self.threshold = float(app.config.get('ETA_PUSH_THRESHOLD', self.threshold) or 0)
+        self.refresh = float(app.config.get('ETA_REFRESH') or self.refresh)
+        self.cache_size = int(app.config.get('ETA_CACHE_SIZE') or self.cache_size)
+
+    def destination(self, route, lat, lng):
+        """Offset del destino sobre la ruta; se proyecta una vez por ruta y punto"""
+        key = (route, *point_key(lat, lng))
+        with self._lock:
+            offset = self._destinations.get(key)
+            if offset is not None:
+                self._destinations.move_to_end(key)
+                return offset
+        offset = route.project(lat, lng)
+        with self._lock:
+            self._destinations[key] = offset
+            while len(self._destinations) > self.cache_size:
+                self._destinations.popitem(last=False)
+        return offset
+
+    def estimate(self, plate, lat=None, lng=None):
+        """Estimate de la placa hacia (lat, lng) o None si no se simula en este worker"""
+        state = self.scheduler.plates.get(plate)
+        if state is None:
+            return None
+        route = state.route
+        if lat is None or lng is None:
+            remaining, destination = max(route.length - state.offset, 0.0), 'route_end'
+        else:
+            target = self.destination(route, lat, lng)
+            remaining = (target - state.offset) % route.length if route.length else 0.0
+            destination = 'address'
+        speed = self.speeds.speed(plate)
+        speed = max(state.speed if speed is None else speed, MIN_SPEED)
+        return Estimate(remaining, speed, remaining / speed, destination)
+
+    @staticmethod
+    def describe(estimate, now):
+        """Campos públicos de un Estimate calculado en `now` (segundos epoch)"""
+        return {
+            "remaining_distance": round(estimate.remaining, 1),
+            "speed": round(estimate.speed, 2),
+            "eta_seconds": round(estimate.seconds, 1),
+            "eta": datetime.fromtimestamp(now + estimate.seconds, timezone.utc).isoformat(),
+            "destination": estimate.destination,
+        }
+
+    def observe(self, frame):
+        """Llamado por el scheduler en cada tick: velocidades y emisión de los ETA que cambiaron"""
+        if not frame:
+            return
+        ts = frame[0]['ts'] / 1000
+        plates = self.scheduler.plates
+        states = [plates.get(item['plate']) for item in frame]
+        self.speeds.observe([(state.plate, state.offset, state.route.length) for state in states if state], ts)
+        if self.app is None:
+            return
+        now = time.monotonic()
+        if self._refreshed is None or now - self._refreshed >= self.refresh:
+            self._refreshed = now
+            try:
+                with self.app.app_context():
+                    self.load_watched()
+            except Exception:
+                self.app.logger.exception("Falló la lectura de las órdenes para el ETA")
+        if self.watched:
+            self.push(ts)
+
+    def load_watched(self):
+        """Órdenes abiertas cuya motocicleta se simula en este worker"""
+        plates = self.scheduler.plates
+        rows = db.session.execute(
+            select(Order.id, Motorcycle.license_plate, Address.latitude, Address.longitude)
+            .join(Motorcycle, Order.motorcycle_id == Motorcycle.id)
+            .outerjoin(first_related(Order.address))
+            .where(Order.status.in_(OPEN_STATUSES))
+        ).all()
+        watched = {}
+        for row in rows:
+            if row.license_plate in plates:
+                watched.setdefault(row.license_plate, []).append((row.id, row.latitude, row.longitude))
+        self.watched = watched
+        # Las órdenes que ya no se vigilan vuelven a emitir si reaparecen
+        orders = {order_id for entries in watched.values() for order_id, _, _ in entries}
+        self.pushed = {order_id: arrival for order_id, arrival in self.pushed.items() if order_id in orders}
+
+    def push(self, now):
+        """Emite 'eta' por cada orden cuya hora de llegada se movió al menos `threshold`"""
+        socketio = self.scheduler.socketio
+        for plate, orders in list(self.watched.items()):
+            for order_id, lat, lng in orders:
+                estimate = self.estimate(plate, lat, lng)
+                if estimate is None:
+                    continue
+                # Se compara la hora de llegada: el ETA en segundos baja solo con el tiempo
+                arrival = now + estimate.seconds
+                last = self.pushed.get(order_id)
+                if last is not None and abs(arrival - last) < self.threshold:
+                    continue
+                self.pushed[order_id] = arrival
+                payload = {"order_id": order_id, "plate": plate, **self.describe(estimate, now)}
+                room = plate_room(plate)
+                socketio.emit(EVENT, payload, to=room)
+                socketio.emit(EVENT, payload, to=binary_room(room))
+
+    def forget(self, plate):
+        """La placa dejó de simularse en este worker"""
+        self.speeds.forget(plate)
+        for order_id, _, _ in self.watched.pop(plate, ()):
+            self.pushed.pop(order_id, None)
@@ -0,0 +1,210 @@
+import logging
+import time
+
+import numpy as np
+
+from app.business.services.position_codec import DeltaFrameEncoder
+from app.business.services.spatial_index import SpatialGrid
+from app.business.services.tracking_rooms import binary_room, group_by_room, occupied_rooms
+from app.business.services.tracking_state import LocalTrackingState, create_tracking_state
+
+
+# Velocidad por defecto de las placas simuladas (36 km/h)
+DEFAULT_SPEED = 10.0
+
+
+class _PlateState:
+    """Estado de recorrido de una placa dentro del scheduler"""
+    __slots__ = ('plate', 'route', 'offset', 'speed')
+
+    def __init__(self, plate, route, speed=DEFAULT_SPEED):
+        self.plate = plate
+        self.route = route
+        self.offset = 0.0  # metros recorridos desde el inicio de la ruta
+        self.speed = speed  # m/s
+
+
+class FleetScheduler:
+    """
+    Scheduler único para toda la flota.
+
+    En lugar de una tarea en segundo plano por placa, un solo ciclo avanza
+    todas las placas activas en cada tick y emite un frame por sala ocupada
+    (placa o región) con las posiciones actuales.
+
+    El movimiento depende del tiempo, no de los puntos de la ruta: cada placa
+    avanza `speed` m/s interpolando sobre los segmentos, y `interval` fija la
+    frecuencia de emisión de la flota (1 s = 1 Hz, 5 s = 0.2 Hz).
+
+    Con varios workers, `state` decide qué worker es dueño de cada placa: solo
+    el dueño la simula, y las órdenes de detener se le reenvían.
+    """
+
+    EVENT = 'positions'
+    BINARY_EVENT = 'positions_bin'
+
+    def __init__(self, socketio, interval=3, speed=DEFAULT_SPEED, history=None, state=None):
+        self.socketio = socketio
+        self.state = state or LocalTrackingState()
+        self.history = history  # PositionHistory opcional para persistir los frames
+        self.eta = None  # EtaService opcional que recibe cada frame
+        self.interval = interval  # segundos entre emisiones
+        self.speed = speed  # m/s por defecto de las placas nuevas
+        self.plates = {}
+        self.plate_ids = {}  # placa -> id numérico del formato binario
+        self.encoder = DeltaFrameEncoder()
+        self.index = SpatialGrid()  # posición actual de cada placa activa
+        self.logger = logging.getLogger(__name__)
+        self._running = False
+
+    def init_app(self, app):
+        """
+        Lee el intervalo y la velocidad por defecto, configura el backend de
+        estado compartido y atiende los comandos de otros workers
+        """
+        self.interval = float(app.config.get('TRACKING_INTERVAL') or self.interval)
+        self.speed = float(app.config.get('TRACKING_SPEED') or self.speed)
+        self.logger = app.logger
+        self.state = create_tracking_state(app.config.get('TRACKING_STATE_URL'), app.config.get('TRACKING_WORKER_ID'))
+        self.state.listen(self.handle_command, self.socketio.start_background_task)
+
+    def handle_command(self, command):
+        op = command.get('op')
+        if op == 'stop':
+            self.remove(command['plate'])
+        elif op == 'keyframe':
+            self.encoder.reset(command['room'])
+
+    def request_keyframe(self, room):
+        """Pide un keyframe para la sala a cualquier worker que le emita"""
+        self.encoder.reset(room)
+        if self.state.shared:
+            self.state.broadcast({'op': 'keyframe', 'room': room})
+
+    def is_active(self, plate):
+        return plate in self.plates
+
+    def start(self, plate, route, speed=None):
+        """Inicia la placa en este worker si nadie más es su dueño"""
+        if self.state.claim(plate) != self.state.worker_id:
+            return False
+        return self.add(plate, route, speed)
+
+    def stop(self, plate):
+        """
+        Detiene la placa aquí o reenvía la orden a su worker dueño; si el
+        dueño está caído la placa ya no transmite y solo se libera
+        """
+        owner = self.state.owner(plate)
+        if owner is not None and owner != self.state.worker_id:
+            self.state.send(owner, {'op': 'stop', 'plate': plate})
+            return True
+        return self.remove(plate)
+
+    def add(self, plate, route, speed=None):
+        if plate in self.plates:
+            return False
+        self.plates[plate] = _PlateState(plate, route, self.speed if speed is None else speed)
+        self._ensure_running()
+        return True
+
+    def remove(self, plate):
+        self.index.remove(plate)
+        if self.eta is not None:
+            self.eta.forget(plate)
+        self.state.release(plate)
+        return self.plates.pop(plate, None) is not None
+
+    def tick(self, elapsed=None):
+        """
+        Devuelve el frame con la posición actual de todas las placas y las
+        avanza `elapsed` segundos (por defecto el intervalo) a su velocidad
+        """
+        elapsed = self.interval if elapsed is None else elapsed
+        # Marca de emisión en ms epoch para medir latencia en los clientes
+        ts = int(time.time() * 1000)
+        frame = []
+        index = self.index
+
+        # Agrupar por ruta para interpolar todas las placas de una vez;
+        # copia de los valores: add/remove pueden ocurrir durante el emit
+        groups = {}
+        for state in list(self.plates.values()):
+            groups.setdefault(id(state.route), []).append(state)
+
+        for states in groups.values():
+            route = states[0].route
+            offsets = np.fromiter((state.offset for state in states), dtype=np.float64, count=len(states))
+            speeds = np.fromiter((state.speed for state in states), dtype=np.float64, count=len(states))
+            lats, lngs = route.positions_at(offsets)
+            offsets += speeds * elapsed
+            if route.length:
+                offsets %= route.length
+
+            for state, lat, lng, offset in zip(states, lats.tolist(), lngs.tolist(), offsets.tolist()):
+                index.update(state.plate, lat, lng)
+                frame.append({'plate': state.plate, 'lat': lat, 'lng': lng, 'ts': ts})
+                state.offset = offset
+
+        return frame
+
+    def plate_id(self, plate):
+        # Ids estables mientras viva el proceso; no se reutilizan
+        return self.plate_ids.setdefault(plate, len(self.plate_ids))
+
+    def emit(self, frame):
+        # Cada sala recibe solo las placas que le interesan y se omiten las vacías
+        occupied = self.state.occupied(occupied_rooms(self.socketio))
+        for room, items in group_by_room(frame, occupied).items():
+            if occupied.get(room):
+                self.socketio.emit(self.EVENT, items, to=room)
+            binary = binary_room(room)
+            if occupied.get(binary):
+                self.emit_binary(binary, items)
+
+        # Olvidar el estado delta de las salas binarias que quedaron vacías
+        for room in list(self.encoder.rooms):
+            if not occupied.get(room):
+                self.encoder.discard(room)
+
+    def emit_binary(self, room, items):
+        ids = [self.plate_id(item['plate']) for item in items]
+        seq, keyframe, payload = self.encoder.encode(
+            room, ids, [item['lat'] for item in items], [item['lng'] for item in items]
+        )
+        meta = {'room': room, 'seq': seq, 'ts': items[0]['ts']}
+        if keyframe:
+            # El keyframe trae el nombre de las placas para resolver los ids
+            meta['plates'] = {plate_id: item['plate'] for plate_id, item in zip(ids, items)}
+        self.socketio.emit(self.BINARY_EVENT, (meta, payload), to=room)
+
+    def _ensure_running(self):
+        if not self._running:
+            self._running = True
+            self.socketio.start_background_task(self._run)
+
+    def _run(self):
+        next_tick = last_tick = time.monotonic()
+        try:
+            while self.plates:
+                # Avanzar según el tiempo real transcurrido aunque el ciclo se atrase
+                now = time.monotonic()
+                try:
+                    self.state.heartbeat()
+                    frame = self.tick(now - last_tick)
+                    if frame:
+                        self.emit(frame)
+                        if self.history is not None:
+                            self.history.append_frame(frame, frame[0]['ts'] / 1000)
+                        if self.eta is not None:
+                            self.eta.observe(frame)
+                except Exception:
+                    # Un tick fallido (Redis, disco) no detiene la flota: el siguiente reintenta
+                    self.logger.exception("Falló el tick del scheduler de flota")
+                last_tick = now
+
+                # Programar contra el reloj para que el costo del tick no acumule deriva
+                next_tick += self.interval
+                self.socketio.sleep(max(0, next_tick - time.monotonic()))
+        finally:
+            self._running = False
@@ -0,0 +1,185 @@
+"""
+Capa común para los endpoints de listado.
+
+- Paginación por keyset sobre la llave primaria: `?after=<id>&limit=<n>`
+  devuelve las filas con id mayor a `after`, en orden de id. A diferencia de
+  OFFSET, el costo de una página no crece con la posición en la tabla.
+- Filtros por columna: `?status=delivered` para igualdad y
+  `?created_at_from=...&created_at_to=...` para rangos de fechas (ISO 8601
+  o epoch en segundos; `_to` es exclusivo). Cada controlador declara qué
+  columnas se pueden filtrar.
+- Proyección: `?fields=id,status` limita las llaves de cada elemento. Si
+  solo se piden columnas, la consulta carga solo esas columnas y no toca
+  las relaciones.
+- Filas Core: con un RowSerializer (services/row_serializer.py) la consulta
+  trae tuplas con las columnas del modelo y de sus relaciones, sin
+  hidratar instancias ORM.
+
+Sin `after` ni `limit` se devuelve la lista completa, como antes, para no
+romper a los clientes existentes. Con `stream=True` se devuelve un
+generador que recorre la consulta por lotes con un cursor del servidor, para
+exportaciones grandes con memoria constante.
+"""
+import operator
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime
+from sqlalchemy.orm import load_only
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+# Filas que se traen de la base por lote al transmitir
+STREAM_BATCH = 500
+
+# Sufijos de los filtros de rango sobre columnas de fecha
+RANGE_SUFFIXES = {'_from': operator.ge, '_to': operator.lt}
+
+_TRUE = ('1', 'true', 'yes')
+_FALSE = ('0', 'false', 'no')
+
+
+class Page(list):
+    """Elementos de una página y el cursor de la siguiente (None si es la última)"""
+
+    def __init__(self, items, next_after=None):
+        super().__init__(items)
+        self.next_after = next_after
+
+
+def parse_datetime(value):
+    """ISO 8601 o epoch en segundos a datetime UTC sin zona, como guardan los modelos"""
+    try:
+        return datetime.fromtimestamp(float(value), tz=timezone.utc).replace(tzinfo=None)
+    except ValueError:
+        pass
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _coerce(column, value):
+    python_type = column.type.python_type
+    if python_type is bool:
+        if value.lower() in _TRUE:
+            return True
+        if value.lower() in _FALSE:
+            return False
+        raise ValueError(f"{column.name} debe ser true o false")
+    try:
+        return python_type(value)
+    except ValueError:
+        raise ValueError(f"Valor inválido para {column.name}: {value}")
+
+
+def _value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def parse_fields(args, model):
+    """Campos pedidos en `?fields=`; columnas y relaciones del modelo"""
+    raw = args.get('fields')
+    if not raw:
+        return None
+    fields = [field.strip() for field in raw.split(',') if field.strip()]
+    allowed = set(model.__mapper__.column_attrs.keys()) | set(model.__mapper__.relationships.keys())
+    unknown = [field for field in fields if field not in allowed]
+    if unknown:
+        raise ValueError(f"Campos desconocidos: {', '.join(unknown)}")
+    return fields
+
+
+def apply_filters(query, model, args, filters):
+    columns = model.__table__.columns
+    for name in filters:
+        column = columns[name]
+        if isinstance(column.type, DateTime):
+            for suffix, compare in RANGE_SUFFIXES.items():
+                value = args.get(name + suffix)
+                if value:
+                    try:
+                        query = query.filter(compare(column, parse_datetime(value)))
+                    except ValueError:
+                        raise ValueError(f"Fecha inválida para {name + suffix}: {value}")
+        else:
+            value = args.get(name)
+            if value not in (None, ''):
+                query = query.filter(column == _coerce(column, value))
+    return query
+
+
+def _cursor(args):
+    after = args.get('after')
+    limit = args.get('limit')
+    try:
+        after = int(after) if after not in (None, '') else None
+        limit = int(limit) if limit not in (None, '') else None
+    except ValueError:
+        raise ValueError("after y limit deben ser enteros")
+    if limit is not None and (limit < 1 or limit > MAX_LIMIT):
+        raise ValueError(f"limit debe estar entre 1 y {MAX_LIMIT}")
+    return after, limit
+
+
+def list_page(query, model, args=None, filters=(), eager=(), stream=False, serialize=None, row_serializer=None):
+    """
+    Aplica filtros, proyección y paginación a `query` y serializa el resultado.
+
+    `filters` son las columnas filtrables del modelo; `eager` son opciones de
+    carga (p. ej. joinedload) para las relaciones que usa `to_dict`;
+    `serialize` reemplaza a `to_dict` (p. ej. una versión resumida);
+    `row_serializer` es un RowSerializer equivalente a `to_dict` que se usa
+    en su lugar. Con `stream` devuelve un generador perezoso de elementos en
+    vez de una Page.
+    Los parámetros se validan antes de devolver: lanza ValueError si alguno
+    es inválido.
+    """
+    args = args or {}
+    pk = model.__mapper__.primary_key[0]
+    fields = parse_fields(args, model)
+    query = apply_filters(query, model, args, filters).order_by(pk)
+
+    to_dict = serialize or model.to_dict
+    columns = set(model.__table__.columns.keys())
+    if fields and set(fields) <= columns:
+        # Solo columnas: no hace falta cargar relaciones ni llamar a to_dict
+        query = query.options(load_only(*(getattr(model, name) for name in {*fields, pk.name})))
+
+        def serialize(obj):
+            return {name: _value(getattr(obj, name)) for name in fields}
+    elif row_serializer is not None and serialize is None:
+        query = row_serializer.select(query)
+        if fields:
+            def serialize(row):
+                data = row_serializer(row)
+                return {name: data.get(name) for name in fields}
+        else:
+            serialize = row_serializer
+    else:
+        query = query.options(*eager)
+        if fields:
+            def serialize(obj):
+                data = to_dict(obj)
+                return {name: data.get(name) for name in fields}
+        else:
+            serialize = to_dict
+
+    after, limit = _cursor(args)
+    if after is not None:
+        query = query.filter(pk > after)
+
+    if stream:
+        if limit is not None:
+            query = query.limit(limit)
+        # yield_per usa un cursor del servidor y libera cada lote ya serializado
+        return (serialize(obj) for obj in query.yield_per(STREAM_BATCH))
+
+    if after is None and limit is None:
+        return Page(serialize(obj) for obj in query.all())
+    limit = limit or DEFAULT_LIMIT
+
+    # Una fila extra indica si hay otra página sin hacer un COUNT
+    rows = query.limit(limit + 1).all()
+    next_after = getattr(rows[limit - 1], pk.name) if len(rows) > limit else None
+    return Page((serialize(obj) for obj in rows[:limit]), next_after)
@@ -0,0 +1,111 @@
+"""
+Caché en memoria de precio, disponibilidad y restaurante de los menús.
+
+Acotada con desalojo LRU y con contadores de aciertos y fallos. Las
+escrituras sobre menús invalidan la entrada en este proceso y la publican
+por el bus de invalidación para los demás workers (ver cache_bus.py).
+
+Una lectura que empezó antes de una invalidación no guarda su resultado:
+la generación de la caché cambia y el valor leído se descarta.
+"""
+import threading
+from collections import OrderedDict, namedtuple
+
+from app import db
+from app.business.models.menu import Menu
+from app.business.services.cache_bus import LocalCacheBus, create_cache_bus
+
+DEFAULT_SIZE = 4096
+
+MenuPricing = namedtuple('MenuPricing', 'price availability restaurant_id')
+
+
+class MenuCache:
+    NAME = 'menus'
+
+    def __init__(self, maxsize=DEFAULT_SIZE):
+        self.maxsize = maxsize
+        self.bus = LocalCacheBus()
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def init_app(self, app, start_task=None):
+        self.maxsize = int(app.config.get('MENU_CACHE_SIZE') or self.maxsize)
+        self.bus = create_cache_bus(app.config.get('CACHE_BUS_URL'), app.config.get('TRACKING_WORKER_ID'))
+        self.bus.subscribe(self.NAME, self._drop, start_task)
+
+    def get(self, menu_id):
+        """MenuPricing del menú, o None si no existe"""
+        return self.get_many([menu_id]).get(menu_id)
+
+    def get_many(self, menu_ids):
+        """{menu_id: MenuPricing} de los menús que existen; los fallos se leen con un solo IN"""
+        found = {}
+        missing = []
+        with self._lock:
+            for menu_id in set(menu_ids):
+                pricing = self._entries.get(menu_id)
+                if pricing is None:
+                    missing.append(menu_id)
+                    continue
+                self._entries.move_to_end(menu_id)
+                found[menu_id] = pricing
+            self.hits += len(found)
+            self.misses += len(missing)
+            generation = self._generation
+
+        if missing:
+            rows = db.session.query(Menu.id, Menu.price, Menu.availability, Menu.restaurant_id).filter(Menu.id.in_(missing))
+            loaded = {row.id: MenuPricing(row.price, row.availability, row.restaurant_id) for row in rows}
+            found.update(loaded)
+            self._store(loaded, generation)
+        return found
+
+    def _store(self, loaded, generation):
+        with self._lock:
+            if generation != self._generation:
+                # Hubo una invalidación durante la lectura; el valor puede ser viejo
+                return
+            for menu_id, pricing in loaded.items():
+                self._entries[menu_id] = pricing
+                self._entries.move_to_end(menu_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _drop(self, menu_ids=None):
+        with self._lock:
+            self._generation += 1
+            if menu_ids is None:
+                self._entries.clear()
+            else:
+                for menu_id in menu_ids:
+                    self._entries.pop(menu_id, None)
+
+    def invalidate(self, *menu_ids):
+        """Invalida los menús indicados aquí y en los demás workers"""
+        if not menu_ids:
+            return
+        self._drop(menu_ids)
+        self.bus.publish(self.NAME, menu_ids)
+
+    def clear(self):
+        self._drop()
+        self.bus.publish(self.NAME, None)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "shared": self.bus.shared,
+            }
@@ -0,0 +1,210 @@
+"""
+Eventos de estado de las órdenes en tiempo real (Socket.IO).
+
+Después del commit que crea, cambia de estado, reasigna o borra órdenes,
+OrderController publica un evento compacto en las salas del cliente, del
+restaurante y de la motocicleta de cada orden (también la motocicleta
+anterior si cambió):
+
+    order_status {"room": "customer:7", "events": [
+        {"seq": 42, "order_id": 15, "status": "in_progress",
+         "previous": "pending", "motorcycle_id": 3, "at": "2026-..."}
+    ]}
+
+Una orden nueva llega con previous null y una borrada con status
+"deleted". Las creaciones masivas van en un solo mensaje por sala.
+
+Cada sala numera sus eventos (seq) de forma consecutiva. Al suscribirse
+con `since` el cliente recibe del registro reciente de la sala los eventos
+que se perdió; si ya no están (o la secuencia se reinició) recibe
+`resync: true` y debe recargar su listado una vez. Un evento puede llegar
+dos veces (en vivo y repuesto): el cliente descarta los seq ya vistos.
+
+- LocalOrderEventLog: secuencias y registro en memoria, un solo proceso.
+- RedisOrderEventLog: compartidos entre workers vía Redis (dependencia
+  opcional `redis`); las emisiones llegan a todos los clientes por
+  SOCKETIO_MESSAGE_QUEUE.
+"""
+import json
+import threading
+from collections import defaultdict, deque, namedtuple
+from datetime import datetime
+
+EVENT = 'order_status'
+# Eventos recientes que se guardan por sala para reponer
+DEFAULT_BUFFER = 200
+
+ROOM_PREFIXES = {
+    'customer_id': 'customer:',
+    'restaurant_id': 'restaurant:',
+    'motorcycle_id': 'motorcycle:',
+}
+
+# Cambio de una orden ya confirmado en la base
+OrderChange = namedtuple(
+    'OrderChange',
+    'order_id status previous customer_id restaurant_id motorcycle_id previous_motorcycle_id'
+)
+
+
+def order_room(key, value):
+    """Sala de órdenes de un cliente, restaurante o motocicleta"""
+    return f"{ROOM_PREFIXES[key]}{int(value)}"
+
+
+def change_rooms(change):
+    rooms = [order_room('customer_id', change.customer_id), order_room('restaurant_id', change.restaurant_id)]
+    for motorcycle_id in {change.motorcycle_id, change.previous_motorcycle_id} - {None}:
+        rooms.append(order_room('motorcycle_id', motorcycle_id))
+    return rooms
+
+
+def change_event(change, at):
+    return {
+        "order_id": change.order_id,
+        "status": change.status,
+        "previous": change.previous,
+        "motorcycle_id": change.motorcycle_id,
+        "at": at,
+    }
+
+
+class LocalOrderEventLog:
+    shared = False
+
+    def __init__(self, size=DEFAULT_BUFFER):
+        self.size = size
+        self._seq = {}
+        self._events = {}
+        self._lock = threading.Lock()
+
+    def append(self, room, events):
+        """Numera `events` en la sala y los guarda; devuelve los eventos con seq"""
+        with self._lock:
+            seq = self._seq.get(room, 0)
+            numbered = [{**event, "seq": seq + n} for n, event in enumerate(events, 1)]
+            self._seq[room] = seq + len(events)
+            self._events.setdefault(room, deque(maxlen=self.size)).extend(numbered)
+        return numbered
+
+    def current(self, room):
+        with self._lock:
+            return self._seq.get(room, 0)
+
+    def since(self, room, seq):
+        """(eventos con seq mayor a `seq`, seq actual); None si no se pueden reponer todos"""
+        with self._lock:
+            current = self._seq.get(room, 0)
+            missed = [event for event in self._events.get(room, ()) if event["seq"] > seq]
+        if seq > current or len(missed) < current - seq:
+            return None, current
+        return missed, current
+
+
+class RedisOrderEventLog:
+    """Secuencias y registro compartidos en Redis; cada entrada es '<seq>|<json>'"""
+
+    shared = True
+
+    SEQ = 'orders:seq:'
+    LOG = 'orders:log:'
+
+    # Numerar y guardar en un solo paso para que el registro quede en orden de seq
+    _APPEND = """
+    local first = redis.call('INCRBY', KEYS[1], #ARGV - 1) - (#ARGV - 1) + 1
+    for i = 2, #ARGV do
+        redis.call('RPUSH', KEYS[2], (first + i - 2) .. '|' .. ARGV[i])
+    end
+    redis.call('LTRIM', KEYS[2], -tonumber(ARGV[1]), -1)
+    return first
+    """
+
+    def __init__(self, url, size=DEFAULT_BUFFER, client=None):
+        if client is None:
+            try:
+                import redis
+            except ImportError as e:
+                raise RuntimeError("ORDER_EVENTS_URL requiere el paquete 'redis' (pip install redis)") from e
+            client = redis.Redis.from_url(url, decode_responses=True)
+        self.redis = client
+        self.size = size
+        self._append = self.redis.register_script(self._APPEND)
+
+    def append(self, room, events):
+        encoded = [json.dumps(event, separators=(',', ':')) for event in events]
+        first = int(self._append(keys=[f"{self.SEQ}{room}", f"{self.LOG}{room}"], args=[self.size, *encoded]))
+        return [{**event, "seq": first + n} for n, event in enumerate(events)]
+
+    def current(self, room):
+        return int(self.redis.get(f"{self.SEQ}{room}") or 0)
+
+    def since(self, room, seq):
+        pipe = self.redis.pipeline()
+        pipe.get(f"{self.SEQ}{room}")
+        pipe.lrange(f"{self.LOG}{room}", 0, -1)
+        current, entries = pipe.execute()
+        current = int(current or 0)
+        missed = []
+        for entry in entries:
+            number, _, payload = entry.partition('|')
+            if int(number) > seq:
+                missed.append({**json.loads(payload), "seq": int(number)})
+        if seq > current or len(missed) < current - seq:
+            return None, current
+        return missed, current
+
+
+def create_order_event_log(url=None, size=DEFAULT_BUFFER):
+    if url:
+        return RedisOrderEventLog(url, size)
+    return LocalOrderEventLog(size)
+
+
+class OrderEventPublisher:
+    def __init__(self):
+        self.socketio = None
+        self.log = LocalOrderEventLog()
+        self.logger = None
+
+    def init_app(self, app, socketio):
+        self.socketio = socketio
+        self.logger = app.logger
+        size = int(app.config.get('ORDER_EVENTS_BUFFER') or DEFAULT_BUFFER)
+        self.log = create_order_event_log(app.config.get('ORDER_EVENTS_URL'), size)
+
+    def publish(self, changes):
+        """Emite los cambios ya confirmados, un mensaje por sala; nunca falla la escritura"""
+        if not changes or self.socketio is None:
+            return
+        at = datetime.utcnow().isoformat()
+        by_room = defaultdict(list)
+        for change in changes:
+            try:
+                event = change_event(change, at)
+                rooms = change_rooms(change)
+            except Exception:
+                # Un cambio mal formado no tumba la respuesta ni los eventos de los demás
+                if self.logger:
+                    self.logger.exception("Cambio de orden inválido: %r", change)
+                continue
+            for room in rooms:
+                by_room[room].append(event)
+        try:
+            for room, events in by_room.items():
+                self.socketio.emit(EVENT, {"room": room, "events": self.log.append(room, events)}, to=room)
+        except Exception:
+            # La orden ya se guardó: el cliente se pondrá al día con resync
+            if self.logger:
+                self.logger.exception("No se pudieron publicar los eventos de órdenes")
+
+    def resume(self, room, since):
+        """Mensaje para un cliente que se suscribe con `since`, o None si no se perdió nada"""
+        missed, current = self.log.since(room, since)
+        if missed is None:
+            return {"room": room, "events": [], "resync": True, "seq": current}
+        if missed:
+            return {"room": room, "events": missed}
+        return None
+
+    def current(self, room):
+        return self.log.current(room)
@@ -0,0 +1,136 @@
+"""
+Agregados de órdenes mantenidos de forma incremental (rollups).
+
+La tabla order_rollups guarda, por día y por cada dimensión de los
+reportes (estado, restaurante, motocicleta), el número de órdenes y la
+suma de total_price. Los reportes agrupan estas filas, así su costo depende
+del número de buckets y no del de órdenes.
+
+Cada escritura de órdenes aplica sus deltas en la misma transacción, antes
+del commit del controlador:
+
+- record(added, removed) con los hechos de órdenes individuales;
+- remove(condición) y move(condición, ...) para cambios en cascada
+  (borrar un cliente, un menú o una motocicleta, mover un menú de
+  restaurante): agregan con GROUP BY solo las órdenes afectadas, y deben
+  llamarse antes de modificar la base.
+
+rebuild() recalcula todo desde orders (la migración v0002 hace el
+relleno inicial).
+"""
+from collections import defaultdict, namedtuple
+
+from sqlalchemy import Date, delete, func, true, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app import db
+from app.business.models.menu import Menu
+from app.business.models.order import Order
+from app.business.models.order_rollup import OrderRollup
+
+DIMENSIONS = ('status', 'restaurant', 'motorcycle')
+# Bucket de las órdenes sin motocicleta asignada
+UNASSIGNED = ''
+
+# Órdenes que comparten día, estado, restaurante y motocicleta
+OrderFacts = namedtuple('OrderFacts', 'day status restaurant_id motorcycle_id orders revenue')
+
+
+def facts(order, restaurant_id):
+    """Hechos de una orden ya escrita en la sesión (created_at se asigna al hacer flush)"""
+    day = order.created_at.date() if order.created_at else None
+    return OrderFacts(day, order.status, restaurant_id, order.motorcycle_id, 1, order.total_price)
+
+
+def _buckets(fact):
+    motorcycle = UNASSIGNED if fact.motorcycle_id is None else str(fact.motorcycle_id)
+    return (('status', fact.status), ('restaurant', str(fact.restaurant_id)), ('motorcycle', motorcycle))
+
+
+def record(added=(), removed=()):
+    """Suma `added` y resta `removed` de los rollups en la transacción actual"""
+    deltas = defaultdict(lambda: [0, 0.0])
+    for sign, group in ((1, added), (-1, removed)):
+        for fact in group:
+            if fact.day is None:
+                continue
+            for dimension, bucket in _buckets(fact):
+                delta = deltas[(fact.day, dimension, bucket)]
+                delta[0] += sign * fact.orders
+                delta[1] += sign * (fact.revenue or 0.0)
+    rows = [
+        {'day': day, 'dimension': dimension, 'bucket': bucket, 'orders': orders, 'revenue': revenue}
+        for (day, dimension, bucket), (orders, revenue) in deltas.items()
+        if orders or revenue
+    ]
+    if rows:
+        _upsert(rows)
+
+
+def _upsert(rows):
+    table = OrderRollup.__table__
+    dialects = {'sqlite': sqlite, 'postgresql': postgresql}
+    dialect = dialects.get(db.session.get_bind().dialect.name)
+    if dialect is not None:
+        statement = dialect.insert(table)
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.day, table.c.dimension, table.c.bucket],
+            set_={
+                'orders': table.c.orders + statement.excluded.orders,
+                'revenue': table.c.revenue + statement.excluded.revenue,
+            },
+        )
+        db.session.execute(statement, rows)
+        return
+    # Otros motores: actualizar y crear la fila si no existía
+    for row in rows:
+        result = db.session.execute(
+            update(table)
+            .where(table.c.day == row['day'], table.c.dimension == row['dimension'], table.c.bucket == row['bucket'])
+            .values(orders=table.c.orders + row['orders'], revenue=table.c.revenue + row['revenue'])
+        )
+        if result.rowcount == 0:
+            db.session.execute(table.insert().values(**row))
+
+
+def grouped(condition):
+    """Hechos agregados de las órdenes que cumplen `condition`"""
+    day = func.date(Order.created_at, type_=Date)
+    rows = (
+        db.session.query(day, Order.status, Menu.restaurant_id, Order.motorcycle_id,
+                         func.count(Order.id), func.sum(Order.total_price))
+        .join(Menu, Order.menu_id == Menu.id)
+        .filter(condition)
+        .group_by(day, Order.status, Menu.restaurant_id, Order.motorcycle_id)
+    )
+    return [OrderFacts(*row) for row in rows]
+
+
+def remove(condition):
+    """Resta las órdenes que cumplen `condition` (antes de borrarlas)"""
+    record(removed=grouped(condition))
+
+
+def move(condition, **changes):
+    """Reasigna las órdenes que cumplen `condition` (antes del cambio), p. ej. motorcycle_id=None"""
+    current = grouped(condition)
+    record(added=[fact._replace(**changes) for fact in current], removed=current)
+
+
+def rebuild():
+    """Recalcula todos los rollups desde orders en la transacción actual"""
+    db.session.execute(delete(OrderRollup))
+    record(added=grouped(true()))
+
+
+def report(dimension, day_from=None, day_to=None, by_day=False):
+    """[(bucket o día, órdenes, ingresos)] de una dimensión; día desde inclusive, hasta exclusive"""
+    key = OrderRollup.day if by_day else OrderRollup.bucket
+    orders = func.sum(OrderRollup.orders)
+    query = db.session.query(key, orders, func.sum(OrderRollup.revenue)).filter(OrderRollup.dimension == dimension)
+    if day_from is not None:
+        query = query.filter(OrderRollup.day >= day_from)
+    if day_to is not None:
+        query = query.filter(OrderRollup.day < day_to)
+    # Los buckets que quedaron en cero tras borrados no se reportan
+    return query.group_by(key).having(orders != 0).order_by(key).all()
@@ -0,0 +1,131 @@
+"""
+Formato binario compacto para los frames de posiciones.
+
+Cada frame es un encabezado `<BII` (flags, secuencia, cantidad) seguido de
+registros de ancho fijo con el id numérico de la placa y las coordenadas en
+micro-grados:
+
+- keyframe (FLAG_KEY): `id uint32, lat int32, lng int32` absolutos.
+- delta: `id uint32` más la diferencia contra la última posición enviada a la
+  sala, en int16 si todas caben (FLAG_INT16) o en int32.
+
+El estado es por sala: un cliente suscrito a varias salas mantiene una copia
+por sala. Un keyframe reemplaza ese estado completo.
+"""
+import struct
+
+import numpy as np
+
+FLAG_KEY = 1
+FLAG_INT16 = 2
+HEADER = struct.Struct('<BII')
+SCALE = 1_000_000  # micro-grados
+
+KEY_DTYPE = np.dtype([('id', '<u4'), ('lat', '<i4'), ('lng', '<i4')])
+DELTA16_DTYPE = np.dtype([('id', '<u4'), ('lat', '<i2'), ('lng', '<i2')])
+DELTA32_DTYPE = KEY_DTYPE
+
+# Forzar un keyframe cada tantos frames aunque no haya placas nuevas
+KEYFRAME_INTERVAL = 20
+
+
+def to_micro(values):
+    return np.rint(np.asarray(values, dtype=np.float64) * SCALE).astype(np.int32)
+
+
+def _pack(flags, seq, records):
+    return HEADER.pack(flags, seq, len(records)) + records.tobytes()
+
+
+def decode_frame(payload, state):
+    """
+    Aplica un frame sobre `state` ({id: (lat, lng)} en micro-grados) y
+    devuelve (seq, [(id, lat, lng)]) en grados para los registros del frame.
+    """
+    flags, seq, count = HEADER.unpack_from(payload)
+    if flags & FLAG_KEY:
+        dtype = KEY_DTYPE
+    else:
+        dtype = DELTA16_DTYPE if flags & FLAG_INT16 else DELTA32_DTYPE
+    records = np.frombuffer(payload, dtype=dtype, count=count, offset=HEADER.size)
+
+    if flags & FLAG_KEY:
+        state.clear()
+
+    positions = []
+    for plate_id, lat, lng in records.tolist():
+        if not flags & FLAG_KEY:
+            prev_lat, prev_lng = state[plate_id]
+            lat, lng = prev_lat + lat, prev_lng + lng
+        state[plate_id] = (lat, lng)
+        positions.append((plate_id, lat / SCALE, lng / SCALE))
+    return seq, positions
+
+
+class _RoomState:
+    __slots__ = ('seq', 'since_key', 'positions')
+
+    def __init__(self):
+        self.seq = 0
+        self.since_key = None  # None obliga a enviar un keyframe
+        self.positions = {}
+
+
+class DeltaFrameEncoder:
+    """Codifica frames por sala manteniendo la última posición enviada a cada una"""
+
+    def __init__(self, keyframe_interval=KEYFRAME_INTERVAL):
+        self.keyframe_interval = keyframe_interval
+        self.rooms = {}
+
+    def reset(self, room):
+        """El próximo frame de la sala será un keyframe (p. ej. al entrar un cliente)"""
+        state = self.rooms.get(room)
+        if state is not None:
+            state.since_key = None
+
+    def discard(self, room):
+        self.rooms.pop(room, None)
+
+    def encode(self, room, ids, lats, lngs):
+        """
+        Devuelve (seq, es_keyframe, payload) para las posiciones del frame.
+        `ids` son los ids numéricos de las placas, `lats`/`lngs` en grados.
+        """
+        state = self.rooms.get(room)
+        if state is None:
+            state = self.rooms[room] = _RoomState()
+
+        ids = np.asarray(ids, dtype=np.uint32)
+        lat = to_micro(lats)
+        lng = to_micro(lngs)
+        state.seq = (state.seq + 1) & 0xFFFFFFFF
+
+        positions = state.positions
+        keyframe = (
+            state.since_key is None
+            or state.since_key >= self.keyframe_interval
+            or any(plate_id not in positions for plate_id in ids.tolist())
+        )
+
+        if keyframe:
+            records = np.empty(len(ids), dtype=KEY_DTYPE)
+            records['id'], records['lat'], records['lng'] = ids, lat, lng
+            flags = FLAG_KEY
+            positions.clear()
+            state.since_key = 0
+        else:
+            prev = np.array([positions[plate_id] for plate_id in ids.tolist()], dtype=np.int64).reshape(-1, 2)
+            dlat = lat - prev[:, 0]
+            dlng = lng - prev[:, 1]
+            fits16 = (
+                len(ids) == 0
+                or max(np.abs(dlat).max(), np.abs(dlng).max()) <= np.iinfo(np.int16).max
+            )
+            records = np.empty(len(ids), dtype=DELTA16_DTYPE if fits16 else DELTA32_DTYPE)
+            records['id'], records['lat'], records['lng'] = ids, dlat, dlng
+            flags = FLAG_INT16 if fits16 else 0
+            state.since_key += 1
+
+        positions.update(zip(ids.tolist(), zip(lat.tolist(), lng.tolist())))
+        return state.seq, keyframe, _pack(flags, state.seq, records)
@@ -0,0 +1,232 @@
+"""
+Historial de posiciones en archivos de segmento de solo anexado.
+
+Cada registro mide 20 bytes: id de placa (uint32), timestamp en milisegundos
+(int64) y lat/lng en micro-grados (int32). Los segmentos se llaman
+`segment-<ms del primer registro>.bin`, se rotan por tamaño y se leen con
+memoria mapeada. El id de cada placa se guarda en `plates.tsv`.
+
+Con varios workers (TRACKING_STATE_URL) cada uno escribe en su propia
+partición `worker-<TRACKING_WORKER_ID>/` dentro de POSITION_HISTORY_DIR,
+con sus propios ids y segmentos: ni los ids ni el orden de los timestamps
+dentro de un segmento se mezclan entre procesos. `replay` lee todas las
+particiones (y la raíz, donde escribe un worker único) y une los
+recorridos en orden cronológico.
+"""
+import heapq
+import os
+import re
+import time
+
+import numpy as np
+
+from app.business.services.position_codec import SCALE, to_micro
+from app.business.services.tracking_state import default_worker_id
+
+RECORD_DTYPE = np.dtype([('plate', '<u4'), ('ts', '<i8'), ('lat', '<i4'), ('lng', '<i4')])
+SEGMENT_BYTES = 64 * 1024 * 1024
+FLUSH_RECORDS = 4096
+FLUSH_INTERVAL = 5  # segundos máximos que un registro espera en el buffer
+PLATES_FILE = 'plates.tsv'
+SEGMENT_PREFIX = 'segment-'
+SEGMENT_SUFFIX = '.bin'
+WORKER_PREFIX = 'worker-'
+
+
+def _read_plates(directory):
+    """placa -> id según el `plates.tsv` del directorio"""
+    plate_ids = {}
+    path = os.path.join(directory, PLATES_FILE)
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                # Otro worker puede estar escribiendo la última línea
+                if not line.endswith('\n') or '\t' not in line:
+                    continue
+                plate_id, plate = line.rstrip('\n').split('\t', 1)
+                plate_ids[plate] = int(plate_id)
+    return plate_ids
+
+
+class PositionHistory:
+    """
+    Almacén de historial de posiciones. Se configura con `init_app` a partir de
+    POSITION_HISTORY_DIR; mientras no tenga directorio no registra nada.
+    """
+
+    def __init__(self, directory=None, segment_bytes=SEGMENT_BYTES, flush_records=FLUSH_RECORDS, worker_id=None):
+        self.segment_bytes = segment_bytes
+        self.flush_records = flush_records
+        self.root = None  # POSITION_HISTORY_DIR
+        self.directory = None  # partición en la que escribe este proceso
+        self.plate_ids = {}
+        self._buffer = []
+        self._last_flush = time.monotonic()
+        self._segment = None  # archivo abierto del segmento actual
+        self._segment_size = 0
+        if directory:
+            self.open(directory, worker_id)
+
+    def init_app(self, app):
+        directory = app.config.get('POSITION_HISTORY_DIR')
+        if directory:
+            worker_id = app.config.get('TRACKING_WORKER_ID')
+            if app.config.get('TRACKING_STATE_URL'):
+                # Mismo id que usa el estado compartido del tracking
+                worker_id = worker_id or default_worker_id()
+            self.open(directory, worker_id)
+
+    @property
+    def enabled(self):
+        return self.directory is not None
+
+    def open(self, directory, worker_id=None):
+        """Abre el historial; con `worker_id` escribe en la partición de ese worker"""
+        self.close()
+        self.root = directory
+        if worker_id:
+            directory = os.path.join(directory, WORKER_PREFIX + re.sub(r'[^A-Za-z0-9_.-]', '_', str(worker_id)))
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.plate_ids = _read_plates(directory)
+
+    def close(self):
+        if self.enabled:
+            self.flush()
+        if self._segment is not None:
+            self._segment.close()
+            self._segment = None
+
+    def _plate_id(self, plate):
+        plate_id = self.plate_ids.get(plate)
+        if plate_id is None:
+            plate_id = len(self.plate_ids)
+            with open(os.path.join(self.directory, PLATES_FILE), 'a', encoding='utf-8') as f:
+                f.write(f"{plate_id}\t{plate}\n")
+            self.plate_ids[plate] = plate_id
+        return plate_id
+
+    def append_frame(self, frame, timestamp=None):
+        """Registra las posiciones de un frame del scheduler ({plate, lat, lng})"""
+        if not self.enabled or not frame:
+            return
+        ts = int((time.time() if timestamp is None else timestamp) * 1000)
+        plate_id = self._plate_id
+        self._buffer.extend((plate_id(item['plate']), ts, item['lat'], item['lng']) for item in frame)
+
+        if len(self._buffer) >= self.flush_records or time.monotonic() - self._last_flush >= FLUSH_INTERVAL:
+            self.flush()
+
+    def flush(self):
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return
+        plates, ts, lats, lngs = zip(*self._buffer)
+        self._buffer = []
+
+        records = np.empty(len(plates), dtype=RECORD_DTYPE)
+        records['plate'], records['ts'] = plates, ts
+        records['lat'], records['lng'] = to_micro(lats), to_micro(lngs)
+
+        if self._segment is None or self._segment_size >= self.segment_bytes:
+            self._roll(int(records['ts'][0]))
+        self._segment.write(records.tobytes())
+        self._segment.flush()
+        self._segment_size += records.nbytes
+
+    def _roll(self, first_ts):
+        if self._segment is not None:
+            self._segment.close()
+        segments = self._segments()
+        if segments and os.path.getsize(segments[-1][1]) < self.segment_bytes:
+            # Continuar el último segmento tras un reinicio, descartando el
+            # registro incompleto que haya dejado una caída para no desalinear
+            # los siguientes
+            path = segments[-1][1]
+            size = os.path.getsize(path)
+            if size % RECORD_DTYPE.itemsize:
+                os.truncate(path, size - size % RECORD_DTYPE.itemsize)
+        else:
+            path = os.path.join(self.directory, f"{SEGMENT_PREFIX}{first_ts:016d}{SEGMENT_SUFFIX}")
+        self._segment = open(path, 'ab')
+        self._segment_size = os.path.getsize(path)
+
+    def _segments(self, directory=None):
+        """Segmentos de la partición ordenados como (ms del primer registro, ruta)"""
+        directory = directory or self.directory
+        segments = []
+        for name in os.listdir(directory):
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX):
+                start = int(name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+                segments.append((start, os.path.join(directory, name)))
+        segments.sort()
+        return segments
+
+    def _partitions(self):
+        """La raíz y la partición de cada worker que haya escrito historial"""
+        partitions = [self.root]
+        for name in sorted(os.listdir(self.root)):
+            path = os.path.join(self.root, name)
+            if name.startswith(WORKER_PREFIX) and os.path.isdir(path):
+                partitions.append(path)
+        return partitions
+
+    def replay(self, plate, start=None, end=None, limit=None):
+        """
+        Posiciones de la placa entre `start` y `end` (segundos epoch,
+        inclusivos) en orden cronológico, como lista de (ts, lat, lng).
+        """
+        if not self.enabled:
+            return []
+        self.flush()
+
+        start_ms = None if start is None else int(start * 1000)
+        end_ms = None if end is None else int(end * 1000)
+        tracks = []
+        for directory in self._partitions():
+            # Los ids son propios de cada partición
+            plate_ids = self.plate_ids if directory == self.directory else _read_plates(directory)
+            plate_id = plate_ids.get(plate)
+            if plate_id is not None:
+                track = self._replay_partition(directory, plate_id, start_ms, end_ms, limit)
+                if track:
+                    tracks.append(track)
+
+        # La placa pasa por varias particiones si cambió de worker dueño
+        result = tracks[0] if len(tracks) == 1 else list(heapq.merge(*tracks))
+        return result if limit is None else result[:limit]
+
+    def _replay_partition(self, directory, plate_id, start_ms, end_ms, limit):
+        segments = self._segments(directory)
+        result = []
+        for n, (first_ts, path) in enumerate(segments):
+            # Saltar segmentos que terminan antes del rango o empiezan después
+            next_first = segments[n + 1][0] if n + 1 < len(segments) else None
+            if start_ms is not None and next_first is not None and next_first < start_ms:
+                continue
+            if end_ms is not None and first_ts > end_ms:
+                break
+            # Solo registros completos: el segmento puede terminar en uno a medio
+            # escribir (caída del proceso o anexado en curso de otro worker)
+            count = os.path.getsize(path) // RECORD_DTYPE.itemsize
+            if not count:
+                continue
+
+            records = np.memmap(path, dtype=RECORD_DTYPE, mode='r', shape=(count,))
+            # Un solo escritor por partición: los timestamps crecen dentro del
+            # segmento y se acota con búsqueda binaria
+            ts = records['ts']
+            lo = 0 if start_ms is None else int(np.searchsorted(ts, start_ms, side='left'))
+            hi = len(records) if end_ms is None else int(np.searchsorted(ts, end_ms, side='right'))
+            window = records[lo:hi]
+            matches = window[window['plate'] == plate_id]
+
+            result.extend(zip(
+                (matches['ts'] / 1000).tolist(),
+                (matches['lat'] / SCALE).tolist(),
+                (matches['lng'] / SCALE).tolist(),
+            ))
+            del records
+            if limit is not None and len(result) >= limit:
+                return result[:limit]
+        return result
@@ -0,0 +1,128 @@
+"""
+Caché de respuestas HTTP para endpoints de lectura frecuente (catálogo).
+
+Guarda el cuerpo serializado de cada GET exitoso junto con un ETag fuerte
+(hash del cuerpo) y responde 304 cuando el cliente envía un If-None-Match
+que coincide. Cada respuesta depende de una o más etiquetas (p. ej.
+'menus', 'restaurants'); al escribir, el controlador invalida sus
+etiquetas, lo que sube la generación de cada una:
+
+- una entrada guardada con una generación anterior deja de servirse;
+- una respuesta que se empezó a construir antes de la invalidación no se
+  guarda, así una lectura concurrente no deja en caché datos viejos.
+
+Las invalidaciones se difunden a los demás workers por el bus de caché.
+"""
+import hashlib
+import threading
+from collections import OrderedDict, namedtuple
+
+from flask import Response, make_response, request
+
+from app.business.services.cache_bus import LocalCacheBus, create_cache_bus
+
+DEFAULT_SIZE = 256
+# Cuerpos más grandes no se guardan (p. ej. listados completos enormes)
+MAX_BODY = 8 * 2 ** 20
+
+# Cabeceras de la respuesta original que se conservan (paginación)
+KEPT_HEADERS = ('Link', 'X-Next-Cursor')
+
+CachedResponse = namedtuple('CachedResponse', 'body etag mimetype headers generations')
+
+
+def strong_etag(body):
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, name, maxsize=DEFAULT_SIZE):
+        self.name = name
+        self.maxsize = maxsize
+        self.bus = LocalCacheBus()
+        self._entries = OrderedDict()
+        self._generations = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def init_app(self, app, start_task=None):
+        self.maxsize = int(app.config.get('RESPONSE_CACHE_SIZE') or self.maxsize)
+        self.bus = create_cache_bus(app.config.get('CACHE_BUS_URL'), app.config.get('TRACKING_WORKER_ID'))
+        self.bus.subscribe(f"responses:{self.name}", self._bump, start_task)
+
+    def _current(self, tags):
+        return tuple(self._generations.get(tag, 0) for tag in tags)
+
+    def _bump(self, tags):
+        with self._lock:
+            for tag in (tags if tags is not None else list(self._generations)):
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+            if tags is None:
+                self._entries.clear()
+
+    def invalidate(self, *tags):
+        """Invalida las respuestas que dependen de `tags` aquí y en los demás workers"""
+        self._bump(tags)
+        self.bus.publish(f"responses:{self.name}", tags)
+
+    def _lookup(self, key, tags):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.generations == self._current(tags):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry, None
+            self.misses += 1
+            return None, self._current(tags)
+
+    def _store(self, key, tags, entry):
+        with self._lock:
+            if entry.generations != self._current(tags):
+                # Hubo una escritura mientras se construía la respuesta
+                return
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _respond(self, entry):
+        if request.if_none_match.contains(entry.etag):
+            self.not_modified += 1
+            response = Response(status=304)
+        else:
+            response = Response(entry.body, mimetype=entry.mimetype, headers=entry.headers)
+        response.set_etag(entry.etag)
+        # El cliente puede guardar la respuesta pero debe revalidarla con el ETag
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+    def respond(self, tags, build):
+        """Respuesta del GET actual desde la caché, o construida con `build()` y guardada"""
+        key = request.full_path
+        entry, generations = self._lookup(key, tags)
+        if entry is None:
+            response = make_response(build())
+            if response.status_code != 200 or response.is_streamed:
+                return response
+            body = response.get_data()
+            if len(body) > MAX_BODY:
+                return response
+            headers = [(name, response.headers[name]) for name in KEPT_HEADERS if name in response.headers]
+            entry = CachedResponse(body, strong_etag(body), response.mimetype, headers, generations)
+            self._store(key, tags, entry)
+        return self._respond(entry)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "not_modified": self.not_modified,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "shared": self.bus.shared,
+            }
@@ -0,0 +1,164 @@
+import json
+
+import numpy as np
+
+R_TIERRA = 6371000  # Radio de la Tierra en metros
+
+
+def haversine(lat1, lng1, lat2, lng2):
+    """Distancia haversine en metros; acepta escalares o arreglos de NumPy en grados"""
+    lat1, lng1, lat2, lng2 = map(np.radians, (lat1, lng1, lat2, lng2))
+    dlat = lat2 - lat1
+    dlng = lng2 - lng1
+
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlng / 2) ** 2
+    return 2 * R_TIERRA * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+class Route:
+    """
+    Ruta precalculada en arreglos compactos.
+
+    `segments[i]` es la distancia del punto i al siguiente; el último segmento
+    cierra el ciclo hacia el primer punto porque el tracker recorre la ruta en
+    bucle. `cumulative[i]` es la distancia recorrida al llegar al punto i y
+    `length` la longitud total del ciclo.
+    """
+    __slots__ = ('lats', 'lngs', 'segments', 'cumulative', 'length')
+
+    def __init__(self, lats, lngs):
+        self.lats = np.ascontiguousarray(lats, dtype=np.float64)
+        self.lngs = np.ascontiguousarray(lngs, dtype=np.float64)
+
+        # Un solo paso vectorizado para todos los segmentos, incluido el de cierre
+        self.segments = haversine(self.lats, self.lngs, np.roll(self.lats, -1), np.roll(self.lngs, -1))
+        self.cumulative = np.concatenate(([0.0], np.cumsum(self.segments[:-1])))
+        self.length = float(self.segments.sum())
+
+    def __len__(self):
+        return len(self.lats)
+
+    def point(self, index):
+        return {'lat': self.lats.item(index), 'lng': self.lngs.item(index)}
+
+    def index_at(self, offset):
+        """Índice del último punto alcanzado a `offset` metros del inicio"""
+        offset = offset % self.length if self.length else 0.0
+        return int(np.searchsorted(self.cumulative, offset, side='right')) - 1
+
+    def position_at(self, offset):
+        """Posición interpolada sobre la ruta a `offset` metros del inicio"""
+        offset = offset % self.length if self.length else 0.0
+        i = int(np.searchsorted(self.cumulative, offset, side='right')) - 1
+        j = (i + 1) % len(self)
+        segment = self.segments[i]
+        t = (offset - self.cumulative[i]) / segment if segment else 0.0
+        return {
+            'lat': float(self.lats[i] + (self.lats[j] - self.lats[i]) * t),
+            'lng': float(self.lngs[i] + (self.lngs[j] - self.lngs[i]) * t),
+        }
+
+
+    def positions_at(self, offsets):
+        """Versión vectorizada de `position_at`: arreglos (lats, lngs) para cada offset"""
+        offsets = np.asarray(offsets, dtype=np.float64)
+        offsets = np.mod(offsets, self.length) if self.length else np.zeros_like(offsets)
+        i = np.searchsorted(self.cumulative, offsets, side='right') - 1
+        j = (i + 1) % len(self)
+        segment = self.segments[i]
+        t = np.divide(offsets - self.cumulative[i], segment, out=np.zeros_like(offsets), where=segment > 0)
+        lats = self.lats[i] + (self.lats[j] - self.lats[i]) * t
+        lngs = self.lngs[i] + (self.lngs[j] - self.lngs[i]) * t
+        return lats, lngs
+
+    def project(self, lat, lng):
+        """
+        Offset en metros del punto de la ruta más cercano a (lat, lng); recorre
+        todos los segmentos, así que conviene cachear el resultado
+        """
+        if not self.length:
+            return 0.0
+        # Misma proyección local para la ruta y el punto
+        lat0 = np.cos(np.radians(self.lats.mean()))
+        x = np.radians(self.lngs) * R_TIERRA * lat0
+        y = np.radians(self.lats) * R_TIERRA
+        dx, dy = np.roll(x, -1) - x, np.roll(y, -1) - y
+        px, py = np.radians(lng) * R_TIERRA * lat0, np.radians(lat) * R_TIERRA
+        length2 = dx * dx + dy * dy
+        t = np.divide((px - x) * dx + (py - y) * dy, length2, out=np.zeros_like(x), where=length2 > 0)
+        t = np.clip(t, 0.0, 1.0)
+        i = int(np.hypot(x + t * dx - px, y + t * dy - py).argmin())
+        return float(self.cumulative[i] + t[i] * self.segments[i])
+
+
+def _to_meters(lats, lngs):
+    # Proyección equirectangular local; suficiente a escala de ciudad
+    lat0 = np.radians(lats.mean())
+    y = np.radians(lats) * R_TIERRA
+    x = np.radians(lngs) * R_TIERRA * np.cos(lat0)
+    return np.column_stack((x, y))
+
+
+def _segment_distances(points, a, b):
+    """Distancia de cada punto al segmento a-b"""
+    ab = b - a
+    length2 = float(ab @ ab)
+    if length2 == 0.0:
+        return np.hypot(*(points - a).T)
+    t = np.clip((points - a) @ ab / length2, 0.0, 1.0)
+    return np.hypot(*(points - (a + t[:, None] * ab)).T)
+
+
+def douglas_peucker(lats, lngs, tolerance):
+    """
+    Máscara de los puntos que conserva Douglas–Peucker con tolerancia en
+    metros y el error máximo (metros) de los puntos descartados.
+    """
+    n = len(lats)
+    keep = np.zeros(n, dtype=bool)
+    if n == 0:
+        return keep, 0.0
+    keep[0] = keep[-1] = True
+
+    points = _to_meters(np.asarray(lats, dtype=np.float64), np.asarray(lngs, dtype=np.float64))
+    max_error = 0.0
+    stack = [(0, n - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        distances = _segment_distances(points[first + 1:last], points[first], points[last])
+        farthest = int(distances.argmax())
+        if distances[farthest] > tolerance:
+            split = first + 1 + farthest
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+        else:
+            max_error = max(max_error, float(distances[farthest]))
+    return keep, max_error
+
+
+def read_route_file(path):
+    """Coordenadas de un archivo de `coordinates/routes/` sin duplicados consecutivos"""
+    with open(path, "r") as f:
+        raw = json.load(f)
+
+    coords = np.array([(c['lat'], c['lng']) for c in raw], dtype=np.float64).reshape(-1, 2)
+
+    # Conservar el primer punto y cada punto distinto de su anterior
+    keep = np.ones(len(coords), dtype=bool)
+    keep[1:] = np.any(coords[1:] != coords[:-1], axis=1)
+    return coords[keep], len(raw)
+
+
+def load_route(path, tolerance=0.0):
+    """
+    Carga una ruta; con `tolerance` > 0 (metros) la simplifica una sola vez con
+    Douglas–Peucker para que el tracker no recorra puntos redundantes.
+    """
+    coords, _ = read_route_file(path)
+    if tolerance > 0:
+        keep, _ = douglas_peucker(coords[:, 0], coords[:, 1], tolerance)
+        coords = coords[keep]
+    return Route(coords[:, 0], coords[:, 1])
@@ -0,0 +1,332 @@
+"""
+Secuencia de paradas de una motocicleta con varias órdenes.
+
+Cada orden aporta dos paradas: la recogida en el restaurante y la entrega
+en su dirección, y la recogida debe ir antes que la entrega. La ruta parte
+de la posición actual de la motocicleta (si está en transmisión) y termina
+en la última entrega, sin regreso.
+
+1. Vecino más cercano: desde la posición actual, la parada habilitada más
+   cercana (toda recogida; una entrega solo después de su recogida).
+2. Mejora local con primera mejora:
+   - 2-opt: invertir un tramo, si no contiene la recogida y la entrega de
+     una misma orden;
+   - or-opt: mover un tramo de 1 a 3 paradas a otra posición, si no salta
+     la entrega de una recogida del tramo (hacia adelante) ni la recogida
+     de una entrega del tramo (hacia atrás);
+   - reubicar una orden: sacar su recogida y su entrega y volver a
+     insertarlas en las mejores posiciones (entrega después de recogida).
+3. Mientras quede presupuesto de tiempo: perturbar la mejor ruta
+   reubicando órdenes al azar, mejorarla de nuevo y quedarse con la más
+   corta; termina antes si PATIENCE perturbaciones seguidas no mejoran.
+
+Las distancias entre puntos se guardan en una caché LRU entre llamadas
+(DistanceCache): restaurantes y direcciones se repiten de una
+planificación a otra.
+"""
+import random
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+from app.business.services.route_loader import haversine
+
+# Presupuesto de tiempo por defecto de la optimización, en segundos
+DEFAULT_BUDGET = 0.1
+DEFAULT_CACHE_SIZE = 200000
+# Decimales de las coordenadas en la llave de la caché (~0.1 m)
+KEY_DECIMALS = 6
+# Longitud máxima de los tramos que mueve or-opt
+OR_OPT_MAX = 3
+# Perturbaciones seguidas sin mejora tras las que se detiene la búsqueda
+PATIENCE = 50
+# Órdenes reubicadas al azar en cada perturbación
+PERTURBATION = 2
+
+# Parada de la ruta: `kind` es 'pickup' o 'delivery'
+Stop = namedtuple('Stop', 'order_id kind lat lng')
+Plan = namedtuple('Plan', 'stops legs distance initial_distance elapsed')
+
+
+def point_key(lat, lng):
+    return round(lat, KEY_DECIMALS), round(lng, KEY_DECIMALS)
+
+
+class DistanceCache:
+    """Distancias en metros entre pares de puntos, acotadas con desalojo LRU"""
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def matrix(self, points):
+        """Matriz simétrica de distancias entre `points` [(lat, lng)] como listas"""
+        keys = [point_key(lat, lng) for lat, lng in points]
+        n = len(keys)
+        matrix = [[0.0] * n for _ in range(n)]
+        missing = []
+        with self._lock:
+            for i in range(n):
+                for j in range(i + 1, n):
+                    pair = (keys[i], keys[j]) if keys[i] <= keys[j] else (keys[j], keys[i])
+                    distance = self._entries.get(pair)
+                    if distance is None:
+                        missing.append((i, j, pair))
+                        continue
+                    self._entries.move_to_end(pair)
+                    matrix[i][j] = matrix[j][i] = distance
+            self.hits += n * (n - 1) // 2 - len(missing)
+            self.misses += len(missing)
+
+        if missing:
+            first = np.array([keys[i] for i, _, _ in missing])
+            second = np.array([keys[j] for _, j, _ in missing])
+            distances = haversine(first[:, 0], first[:, 1], second[:, 0], second[:, 1]).tolist()
+            with self._lock:
+                for (i, j, pair), distance in zip(missing, distances):
+                    matrix[i][j] = matrix[j][i] = distance
+                    self._entries[pair] = distance
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return matrix
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            }
+
+
+def route_length(route, dist):
+    return sum(dist[a][b] for a, b in zip(route, route[1:]))
+
+
+def nearest_neighbour(dist, partner, pickups):
+    """
+    Ruta inicial [0, paradas..., fin] por vecino más cercano; el índice 0 es
+    la posición de partida y el último un final virtual a distancia 0
+    """
+    end = len(dist) - 1
+    available = set(pickups)
+    route = [0]
+    current = 0
+    while available:
+        nearest = min(available, key=lambda stop: dist[current][stop])
+        available.discard(nearest)
+        if nearest in pickups:
+            available.add(partner[nearest])
+        route.append(nearest)
+        current = nearest
+    route.append(end)
+    return route
+
+
+def two_opt(route, dist, partner, pos, deadline):
+    """Primera inversión de tramo que acorta la ruta; True si aplicó una"""
+    last = len(route) - 2
+    for i in range(1, last):
+        if time.perf_counter() > deadline:
+            return False
+        before = route[i - 1]
+        start = route[i]
+        for j in range(i + 1, last + 1):
+            # Un tramo que contiene la recogida y la entrega de una orden las invertiría
+            if i <= pos[partner[route[j]]] < j:
+                break
+            stop, after = route[j], route[j + 1]
+            delta = dist[before][stop] + dist[start][after] - dist[before][start] - dist[stop][after]
+            if delta < -1e-7:
+                route[i:j + 1] = route[i:j + 1][::-1]
+                for k in range(i, j + 1):
+                    pos[route[k]] = k
+                return True
+    return False
+
+
+def or_opt(route, dist, partner, pos, pickups, deadline):
+    """Primer movimiento de un tramo de 1 a OR_OPT_MAX paradas que acorta la ruta; True si aplicó uno"""
+    last = len(route) - 2
+    for length in range(1, OR_OPT_MAX + 1):
+        for i in range(1, last - length + 2):
+            if time.perf_counter() > deadline:
+                return False
+            j = i + length - 1
+            segment = route[i:j + 1]
+            prev, nxt = route[i - 1], route[j + 1]
+            gain = dist[prev][route[i]] + dist[route[j]][nxt] - dist[prev][nxt]
+            if gain <= 1e-7:
+                continue
+            # Posición más lejana a la que puede avanzar o retroceder sin romper la precedencia
+            forward = min((pos[partner[stop]] for stop in segment if stop in pickups and pos[partner[stop]] > j),
+                          default=last + 1)
+            backward = max((pos[partner[stop]] for stop in segment if stop not in pickups and pos[partner[stop]] < i),
+                           default=0)
+            for k in range(backward, forward):
+                # Insertar entre route[k] y route[k + 1]
+                if i - 1 <= k <= j:
+                    continue
+                u, v = route[k], route[k + 1]
+                delta = dist[u][route[i]] + dist[route[j]][v] - dist[u][v] - gain
+                if delta < -1e-7:
+                    if k > j:
+                        route[i:k + 1] = route[j + 1:k + 1] + segment
+                        moved = range(i, k + 1)
+                    else:
+                        route[k + 1:j + 1] = segment + route[k + 1:i]
+                        moved = range(k + 1, j + 1)
+                    for index in moved:
+                        pos[route[index]] = index
+                    return True
+    return False
+
+
+def _insert_pair(route, pickup, delivery, first, second):
+    """Inserta la recogida antes de route[first] y la entrega antes de route[second] (second >= first)"""
+    return route[:first] + [pickup] + route[first:second] + [delivery] + route[second:]
+
+
+def relocate(route, dist, partner, pos, pickups, deadline):
+    """Primera orden cuya recogida y entrega reinsertadas en su mejor lugar acortan la ruta; True si aplicó una"""
+    for pickup in sorted(pickups, key=pos.__getitem__):
+        if time.perf_counter() > deadline:
+            return False
+        delivery = partner[pickup]
+        a, b = pos[pickup], pos[delivery]
+        if b == a + 1:
+            before, after = route[a - 1], route[b + 1]
+            gain = dist[before][pickup] + dist[pickup][delivery] + dist[delivery][after] - dist[before][after]
+        else:
+            gain = (dist[route[a - 1]][pickup] + dist[pickup][route[a + 1]] - dist[route[a - 1]][route[a + 1]]
+                    + dist[route[b - 1]][delivery] + dist[delivery][route[b + 1]] - dist[route[b - 1]][route[b + 1]])
+        rest = route[:a] + route[a + 1:b] + route[b + 1:]
+
+        # Para cada posición de la entrega, la mejor posición anterior de la recogida (mínimo acumulado)
+        best, best_first = None, None
+        best_delta, best_pair = -1e-7, None
+        for x in range(len(rest) - 1):
+            u, v = rest[x], rest[x + 1]
+            edge = dist[u][v]
+            together = dist[u][pickup] + dist[pickup][delivery] + dist[delivery][v] - edge - gain
+            if together < best_delta:
+                best_delta, best_pair = together, (x + 1, x + 1)
+            if best is not None:
+                apart = best + dist[u][delivery] + dist[delivery][v] - edge - gain
+                if apart < best_delta:
+                    best_delta, best_pair = apart, (best_first, x + 1)
+            pickup_cost = dist[u][pickup] + dist[pickup][v] - edge
+            if best is None or pickup_cost < best:
+                best, best_first = pickup_cost, x + 1
+        if best_pair is not None:
+            route[:] = _insert_pair(rest, pickup, delivery, *best_pair)
+            for index, stop in enumerate(route):
+                pos[stop] = index
+            return True
+    return False
+
+
+def local_search(route, dist, partner, pickups, deadline):
+    """Mejora `route` en su lugar hasta un óptimo local de los tres vecindarios o hasta `deadline`"""
+    pos = {stop: index for index, stop in enumerate(route)}
+    while time.perf_counter() <= deadline:
+        if two_opt(route, dist, partner, pos, deadline):
+            continue
+        if or_opt(route, dist, partner, pos, pickups, deadline):
+            continue
+        if not relocate(route, dist, partner, pos, pickups, deadline):
+            break
+    return route
+
+
+def perturb(route, partner, pickups, rng, count=PERTURBATION):
+    """Copia de `route` con `count` órdenes reubicadas en posiciones al azar"""
+    route = list(route)
+    for pickup in rng.sample(sorted(pickups), min(count, len(pickups))):
+        delivery = partner[pickup]
+        route.remove(pickup)
+        route.remove(delivery)
+        # Entre la partida (índice 0) y el final virtual (último)
+        first = rng.randint(1, len(route) - 1)
+        second = rng.randint(first, len(route) - 1)
+        route = _insert_pair(route, pickup, delivery, first, second)
+    return route
+
+
+def optimize(route, dist, partner, pickups, budget=DEFAULT_BUDGET, seed=0):
+    """Mejora `route` en su lugar: búsqueda local y perturbaciones hasta agotar `budget` segundos"""
+    deadline = time.perf_counter() + budget
+    local_search(route, dist, partner, pickups, deadline)
+    best, best_length = list(route), route_length(route, dist)
+    rng = random.Random(seed)
+    stale = 0
+    while len(pickups) > 1 and stale < PATIENCE and time.perf_counter() <= deadline:
+        candidate = local_search(perturb(best, partner, pickups, rng), dist, partner, pickups, deadline)
+        length = route_length(candidate, dist)
+        if length < best_length - 1e-7:
+            best, best_length, stale = candidate, length, 0
+        else:
+            stale += 1
+    route[:] = best
+    return route
+
+
+class RoutePlanner:
+    def __init__(self, budget=DEFAULT_BUDGET, cache_size=DEFAULT_CACHE_SIZE):
+        self.budget = budget
+        self.distances = DistanceCache(cache_size)
+
+    def init_app(self, app):
+        self.budget = float(app.config.get('ROUTE_PLAN_BUDGET_MS') or self.budget * 1000) / 1000
+        self.distances = DistanceCache(int(app.config.get('ROUTE_PLAN_CACHE_SIZE') or self.distances.maxsize))
+
+    def plan(self, orders, start=None, budget=None):
+        """
+        Secuencia de paradas para `orders` [(order_id, (lat, lng) de recogida,
+        (lat, lng) de entrega)] partiendo de `start` (lat, lng) o, sin él, de
+        la primera parada
+        """
+        began = time.perf_counter()
+        stops = [None]
+        for order_id, pickup, delivery in orders:
+            stops.append(Stop(order_id, 'pickup', *pickup))
+            stops.append(Stop(order_id, 'delivery', *delivery))
+        if len(stops) == 1:
+            return Plan([], [], 0.0, 0.0, 0.0)
+
+        # Índice 0: partida; último: final virtual. Sin partida, su fila queda en 0
+        points = [(stop.lat, stop.lng) for stop in stops[1:]]
+        if start:
+            points.insert(0, start)
+        inner = self.distances.matrix(points)
+        size = len(stops) + 1
+        dist = [[0.0] * size for _ in range(size)]
+        offset = 0 if start else 1
+        for i, row in enumerate(inner):
+            dist[i + offset][offset:offset + len(row)] = row
+
+        pickups = set(range(1, len(stops), 2))
+        partner = {}
+        for pickup in pickups:
+            partner[pickup], partner[pickup + 1] = pickup + 1, pickup
+        # El final virtual no tiene pareja: ningún tramo lo incluye
+        partner[size - 1] = size - 1
+
+        route = nearest_neighbour(dist, partner, pickups)
+        initial = route_length(route, dist)
+        optimize(route, dist, partner, pickups, self.budget if budget is None else budget)
+
+        sequence = route[1:-1]
+        legs = [dist[a][b] for a, b in zip(route, sequence)]
+        return Plan([stops[stop] for stop in sequence], legs, sum(legs), initial, time.perf_counter() - began)
@@ -0,0 +1,94 @@
+"""
+Serializadores precompilados de filas para los listados.
+
+Un RowSerializer produce el mismo diccionario que Model.to_dict (con las
+relaciones anidadas que se le indiquen) pero a partir de una fila Core
+(tupla) en vez de una instancia ORM: la consulta selecciona las columnas
+del modelo y de sus relaciones con OUTER JOIN, sin hidratar objetos ni
+pasar por el identity map.
+
+La función de cada modelo se genera como código Python la primera vez que
+se usa: desempaqueta la tupla y arma el diccionario en una sola expresión,
+con isoformat() para las fechas y None para las relaciones ausentes.
+
+Las relaciones uno a muchos declaradas con uselist=False (p. ej.
+Order.address) no tienen unicidad en la base: se une solo la fila
+relacionada de menor id (`first_related`) para que cada elemento salga
+una vez, como con joinedload.
+
+    rows = RowSerializer(Order, Order.customer, (Order.menu, Menu.product))
+    query = rows.select(Order.query)
+    items = [rows(row) for row in query]
+"""
+from itertools import count
+
+from sqlalchemy import Date, DateTime, func, select
+from sqlalchemy.orm import ONETOMANY
+
+
+def first_related(attribute):
+    """
+    `attribute` (relación uselist=False) para outerjoin, restringida a la
+    fila relacionada de menor llave primaria
+    """
+    prop = attribute.property
+    pk = prop.mapper.primary_key[0]
+    inner = prop.mapper.local_table.alias()
+    first = select(func.min(inner.c[pk.name])).where(
+        *(inner.c[remote.name] == local for local, remote in prop.local_remote_pairs)
+    ).scalar_subquery()
+    return attribute.and_(pk == first)
+
+
+class RowSerializer:
+    def __init__(self, model, *relations):
+        """`relations`: atributos de relación, o tuplas (relación, subrelaciones...) para anidar"""
+        self.model = model
+        self.relations = relations
+        self._compiled = None
+
+    def _compile(self):
+        columns, joins, names = [], [], count()
+
+        def build(model, relations, prefix):
+            items = []
+            pk = None
+            for column in model.__table__.columns:
+                name = f"c{next(names)}"
+                label = column.name if not prefix else f"{prefix}{column.name}"
+                columns.append(column.label(label))
+                if column.primary_key:
+                    pk = name
+                if isinstance(column.type, (DateTime, Date)):
+                    value = f"{name}.isoformat() if {name} is not None else None"
+                else:
+                    value = name
+                items.append(f"{column.name!r}: {value}")
+            for relation in relations:
+                attribute, nested = (relation[0], relation[1:]) if isinstance(relation, tuple) else (relation, ())
+                prop = attribute.property
+                single = prop.direction is ONETOMANY and not prop.uselist
+                joins.append(first_related(attribute) if single else attribute)
+                child, child_pk = build(attribute.property.mapper.class_, nested, f"{prefix}{attribute.key}__")
+                # OUTER JOIN sin fila: la relación va en None como en to_dict
+                items.append(f"{attribute.key!r}: ({child} if {child_pk} is not None else None)")
+            return "{" + ", ".join(items) + "}", pk
+
+        body, _ = build(self.model, self.relations, "")
+        unpack = ", ".join(f"c{n}" for n in range(len(columns)))
+        source = f"def serialize(row):\n    ({unpack},) = row\n    return {body}\n"
+        namespace = {}
+        exec(compile(source, f"<RowSerializer {self.model.__name__}>", "exec"), namespace)
+        self._compiled = (columns, joins, namespace['serialize'])
+        return self._compiled
+
+    def select(self, query):
+        """`query` (sobre el modelo) con las columnas planas y los OUTER JOIN de las relaciones"""
+        columns, joins, _ = self._compiled or self._compile()
+        query = query.with_entities(*columns)
+        for attribute in joins:
+            query = query.outerjoin(attribute)
+        return query
+
+    def __call__(self, row):
+        return (self._compiled or self._compile())[2](row)
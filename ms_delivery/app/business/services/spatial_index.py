@@ -0,0 +1,122 @@
+import heapq
+import math
+
+from app.business.services.route_loader import R_TIERRA
+
+# Tamaño de celda en grados (~550 m en el ecuador)
+CELL_SIZE = 0.005
+METROS_POR_GRADO = math.pi * R_TIERRA / 180
+
+
+def _haversine(lat1, lng1, lat2, lng2):
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * R_TIERRA * math.asin(min(1.0, math.sqrt(a)))
+
+
+class SpatialGrid:
+    """
+    Índice en memoria de las posiciones vivas por celdas de una grilla uniforme.
+
+    Las actualizaciones son incrementales: si la placa sigue en la misma celda
+    solo se reemplazan sus coordenadas; si cambió de celda se mueve entre los
+    dos conjuntos.
+    """
+
+    def __init__(self, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        self.positions = {}  # placa -> (lat, lng, celda)
+        self.cells = {}  # celda -> {placas}
+
+    def __len__(self):
+        return len(self.positions)
+
+    def cell_of(self, lat, lng):
+        return math.floor(lat / self.cell_size), math.floor(lng / self.cell_size)
+
+    def update(self, plate, lat, lng):
+        cell = self.cell_of(lat, lng)
+        previous = self.positions.get(plate)
+        if previous is not None and previous[2] != cell:
+            self._discard(plate, previous[2])
+        if previous is None or previous[2] != cell:
+            self.cells.setdefault(cell, set()).add(plate)
+        self.positions[plate] = (lat, lng, cell)
+
+    def remove(self, plate):
+        previous = self.positions.pop(plate, None)
+        if previous is not None:
+            self._discard(plate, previous[2])
+        return previous is not None
+
+    def _discard(self, plate, cell):
+        members = self.cells.get(cell)
+        if members is not None:
+            members.discard(plate)
+            if not members:
+                del self.cells[cell]
+
+    def nearest(self, lat, lng, k=10, radius=None):
+        """
+        Las `k` placas más cercanas dentro de `radius` metros, ordenadas por
+        distancia, como lista de (distancia, placa, lat, lng).
+
+        Recorre anillos de celdas alrededor del punto y se detiene cuando el
+        anillo siguiente ya no puede contener una placa más cercana que la
+        k-ésima encontrada o queda fuera del radio.
+        """
+        if k <= 0 or not self.positions:
+            return []
+
+        row, col = self.cell_of(lat, lng)
+        # Lado mínimo de una celda en metros (la longitud se encoge con la latitud)
+        cos_lat = max(math.cos(math.radians(abs(lat) + self.cell_size)), 1e-6)
+        cell_m = self.cell_size * METROS_POR_GRADO * cos_lat
+
+        max_ring = None
+        if radius is not None:
+            max_ring = int(radius // cell_m) + 1
+        if max_ring is None or max_ring * max_ring > len(self.cells):
+            # Sin radio útil, limitar los anillos a la extensión ocupada
+            rows = [r for r, _ in self.cells]
+            cols = [c for _, c in self.cells]
+            extent = max(
+                abs(row - min(rows)), abs(row - max(rows)),
+                abs(col - min(cols)), abs(col - max(cols)),
+            )
+            max_ring = extent if max_ring is None else min(max_ring, extent)
+
+        best = []  # heap de (-distancia, placa, lat, lng) con las k mejores
+        for ring in range(max_ring + 1):
+            # Ninguna placa del anillo está a menos de esta distancia del punto
+            lower_bound = (ring - 1) * cell_m if ring > 0 else 0.0
+            if radius is not None and lower_bound > radius:
+                break
+            if len(best) == k and lower_bound > -best[0][0]:
+                break
+
+            for cell in self._ring(row, col, ring):
+                for plate in self.cells.get(cell, ()):
+                    p_lat, p_lng, _ = self.positions[plate]
+                    distance = _haversine(lat, lng, p_lat, p_lng)
+                    if radius is not None and distance > radius:
+                        continue
+                    entry = (-distance, plate, p_lat, p_lng)
+                    if len(best) < k:
+                        heapq.heappush(best, entry)
+                    elif distance < -best[0][0]:
+                        heapq.heapreplace(best, entry)
+
+        return sorted((-d, plate, p_lat, p_lng) for d, plate, p_lat, p_lng in best)
+
+    @staticmethod
+    def _ring(row, col, ring):
+        if ring == 0:
+            yield row, col
+            return
+        for c in range(col - ring, col + ring + 1):
+            yield row - ring, c
+            yield row + ring, c
+        for r in range(row - ring + 1, row + ring):
+            yield r, col - ring
+            yield r, col + ring
@@ -0,0 +1,60 @@
+import math
+
+# Tamaño de la celda de región en grados (~1.1 km en el ecuador)
+TILE_SIZE = 0.01
+# Máximo de celdas que un cliente puede suscribir con un solo viewport
+MAX_TILES = 400
+PLATE_PREFIX = 'plate:'
+TILE_PREFIX = 'tile:'
+# Variante de cada sala para clientes que negociaron el formato binario
+BINARY_SUFFIX = '|bin'
+
+
+def plate_room(plate):
+    return f"{PLATE_PREFIX}{plate}"
+
+
+def binary_room(room):
+    return f"{room}{BINARY_SUFFIX}"
+
+
+def base_room(room):
+    return room[:-len(BINARY_SUFFIX)] if room.endswith(BINARY_SUFFIX) else room
+
+
+def tile_of(lat, lng):
+    return math.floor(lat / TILE_SIZE), math.floor(lng / TILE_SIZE)
+
+
+def tile_room(tile):
+    return f"{TILE_PREFIX}{tile[0]}:{tile[1]}"
+
+
+def tiles_for_bounds(south, west, north, east):
+    """Celdas que cubren un viewport; error si el área excede MAX_TILES"""
+    min_row, min_col = tile_of(south, west)
+    max_row, max_col = tile_of(north, east)
+    count = (max_row - min_row + 1) * (max_col - min_col + 1)
+    if max_row < min_row or max_col < min_col or count > MAX_TILES:
+        raise ValueError(f"El viewport debe cubrir entre 1 y {MAX_TILES} celdas")
+    return [(row, col) for row in range(min_row, max_row + 1) for col in range(min_col, max_col + 1)]
+
+
+def group_by_room(frame, occupied=None):
+    """
+    Agrupa un frame de posiciones por sala de placa y sala de región; con
+    `occupied` solo las salas con suscriptores en alguna de sus variantes
+    """
+    rooms = {}
+    for item in frame:
+        for room in (plate_room(item['plate']), tile_room(tile_of(item['lat'], item['lng']))):
+            if occupied is None or occupied.get(room) or occupied.get(room + BINARY_SUFFIX):
+                rooms.setdefault(room, []).append(item)
+    return rooms
+
+
+def occupied_rooms(socketio, namespace='/'):
+    """Salas con al menos un cliente conectado en el namespace"""
+    if socketio.server is None:
+        return {}
+    return socketio.server.manager.rooms.get(namespace, {})
@@ -0,0 +1,259 @@
+"""
+Estado compartido del tracking entre procesos worker.
+
+Cada placa tiene exactamente un worker dueño, que es el único que la
+simula y emite. El backend registra los dueños, enruta comandos (p. ej.
+detener una placa) al worker dueño y lleva la cuenta de suscriptores por
+sala para que el dueño sepa a qué salas emitir aunque los clientes estén
+conectados a otro worker. Cada worker lleva sus propias cuentas y solo se
+suman las de los workers que siguen latiendo: las de un worker caído dejan
+de contar sin esperar a que sus clientes se desconecten.
+
+- LocalTrackingState: en memoria, para un solo proceso y para pruebas.
+- RedisTrackingState: compartido vía Redis (dependencia opcional `redis`).
+"""
+import json
+import logging
+import os
+import socket
+import time
+
+logger = logging.getLogger(__name__)
+
+# Segundos sin latido tras los que un worker se considera caído
+WORKER_TTL = 15
+# Segundos entre latidos del worker aunque no simule placas
+HEARTBEAT_INTERVAL = WORKER_TTL / 3
+# Segundos que se guardan las cuentas de salas de un worker que dejó de latir
+ROOMS_TTL = 3600
+
+
+def default_worker_id():
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class LocalTrackingHub:
+    """Estado en memoria que pueden compartir varios LocalTrackingState del mismo proceso"""
+
+    def __init__(self):
+        self.owners = {}
+        self.handlers = {}
+        self.rooms = {}
+
+
+class LocalTrackingState:
+    """
+    Estado en memoria. Sin `hub` representa un único worker; con un hub
+    compartido simula varios workers dentro de un proceso (pruebas).
+    """
+
+    def __init__(self, worker_id=None, hub=None):
+        self.worker_id = worker_id or default_worker_id()
+        self.shared = hub is not None
+        self.hub = hub or LocalTrackingHub()
+
+    def claim(self, plate):
+        """Registra a este worker como dueño si la placa no tiene uno; devuelve el dueño"""
+        return self.hub.owners.setdefault(plate, self.worker_id)
+
+    def release(self, plate):
+        if self.hub.owners.get(plate) == self.worker_id:
+            del self.hub.owners[plate]
+            return True
+        return False
+
+    def owner(self, plate):
+        return self.hub.owners.get(plate)
+
+    def heartbeat(self):
+        pass
+
+    def send(self, worker_id, command):
+        # En memoria el comando se entrega de inmediato
+        handler = self.hub.handlers.get(worker_id)
+        if handler is not None:
+            handler(command)
+
+    def broadcast(self, command):
+        for handler in list(self.hub.handlers.values()):
+            handler(command)
+
+    def listen(self, handler, start_task=None):
+        self.hub.handlers[self.worker_id] = handler
+
+    def room_joined(self, room):
+        self.hub.rooms[room] = self.hub.rooms.get(room, 0) + 1
+
+    def room_left(self, room):
+        count = self.hub.rooms.get(room, 0) - 1
+        if count > 0:
+            self.hub.rooms[room] = count
+        else:
+            self.hub.rooms.pop(room, None)
+
+    def occupied(self, local_rooms):
+        # Un solo worker ve a todos sus clientes en las salas locales
+        return self.hub.rooms if self.shared else local_rooms
+
+
+class RedisTrackingState:
+    """Estado compartido en Redis para varios workers"""
+
+    shared = True
+
+    OWNERS = 'tracking:owners'
+    ROOMS = 'tracking:rooms:'
+    WORKERS = 'tracking:workers'
+    ALIVE = 'tracking:alive:'
+    COMMANDS = 'tracking:commands:'
+    BROADCAST = 'tracking:broadcast'
+
+    # Reclamar la placa si no tiene dueño o si su dueño dejó de latir
+    _CLAIM = """
+    local owner = redis.call('HGET', KEYS[1], ARGV[1])
+    if owner and redis.call('EXISTS', ARGV[3] .. owner) == 1 then
+        return owner
+    end
+    redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+    return ARGV[2]
+    """
+
+    # Liberar solo si este worker sigue siendo el dueño
+    _RELEASE = """
+    if redis.call('HGET', KEYS[1], ARGV[1]) == ARGV[2] then
+        return redis.call('HDEL', KEYS[1], ARGV[1])
+    end
+    return 0
+    """
+
+    # Dueño vigente de la placa; si dejó de latir se borra su registro y la
+    # placa queda libre
+    _OWNER = """
+    local owner = redis.call('HGET', KEYS[1], ARGV[1])
+    if owner and owner ~= ARGV[2] and redis.call('EXISTS', ARGV[3] .. owner) == 0 then
+        redis.call('HDEL', KEYS[1], ARGV[1])
+        return false
+    end
+    return owner
+    """
+
+    # Sumar las cuentas de salas de los workers vivos; olvidar los que ya no
+    # tienen cuentas guardadas
+    _OCCUPIED = """
+    local totals, rooms = {}, {}
+    for _, worker in ipairs(redis.call('SMEMBERS', KEYS[1])) do
+        if redis.call('EXISTS', ARGV[2] .. worker) == 0 then
+            redis.call('SREM', KEYS[1], worker)
+        elseif redis.call('EXISTS', ARGV[1] .. worker) == 1 then
+            local counts = redis.call('HGETALL', ARGV[2] .. worker)
+            for i = 1, #counts, 2 do
+                local room = counts[i]
+                if not totals[room] then
+                    totals[room] = 0
+                    table.insert(rooms, room)
+                end
+                totals[room] = totals[room] + tonumber(counts[i + 1])
+            end
+        end
+    end
+    local result = {}
+    for _, room in ipairs(rooms) do
+        if totals[room] > 0 then
+            table.insert(result, room)
+            table.insert(result, totals[room])
+        end
+    end
+    return result
+    """
+
+    def __init__(self, url, worker_id=None, client=None):
+        if client is None:
+            try:
+                import redis
+            except ImportError as e:
+                raise RuntimeError("TRACKING_STATE_URL requiere el paquete 'redis' (pip install redis)") from e
+            client = redis.Redis.from_url(url, decode_responses=True)
+        self.redis = client
+        self.worker_id = worker_id or default_worker_id()
+        self._claim = self.redis.register_script(self._CLAIM)
+        self._release = self.redis.register_script(self._RELEASE)
+        self._occupied = self.redis.register_script(self._OCCUPIED)
+        self._owner = self.redis.register_script(self._OWNER)
+        self.rooms_key = f"{self.ROOMS}{self.worker_id}"
+        self.heartbeat()
+
+    def claim(self, plate):
+        self.heartbeat()
+        return self._claim(keys=[self.OWNERS], args=[plate, self.worker_id, self.ALIVE])
+
+    def release(self, plate):
+        return bool(self._release(keys=[self.OWNERS], args=[plate, self.worker_id]))
+
+    def owner(self, plate):
+        """Dueño vivo de la placa o None; libera la placa de un dueño caído"""
+        return self._owner(keys=[self.OWNERS], args=[plate, self.worker_id, self.ALIVE])
+
+    def heartbeat(self):
+        pipe = self.redis.pipeline()
+        pipe.set(f"{self.ALIVE}{self.worker_id}", 1, ex=WORKER_TTL)
+        pipe.expire(self.rooms_key, ROOMS_TTL)
+        pipe.execute()
+
+    def send(self, worker_id, command):
+        self.redis.publish(f"{self.COMMANDS}{worker_id}", json.dumps(command))
+
+    def broadcast(self, command):
+        self.redis.publish(self.BROADCAST, json.dumps(command))
+
+    def listen(self, handler, start_task):
+        """
+        Atiende en segundo plano los comandos dirigidos a este worker o a
+        todos y mantiene su latido, también cuando no simula placas pero
+        tiene clientes suscritos
+        """
+        pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(f"{self.COMMANDS}{self.worker_id}", self.BROADCAST)
+
+        def run():
+            last_beat = time.monotonic()
+            while True:
+                try:
+                    message = pubsub.get_message(timeout=HEARTBEAT_INTERVAL)
+                    if time.monotonic() - last_beat >= HEARTBEAT_INTERVAL:
+                        self.heartbeat()
+                        last_beat = time.monotonic()
+                except Exception:
+                    logger.exception("Falló la conexión con el estado de tracking")
+                    time.sleep(HEARTBEAT_INTERVAL)
+                    continue
+                if message is None:
+                    continue
+                # Un comando inválido o que falla no deja al worker sin escuchar los siguientes
+                try:
+                    handler(json.loads(message['data']))
+                except Exception:
+                    logger.exception("Falló el comando de tracking %r", message.get('data'))
+
+        start_task(run)
+
+    def room_joined(self, room):
+        pipe = self.redis.pipeline()
+        pipe.hincrby(self.rooms_key, room, 1)
+        pipe.expire(self.rooms_key, ROOMS_TTL)
+        pipe.sadd(self.WORKERS, self.worker_id)
+        pipe.execute()
+
+    def room_left(self, room):
+        if self.redis.hincrby(self.rooms_key, room, -1) <= 0:
+            self.redis.hdel(self.rooms_key, room)
+
+    def occupied(self, local_rooms):
+        # Los clientes pueden estar conectados a cualquier worker
+        counts = self._occupied(keys=[self.WORKERS], args=[self.ALIVE, self.ROOMS])
+        return {room: int(count) for room, count in zip(counts[::2], counts[1::2])}
+
+
+def create_tracking_state(url=None, worker_id=None):
+    if url:
+        return RedisTrackingState(url, worker_id)
+    return LocalTrackingState(worker_id)
@@ -0,0 +1,119 @@
+"""
+Migraciones versionadas del esquema.
+
+Cada módulo `vNNNN_<nombre>.py` de este paquete define VERSION,
+DESCRIPTION, upgrade(connection) y downgrade(connection). La tabla
+`schema_migrations` registra las versiones aplicadas; create_app aplica las
+pendientes después de db.create_all() (desactivable con AUTO_MIGRATE=0).
+
+Como una base nueva ya sale de create_all con el esquema actual de los
+modelos, cada migración debe ser idempotente (p. ej. índices con
+checkfirst) y quedar registrada sin cambiar nada en ese caso.
+
+Comandos (desde ms_delivery/):
+    flask --app run migrations status
+    flask --app run migrations upgrade [versión]
+    flask --app run migrations downgrade <versión>
+"""
+import importlib
+import pkgutil
+from datetime import datetime
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, select
+from sqlalchemy.exc import IntegrityError
+
+metadata = MetaData()
+
+schema_migrations = Table(
+    'schema_migrations', metadata,
+    Column('version', Integer, primary_key=True),
+    Column('description', String(200), nullable=False),
+    Column('applied_at', DateTime, nullable=False),
+)
+
+
+def available():
+    """Módulos de migración del paquete, en orden de versión"""
+    modules = [
+        importlib.import_module(f"{__name__}.{name}")
+        for _, name, _ in pkgutil.iter_modules(__path__)
+        if name.startswith('v')
+    ]
+    return sorted(modules, key=lambda module: module.VERSION)
+
+
+def applied_versions(engine):
+    with engine.begin() as connection:
+        schema_migrations.create(connection, checkfirst=True)
+        return {row.version for row in connection.execute(select(schema_migrations.c.version))}
+
+
+def upgrade(engine, target=None):
+    """Aplica en orden las migraciones pendientes hasta `target`; devuelve las versiones aplicadas"""
+    done = applied_versions(engine)
+    applied = []
+    for migration in available():
+        if migration.VERSION in done or (target is not None and migration.VERSION > target):
+            continue
+        try:
+            # Cada migración y su registro van en la misma transacción
+            with engine.begin() as connection:
+                migration.upgrade(connection)
+                connection.execute(schema_migrations.insert().values(
+                    version=migration.VERSION,
+                    description=migration.DESCRIPTION,
+                    applied_at=datetime.utcnow()
+                ))
+        except IntegrityError:
+            # Otro worker la registró primero
+            continue
+        applied.append(migration.VERSION)
+    return applied
+
+
+def downgrade(engine, target):
+    """Revierte en orden inverso las migraciones con versión mayor a `target`"""
+    done = applied_versions(engine)
+    reverted = []
+    for migration in reversed(available()):
+        if migration.VERSION <= target or migration.VERSION not in done:
+            continue
+        with engine.begin() as connection:
+            migration.downgrade(connection)
+            connection.execute(schema_migrations.delete().where(schema_migrations.c.version == migration.VERSION))
+        reverted.append(migration.VERSION)
+    return reverted
+
+
+migrations_cli = AppGroup('migrations', help="Migraciones versionadas del esquema")
+
+
+@migrations_cli.command('status')
+def status_command():
+    from app import db
+    done = applied_versions(db.engine)
+    for migration in available():
+        mark = 'x' if migration.VERSION in done else ' '
+        click.echo(f"[{mark}] {migration.VERSION:04d} {migration.DESCRIPTION}")
+
+
+@migrations_cli.command('upgrade')
+@click.argument('target', type=int, required=False)
+def upgrade_command(target):
+    from app import db
+    applied = upgrade(db.engine, target)
+    click.echo(f"Aplicadas: {applied or 'ninguna'}")
+
+
+@migrations_cli.command('downgrade')
+@click.argument('target', type=int)
+def downgrade_command(target):
+    from app import db
+    reverted = downgrade(db.engine, target)
+    click.echo(f"Revertidas: {reverted or 'ninguna'}")
+
+
+def init_app(app):
+    app.cli.add_command(migrations_cli)
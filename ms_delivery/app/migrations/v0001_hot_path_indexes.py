@@ -0,0 +1,59 @@
+"""
+Índices de las rutas calientes.
+
+Llaves foráneas y columnas que filtran los controladores. Los compuestos
+terminan en `id` para que la paginación por keyset (`WHERE ... AND id > ?
+ORDER BY id`) recorra el índice sin ordenar. La búsqueda por placa de
+start_tracking_by_plate usa el índice único de license_plate; se crea solo
+si la base no lo tiene ya por la restricción UNIQUE.
+
+Benchmark: benchmarks/migration_v0001_bench.py
+"""
+from sqlalchemy import Column, Index, Integer, MetaData, String, Table, inspect
+
+VERSION = 1
+DESCRIPTION = "Índices de llaves foráneas, filtros y búsqueda por placa"
+
+# Definición congelada de las columnas involucradas; no depende de los modelos
+_metadata = MetaData()
+_orders = Table('orders', _metadata, Column('id', Integer), Column('customer_id', Integer),
+                Column('motorcycle_id', Integer), Column('status', String(20)))
+_shifts = Table('shifts', _metadata, Column('id', Integer), Column('driver_id', Integer),
+                Column('motorcycle_id', Integer), Column('status', String(20)))
+_issues = Table('issues', _metadata, Column('id', Integer), Column('motorcycle_id', Integer))
+_menus = Table('menus', _metadata, Column('id', Integer), Column('restaurant_id', Integer))
+_photos = Table('photos', _metadata, Column('id', Integer), Column('issue_id', Integer))
+_motorcycles = Table('motorcycles', _metadata, Column('id', Integer), Column('license_plate', String(20)))
+
+INDEXES = [
+    Index('ix_orders_customer_id_id', _orders.c.customer_id, _orders.c.id),
+    Index('ix_orders_motorcycle_id', _orders.c.motorcycle_id),
+    Index('ix_orders_status_id', _orders.c.status, _orders.c.id),
+    Index('ix_shifts_driver_id', _shifts.c.driver_id),
+    Index('ix_shifts_motorcycle_id_status', _shifts.c.motorcycle_id, _shifts.c.status),
+    Index('ix_issues_motorcycle_id_id', _issues.c.motorcycle_id, _issues.c.id),
+    Index('ix_menus_restaurant_id', _menus.c.restaurant_id),
+    Index('ix_photos_issue_id', _photos.c.issue_id),
+]
+
+LICENSE_PLATE_INDEX = Index('ux_motorcycles_license_plate', _motorcycles.c.license_plate, unique=True)
+
+
+def _has_unique_license_plate(connection):
+    inspector = inspect(connection)
+    unique = [c['column_names'] for c in inspector.get_unique_constraints('motorcycles')]
+    unique += [i['column_names'] for i in inspector.get_indexes('motorcycles') if i['unique']]
+    return ['license_plate'] in unique
+
+
+def upgrade(connection):
+    for index in INDEXES:
+        index.create(connection, checkfirst=True)
+    if not _has_unique_license_plate(connection):
+        LICENSE_PLATE_INDEX.create(connection)
+
+
+def downgrade(connection):
+    for index in INDEXES:
+        index.drop(connection, checkfirst=True)
+    LICENSE_PLATE_INDEX.drop(connection, checkfirst=True)
@@ -0,0 +1,60 @@
+"""
+Rollups de órdenes para los reportes.
+
+Crea order_rollups (órdenes e ingresos por día y por estado, restaurante
+y motocicleta) y la llena desde las órdenes existentes. A partir de ahí
+los controladores la mantienen de forma incremental
+(services/order_rollups.py). Rellenar recalcula la tabla completa, así
+que aplicarla sobre una base nueva o de nuevo es inocuo.
+
+Benchmark: benchmarks/reports_bench.py
+"""
+from sqlalchemy import Column, Date, DateTime, Float, Integer, MetaData, String, Table, cast, delete, func, literal, select
+
+VERSION = 2
+DESCRIPTION = "Rollups de órdenes por día, estado, restaurante y motocicleta"
+
+# Definición congelada de las tablas involucradas; no depende de los modelos
+_metadata = MetaData()
+_orders = Table('orders', _metadata, Column('id', Integer), Column('menu_id', Integer),
+                Column('motorcycle_id', Integer), Column('total_price', Float),
+                Column('status', String(20)), Column('created_at', DateTime))
+_menus = Table('menus', _metadata, Column('id', Integer), Column('restaurant_id', Integer))
+_order_rollups = Table(
+    'order_rollups', _metadata,
+    Column('day', Date, primary_key=True),
+    Column('dimension', String(20), primary_key=True),
+    Column('bucket', String(40), primary_key=True),
+    Column('orders', Integer, nullable=False, default=0),
+    Column('revenue', Float, nullable=False, default=0.0),
+)
+
+
+def _backfill(connection):
+    day = func.date(_orders.c.created_at)
+    buckets = {
+        'status': _orders.c.status,
+        'restaurant': cast(_menus.c.restaurant_id, String),
+        # '' para las órdenes sin motocicleta asignada
+        'motorcycle': func.coalesce(cast(_orders.c.motorcycle_id, String), ''),
+    }
+    connection.execute(delete(_order_rollups))
+    for dimension, bucket in buckets.items():
+        rows = (
+            select(day, literal(dimension), bucket, func.count(_orders.c.id), func.sum(_orders.c.total_price))
+            .select_from(_orders.join(_menus, _orders.c.menu_id == _menus.c.id))
+            .where(_orders.c.created_at.isnot(None))
+            .group_by(day, bucket)
+        )
+        connection.execute(_order_rollups.insert().from_select(
+            ['day', 'dimension', 'bucket', 'orders', 'revenue'], rows
+        ))
+
+
+def upgrade(connection):
+    _order_rollups.create(connection, checkfirst=True)
+    _backfill(connection)
+
+
+def downgrade(connection):
+    _order_rollups.drop(connection, checkfirst=True)
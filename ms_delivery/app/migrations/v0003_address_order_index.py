@@ -0,0 +1,26 @@
+"""
+Índice de addresses.order_id.
+
+Los listados de órdenes unen cada orden con su dirección (LEFT OUTER JOIN
+addresses ON addresses.order_id = orders.id). Sin índice, SQLite recorre
+toda la tabla de direcciones por cada orden: con 20 000 órdenes, las 200
+de un cliente tardaban ~240 ms.
+"""
+from sqlalchemy import Column, Index, Integer, MetaData, Table
+
+VERSION = 3
+DESCRIPTION = "Índice de addresses.order_id"
+
+# Definición congelada de las columnas involucradas; no depende de los modelos
+_metadata = MetaData()
+_addresses = Table('addresses', _metadata, Column('id', Integer), Column('order_id', Integer))
+
+INDEX = Index('ix_addresses_order_id', _addresses.c.order_id)
+
+
+def upgrade(connection):
+    INDEX.create(connection, checkfirst=True)
+
+
+def downgrade(connection):
+    INDEX.drop(connection, checkfirst=True)
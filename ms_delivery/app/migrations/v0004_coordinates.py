@@ -0,0 +1,40 @@
+"""
+Coordenadas de restaurantes y direcciones.
+
+Agrega latitude y longitude (nulas) a restaurants, punto de recogida que
+usa el despacho por lotes, y a addresses, punto de entrega. Las filas
+existentes quedan sin coordenadas hasta que se actualicen por la API.
+
+Las columnas se agregan solo si faltan: una base nueva ya las trae de
+create_all.
+"""
+from sqlalchemy import inspect, text
+
+VERSION = 4
+DESCRIPTION = "Coordenadas de restaurantes y direcciones"
+
+COLUMNS = {
+    'restaurants': ('latitude', 'longitude'),
+    'addresses': ('latitude', 'longitude'),
+}
+
+
+def _existing(connection, table):
+    return {column['name'] for column in inspect(connection).get_columns(table)}
+
+
+def upgrade(connection):
+    for table, columns in COLUMNS.items():
+        existing = _existing(connection, table)
+        for column in columns:
+            if column not in existing:
+                connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} FLOAT"))
+
+
+def downgrade(connection):
+    # DROP COLUMN requiere SQLite 3.35 o posterior
+    for table, columns in COLUMNS.items():
+        existing = _existing(connection, table)
+        for column in columns:
+            if column in existing:
+                connection.execute(text(f"ALTER TABLE {table} DROP COLUMN {column}"))
@@ -1,8 +1,8 @@
-from flask import Blueprint, json, jsonify, request
+from flask import Blueprint, json, jsonify, request, url_for
 from flask_cors import CORS
 from app.business.controllers.restaurant_controller import RestaurantController
 from app.business.controllers.product_controller import ProductController
-from app.business.controllers.menu_controller import MenuController
+from app.business.controllers.menu_controller import MenuController, catalog_cache
 from app.business.controllers.customer_controller import CustomerController
 from app.business.controllers.order_controller import OrderController
 from app.business.controllers.address_controller import AddressController
@@ -11,11 +11,15 @@ from app.business.controllers.driver_controller import DriverController
 from app.business.controllers.shift_controller import ShiftController
 from app.business.controllers.issue_controller import IssueController
 from app.business.controllers.photo_controller import PhotoController
+from app.business.controllers.report_controller import ReportController
+from app.business.controllers.dispatch_controller import DispatchController
 from flask import Flask, send_from_directory
 import os
+from datetime import datetime, timezone
 from flask import send_file, abort,send_from_directory
 from flask import current_app
 from flask import Response, stream_with_context
+from functools import wraps
 from app.business.controllers.chat_controller import chat_controller
 main_bp = Blueprint('main', __name__)
 
@@ -26,16 +30,81 @@ CORS(main_bp,
          "methods": ["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
          "allow_headers": ["Content-Type", "Authorization"],
          "supports_credentials": True,
-         "expose_headers": ["Content-Type", "Authorization"],
+         "expose_headers": ["Content-Type", "Authorization", "Link", "X-Next-Cursor"],
          "max_age": 3600
      }},
      supports_credentials=True
 )
 
+NDJSON = 'application/x-ndjson'
+# Elementos serializados por cada fragmento enviado al transmitir
+STREAM_CHUNK = 200
+
+
+def _wants_stream():
+    return request.accept_mimetypes.best == NDJSON or request.args.get('stream') in ('1', 'true')
+
+
+def _stream_rows(rows, ndjson):
+    """Envía los elementos a medida que se serializan: NDJSON o un arreglo JSON por fragmentos"""
+    def generate():
+        chunk = []
+        first = True
+        if not ndjson:
+            yield '['
+        for row in rows:
+            chunk.append(json.dumps(row, separators=(',', ':')))
+            # El primer elemento sale de inmediato; luego se agrupan por fragmento
+            if first or len(chunk) >= STREAM_CHUNK:
+                yield _join_chunk(chunk, ndjson, first)
+                chunk, first = [], False
+        if chunk:
+            yield _join_chunk(chunk, ndjson, first)
+        if not ndjson:
+            yield ']'
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON if ndjson else 'application/json')
+
+
+def _join_chunk(chunk, ndjson, first):
+    if ndjson:
+        return '\n'.join(chunk) + '\n'
+    return ('' if first else ',') + ','.join(chunk)
+
+
+def _cached(*tags):
+    """Sirve el GET desde la caché del catálogo con ETag; las transmisiones no se guardan"""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if _wants_stream():
+                return view(*args, **kwargs)
+            return catalog_cache.respond(tags, lambda: view(*args, **kwargs))
+        return wrapper
+    return decorator
+
+
+def _list_response(get_page, **kwargs):
+    """Respuesta de un listado paginado; el cursor siguiente va en las cabeceras"""
+    stream = _wants_stream()
+    try:
+        page = get_page(args=request.args, stream=stream, **kwargs)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if stream:
+        return _stream_rows(page, ndjson=request.accept_mimetypes.best == NDJSON)
+    response = jsonify(page)
+    if page.next_after is not None:
+        params = {**request.args.to_dict(), **(request.view_args or {}), 'after': page.next_after}
+        response.headers['X-Next-Cursor'] = str(page.next_after)
+        response.headers['Link'] = f'<{url_for(request.endpoint, **params)}>; rel="next"'
+    return response
+
 # Restaurant routes
 @main_bp.route('/restaurants', methods=['GET'])
+@_cached('restaurants')
 def get_restaurants():
-    return jsonify(RestaurantController.get_all())
+    return _list_response(RestaurantController.get_all)
 
 @main_bp.route('/restaurants/<int:id>', methods=['GET'])
 def get_restaurant(id):
@@ -56,8 +125,9 @@ def delete_restaurant(id):
 
 # Product routes
 @main_bp.route('/products', methods=['GET'])
+@_cached('products')
 def get_products():
-    return jsonify(ProductController.get_all())
+    return _list_response(ProductController.get_all)
 
 @main_bp.route('/products/<int:id>', methods=['GET'])
 def get_product(id):
@@ -77,8 +147,17 @@ def delete_product(id):
 
 # Menu routes
 @main_bp.route('/menus', methods=['GET'])
+@_cached('menus')
 def get_menus():
-    return jsonify(MenuController.get_all())
+    return _list_response(MenuController.get_all)
+
+@main_bp.route('/menus/cache', methods=['GET'])
+def get_menu_cache_stats():
+    return jsonify(MenuController.get_cache_stats())
+
+@main_bp.route('/catalog/cache', methods=['GET'])
+def get_catalog_cache_stats():
+    return jsonify(MenuController.get_catalog_cache_stats())
 
 @main_bp.route('/menus/<int:id>', methods=['GET'])
 def get_menu(id):
@@ -97,13 +176,14 @@ def delete_menu(id):
     return jsonify(MenuController.delete(id))
 
 @main_bp.route('/restaurants/<int:restaurant_id>/menus', methods=['GET'])
+@_cached('menus')
 def get_restaurant_menus(restaurant_id):
     return jsonify(MenuController.get_by_restaurant_id(restaurant_id))
 
 # Customer routes
 @main_bp.route('/customers', methods=['GET'])
 def get_customers():
-    return jsonify(CustomerController.get_all())
+    return _list_response(CustomerController.get_all)
 
 @main_bp.route('/customers/<int:id>', methods=['GET'])
 def get_customer(id):
@@ -124,7 +204,7 @@ def delete_customer(id):
 # Order routes
 @main_bp.route('/orders', methods=['GET'])
 def get_orders():
-    return jsonify(OrderController.get_all())
+    return _list_response(OrderController.get_all)
 
 @main_bp.route('/orders/<int:id>', methods=['GET'])
 def get_order(id):
@@ -134,6 +214,11 @@ def get_order(id):
 def create_order():
     return jsonify(OrderController.create(request.json))
 
+@main_bp.route('/orders/bulk', methods=['POST'])
+def create_orders_bulk():
+    result, status = OrderController.create_bulk(request.get_json(silent=True))
+    return jsonify(result), status
+
 @main_bp.route('/orders/<int:id>', methods=['PUT'])
 def update_order(id):
     return jsonify(OrderController.update(id, request.json))
@@ -142,6 +227,10 @@ def update_order(id):
 def delete_order(id):
     return jsonify(OrderController.delete(id))
 
+@main_bp.route('/orders/<int:id>/eta', methods=['GET'])
+def get_order_eta(id):
+    return jsonify(OrderController.get_eta(id))
+
 @main_bp.route('/orders/<int:id>/status', methods=['PATCH', 'OPTIONS'])
 def update_order_status(id):
     if request.method == 'OPTIONS':
@@ -150,12 +239,44 @@ def update_order_status(id):
 
 @main_bp.route('/customers/<int:customer_id>/orders', methods=['GET'])
 def get_customer_orders(customer_id):
-    return jsonify(OrderController.get_by_customer_id(customer_id))
+    return _list_response(OrderController.get_by_customer_id, customer_id=customer_id)
+
+# Report routes
+def _report_response(build):
+    try:
+        return jsonify(build(request.args))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+@main_bp.route('/reports/orders-by-status', methods=['GET'])
+def get_report_orders_by_status():
+    return _report_response(ReportController.orders_by_status)
+
+@main_bp.route('/reports/orders-per-day', methods=['GET'])
+def get_report_orders_per_day():
+    return _report_response(ReportController.orders_per_day)
+
+@main_bp.route('/reports/orders-per-restaurant', methods=['GET'])
+def get_report_orders_per_restaurant():
+    return _report_response(ReportController.orders_per_restaurant)
+
+@main_bp.route('/reports/orders-per-motorcycle', methods=['GET'])
+def get_report_orders_per_motorcycle():
+    return _report_response(ReportController.orders_per_motorcycle)
+
+# Dispatch routes
+@main_bp.route('/dispatch', methods=['GET'])
+def get_dispatch_status():
+    return jsonify(DispatchController.status())
+
+@main_bp.route('/dispatch/run', methods=['POST'])
+def run_dispatch():
+    return jsonify(DispatchController.run())
 
 # Address routes
 @main_bp.route('/addresses', methods=['GET'])
 def get_addresses():
-    return jsonify(AddressController.get_all())
+    return _list_response(AddressController.get_all)
 
 @main_bp.route('/addresses/<int:id>', methods=['GET'])
 def get_address(id):
@@ -176,7 +297,28 @@ def delete_address(id):
 # Motorcycle routes
 @main_bp.route('/motorcycles', methods=['GET'])
 def get_motorcycles():
-    return jsonify(MotorcycleController.get_all())
+    return _list_response(MotorcycleController.get_all)
+
+@main_bp.route('/motorcycles/nearby', methods=['GET'])
+def get_nearby_motorcycles():
+    lat = request.args.get('lat', type=float)
+    lng = request.args.get('lng', type=float)
+    k = request.args.get('k', default=10, type=int)
+    radius = request.args.get('radius', default=5000, type=float)
+    if lat is None or lng is None:
+        return jsonify({"error": "Parámetros lat y lng requeridos"}), 400
+    if k <= 0 or k > 1000 or radius <= 0:
+        return jsonify({"error": "k debe estar entre 1 y 1000 y radius ser positivo"}), 400
+    return jsonify(MotorcycleController.get_nearby(lat, lng, k, radius))
+
+@main_bp.route('/motorcycles/<int:id>/route-plan', methods=['GET'])
+def get_motorcycle_route_plan(id):
+    # Presupuesto opcional de la optimización en milisegundos
+    budget = request.args.get('budget_ms', type=float)
+    if budget is not None and not 0 < budget <= 1000:
+        return jsonify({"error": "budget_ms debe estar entre 0 y 1000"}), 400
+    result = MotorcycleController.get_route_plan(id, budget / 1000 if budget is not None else None)
+    return jsonify(result)
 
 @main_bp.route('/motorcycles/<int:id>', methods=['GET'])
 def get_motorcycle(id):
@@ -197,7 +339,7 @@ def delete_motorcycle(id):
 # Driver routes
 @main_bp.route('/drivers', methods=['GET'])
 def get_drivers():
-    return jsonify(DriverController.get_all())
+    return _list_response(DriverController.get_all)
 
 @main_bp.route('/drivers/<int:id>', methods=['GET'])
 def get_driver(id):
@@ -218,7 +360,7 @@ def delete_driver(id):
 # Shift routes
 @main_bp.route('/shifts', methods=['GET'])
 def get_shifts():
-    return jsonify(ShiftController.get_all())
+    return _list_response(ShiftController.get_all)
 
 @main_bp.route('/shifts/<int:id>', methods=['GET'])
 def get_shift(id):
@@ -247,7 +389,7 @@ def get_motorcycle_shifts(motorcycle_id):
 # Issue routes
 @main_bp.route('/issues', methods=['GET'])
 def get_issues():
-    return jsonify(IssueController.get_all())
+    return _list_response(IssueController.get_all)
 
 @main_bp.route('/issues/<int:id>', methods=['GET'])
 def get_issue(id):
@@ -267,12 +409,12 @@ def delete_issue(id):
 
 @main_bp.route('/motorcycles/<int:motorcycle_id>/issues', methods=['GET'])
 def get_motorcycle_issues(motorcycle_id):
-    return jsonify(IssueController.get_by_motorcycle_id(motorcycle_id))
+    return _list_response(IssueController.get_by_motorcycle_id, motorcycle_id=motorcycle_id)
 
 # Photo routes
 @main_bp.route('/photos', methods=['GET'])
 def get_photos():
-    return jsonify(PhotoController.get_all())
+    return _list_response(PhotoController.get_all)
 
 @main_bp.route('/photos/<int:id>', methods=['GET'])
 def get_photo(id):
@@ -311,10 +453,36 @@ def upload_photo():
     data = request.form.to_dict()
     return jsonify(PhotoController.create_with_file(data, file))
 
+@main_bp.route('/motorcycles/<plate>/track', methods=['GET'])
+def get_motorcycle_track(plate):
+    try:
+        start = _parse_timestamp(request.args.get('from'))
+        end = _parse_timestamp(request.args.get('to'))
+    except ValueError:
+        return jsonify({"error": "from y to deben ser ISO 8601 o segundos epoch"}), 400
+    limit = request.args.get('limit', default=10000, type=int)
+    return jsonify(MotorcycleController.get_track(plate, start, end, limit))
+
+def _parse_timestamp(value):
+    # Fechas ISO sin zona se interpretan en UTC, como created_at
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        moment = datetime.fromisoformat(value)
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        return moment.timestamp()
+
 ##########Socket
 @main_bp.route("/motorcycles/track/<plate>", methods=["POST"])
 def start_tracking(plate):
-    result = MotorcycleController.start_tracking_by_plate(plate)
+    # Velocidad opcional en m/s; sin ella se usa la de la flota
+    speed = (request.get_json(silent=True) or {}).get('speed')
+    if speed is not None and (not isinstance(speed, (int, float)) or speed <= 0):
+        return jsonify({"error": "speed debe ser un número positivo (m/s)"}), 400
+    result = MotorcycleController.start_tracking_by_plate(plate, speed)
     return jsonify(result)
 @main_bp.route("/motorcycles/stop/<plate>", methods=["POST"])
 def stop_tracking(plate):
@@ -0,0 +1,167 @@
+from app import socketio
+from app.business.controllers.motorcycle_controller import fleet_scheduler
+from app.business.controllers.order_controller import order_events
+from app.business.services.order_events import EVENT as ORDER_EVENT, ROOM_PREFIXES, order_room
+from app.business.services.tracking_rooms import (
+    BINARY_SUFFIX, PLATE_PREFIX, TILE_PREFIX,
+    base_room, binary_room, plate_room, tile_room, tiles_for_bounds,
+)
+from flask import session
+from flask_socketio import emit, join_room, leave_room, rooms
+
+# Formatos de frame de posiciones; 'json' es el respaldo por defecto
+FORMATS = ('json', 'delta')
+
+
+def _plate_from(data):
+    # Se acepta la placa sola o un objeto {"plate": ...}
+    return data.get('plate') if isinstance(data, dict) else data
+
+
+def _tiles_from(data):
+    return tiles_for_bounds(
+        float(data['south']), float(data['west']),
+        float(data['north']), float(data['east'])
+    )
+
+
+def _variant(room):
+    """Sala que corresponde al formato negociado por el cliente"""
+    return binary_room(room) if session.get('tracking_format') == 'delta' else room
+
+
+def _join(room):
+    if room in rooms():
+        return
+    join_room(room)
+    # El conteo compartido permite al worker dueño emitir a clientes de otros workers
+    fleet_scheduler.state.room_joined(room)
+    if room.endswith(BINARY_SUFFIX):
+        # El cliente nuevo necesita un keyframe para decodificar los deltas
+        fleet_scheduler.request_keyframe(room)
+
+
+def _leave(room):
+    if room not in rooms():
+        return
+    leave_room(room)
+    fleet_scheduler.state.room_left(room)
+
+
+def _tracking_rooms(prefix=(PLATE_PREFIX, TILE_PREFIX)):
+    return [room for room in rooms() if room.startswith(prefix)]
+
+
+@socketio.on('tracking_format')
+def tracking_format(data):
+    fmt = data.get('format') if isinstance(data, dict) else data
+    if fmt not in FORMATS:
+        fmt = 'json'
+
+    # Mover las suscripciones existentes a la variante del nuevo formato
+    current = _tracking_rooms()
+    session['tracking_format'] = fmt
+    for room in current:
+        target = _variant(base_room(room))
+        if target != room:
+            _leave(room)
+            _join(target)
+    emit('tracking_format', {"format": fmt})
+
+
+@socketio.on('request_keyframe')
+def request_keyframe(data):
+    room = data.get('room') if isinstance(data, dict) else data
+    if room in rooms() and room.endswith(BINARY_SUFFIX):
+        fleet_scheduler.request_keyframe(room)
+
+
+@socketio.on('subscribe_plate')
+def subscribe_plate(data):
+    plate = _plate_from(data)
+    if not plate:
+        emit('tracking_error', {"message": "Placa requerida"})
+        return
+    _join(_variant(plate_room(plate)))
+    emit('subscribed', {"plate": plate})
+
+
+@socketio.on('unsubscribe_plate')
+def unsubscribe_plate(data):
+    plate = _plate_from(data)
+    if plate:
+        _leave(_variant(plate_room(plate)))
+        emit('unsubscribed', {"plate": plate})
+
+
+@socketio.on('subscribe_region')
+def subscribe_region(data):
+    """Suscribe el cliente a las celdas que cubren su viewport (south, west, north, east)"""
+    try:
+        tiles = _tiles_from(data)
+    except (KeyError, TypeError, ValueError) as e:
+        emit('tracking_error', {"message": f"Viewport inválido: {str(e)}"})
+        return
+
+    # Un nuevo viewport reemplaza al anterior
+    wanted = {_variant(tile_room(tile)) for tile in tiles}
+    current = set(_tracking_rooms(TILE_PREFIX))
+    for room in current - wanted:
+        _leave(room)
+    for room in wanted - current:
+        _join(room)
+    emit('subscribed', {"tiles": len(wanted)})
+
+
+@socketio.on('unsubscribe_region')
+def unsubscribe_region(data=None):
+    for room in _tracking_rooms(TILE_PREFIX):
+        _leave(room)
+    emit('unsubscribed', {"tiles": 0})
+
+
+def _order_room_from(data):
+    """Sala pedida con {"customer_id"|"restaurant_id"|"motorcycle_id": id}"""
+    if isinstance(data, dict):
+        for key in ROOM_PREFIXES:
+            if data.get(key) is not None:
+                return order_room(key, data[key])
+    raise ValueError("Se requiere customer_id, restaurant_id o motorcycle_id")
+
+
+@socketio.on('subscribe_orders')
+def subscribe_orders(data):
+    """Eventos de estado de las órdenes de un cliente, restaurante o motocicleta; `since` repone los perdidos"""
+    try:
+        room = _order_room_from(data)
+        since = data.get('since')
+        since = int(since) if since is not None else None
+    except (TypeError, ValueError) as e:
+        emit('orders_error', {"message": str(e)})
+        return
+
+    # Unirse antes de leer el registro: un evento intermedio puede repetirse, pero no perderse
+    join_room(room)
+    emit('subscribed', {"room": room, "seq": order_events.current(room)})
+    if since is not None:
+        missed = order_events.resume(room, since)
+        if missed:
+            emit(ORDER_EVENT, missed)
+
+
+@socketio.on('unsubscribe_orders')
+def unsubscribe_orders(data):
+    try:
+        room = _order_room_from(data)
+    except (TypeError, ValueError) as e:
+        emit('orders_error', {"message": str(e)})
+        return
+    leave_room(room)
+    emit('unsubscribed', {"room": room})
+
+
+@socketio.on('disconnect')
+def tracking_disconnect(*args):
+    # Descontar las suscripciones del cliente en el estado compartido
+    for room in _tracking_rooms():
+        fleet_scheduler.state.room_left(room)
@@ -0,0 +1,78 @@
+"""
+Throughput de creación de órdenes: POST /orders uno a uno frente a
+POST /orders/bulk.
+
+Usa una base SQLite en archivo temporal para que cada commit tenga su
+costo real. Cada orden lleva una dirección nueva; en el camino individual
+la dirección se crea con POST /addresses como hace el cliente web.
+
+Uso (desde ms_delivery/):
+    python -m benchmarks.bulk_orders_bench [órdenes]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from config import Config
+from app import create_app, db
+from app.business.controllers.order_controller import OrderController
+from app.business.models.customer import Customer
+from app.business.models.menu import Menu
+from app.business.models.product import Product
+from app.business.models.restaurant import Restaurant
+
+# Configuración
+DEFAULT_ORDERS = 500
+CUSTOMERS = 100
+MENUS = 50
+ADDRESS = {'street': "Cra 23 # 65-10", 'city': "Manizales", 'state': "Caldas", 'postal_code': "170001"}
+
+
+def make_config(path):
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+        POSITION_HISTORY_DIR = None
+    return BenchConfig
+
+
+def seed():
+    db.drop_all()
+    db.create_all()
+    db.session.execute(Restaurant.__table__.insert(), [{'name': f"R{n}", 'address': "Calle 1", 'phone': "300"} for n in range(MENUS)])
+    db.session.execute(Product.__table__.insert(), [{'name': f"P{n}", 'price': 10.0} for n in range(MENUS)])
+    db.session.execute(Menu.__table__.insert(), [{'restaurant_id': n + 1, 'product_id': n + 1, 'price': 12.5} for n in range(MENUS)])
+    db.session.execute(Customer.__table__.insert(), [{'name': f"C{n}", 'email': f"c{n}@bench.co", 'phone': "300"} for n in range(CUSTOMERS)])
+    db.session.commit()
+
+
+def payload(n):
+    return {'customer_id': 1 + n % CUSTOMERS, 'menu_id': 1 + n % MENUS, 'quantity': 1 + n % 3}
+
+
+def single(client, count):
+    for n in range(count):
+        order = client.post('/orders', json=payload(n)).json
+        client.post('/addresses', json={**ADDRESS, 'order_id': order['id']})
+
+
+def bulk(client, count):
+    for start in range(0, count, OrderController.BULK_MAX):
+        items = [{**payload(n), 'address': ADDRESS} for n in range(start, min(start + OrderController.BULK_MAX, count))]
+        response = client.post('/orders/bulk', json=items)
+        assert response.status_code == 201, response.json
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ORDERS
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app(make_config(os.path.join(tmp, "bench.db")))
+        client = app.test_client()
+        print(f"{'camino':>22} {'órdenes':>8} {'s':>7} {'órdenes/s':>10}")
+        for name, run in (('POST /orders + dirección', single), ('POST /orders/bulk', bulk)):
+            with app.app_context():
+                seed()
+            start = time.perf_counter()
+            run(client, count)
+            elapsed = time.perf_counter() - start
+            print(f"{name:>22} {count:>8} {elapsed:>7.2f} {count / elapsed:>10.0f}")
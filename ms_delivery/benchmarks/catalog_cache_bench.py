@@ -0,0 +1,147 @@
+"""
+Caché de respuestas del catálogo: latencia y corrección con escrituras
+concurrentes.
+
+1. Latencia de GET /menus sin caché (invalidando antes de cada petición),
+   con acierto en caché y con revalidación 304 (If-None-Match).
+2. Escrituras concurrentes: un escritor cambia el precio de un menú
+   mientras varios lectores piden GET /menus sin parar. Después de cada
+   escritura el escritor lee el listado y verifica que ve su propio precio;
+   al final ninguna respuesta en caché debe ser anterior a la última
+   escritura.
+3. Carrera determinista: una escritura ocurre mientras se construye una
+   respuesta (después de leer la base y antes de guardarla); la respuesta
+   vieja no debe quedar en caché.
+
+Usa SQLite en archivo temporal para que lectores y escritor compartan la
+base desde hilos distintos.
+
+Uso (desde ms_delivery/):
+    python -m benchmarks.catalog_cache_bench
+"""
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+from config import Config
+from app import create_app, db
+from app.business.controllers.menu_controller import catalog_cache
+from app.business.models.menu import Menu
+from app.business.models.product import Product
+from app.business.models.restaurant import Restaurant
+
+# Configuración
+RESTAURANTS = 50
+MENUS = 1000
+REPEAT = 50
+READERS = 4
+WRITES = 100
+URL = '/menus?fields=id,price,restaurant_id'
+
+
+def make_config(path):
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+        POSITION_HISTORY_DIR = None
+        CACHE_BUS_URL = None
+    return BenchConfig
+
+
+def seed():
+    db.drop_all()
+    db.create_all()
+    db.session.execute(Restaurant.__table__.insert(), [{'name': f"R{n}", 'address': "Calle 1", 'phone': "300"} for n in range(RESTAURANTS)])
+    db.session.execute(Product.__table__.insert(), [{'name': f"P{n}", 'price': 10.0} for n in range(RESTAURANTS)])
+    db.session.execute(Menu.__table__.insert(), [
+        {'restaurant_id': 1 + n % RESTAURANTS, 'product_id': 1 + n % RESTAURANTS, 'price': 12.0} for n in range(MENUS)
+    ])
+    db.session.commit()
+
+
+def latency(client, url, before=None, headers=None):
+    samples = []
+    for _ in range(REPEAT):
+        if before:
+            before()
+        start = time.perf_counter()
+        client.get(url, headers=headers)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def price_of(response, menu_id=1):
+    return next(item['price'] for item in response.json if item['id'] == menu_id)
+
+
+def concurrent(app):
+    stop = threading.Event()
+    reads = [0]
+    stale = []
+
+    def reader():
+        client = app.test_client()
+        while not stop.is_set():
+            client.get(URL)
+            reads[0] += 1
+            # Los hilos son cooperativos (eventlet): ceder para que avance el escritor
+            time.sleep(0)
+
+    threads = [threading.Thread(target=reader) for _ in range(READERS)]
+    for thread in threads:
+        thread.start()
+
+    writer = app.test_client()
+    for n in range(WRITES):
+        price = 100.0 + n
+        writer.put('/menus/1', json={'price': price})
+        seen = price_of(writer.get(URL))
+        if seen != price:
+            stale.append((price, seen))
+        time.sleep(0)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    final = price_of(app.test_client().get(URL))
+    return reads[0], stale, final == 100.0 + WRITES - 1
+
+
+def race_during_build(app, price=555.0):
+    view = app.view_functions['main.get_menus'].__wrapped__
+
+    def build():
+        response = view()
+        app.test_client().put('/menus/1', json={'price': price})
+        return response
+
+    # Partir de un fallo para que la respuesta se construya
+    catalog_cache.invalidate('menus')
+    with app.test_request_context(URL):
+        catalog_cache.respond(('menus',), build)
+    return price_of(app.test_client().get(URL)) == price
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app(make_config(os.path.join(tmp, "bench.db")))
+        with app.app_context():
+            seed()
+        client = app.test_client()
+
+        miss = latency(client, URL, before=lambda: catalog_cache.invalidate('menus'))
+        hit = latency(client, URL)
+        etag = client.get(URL).headers['ETag']
+        revalidated = latency(client, URL, headers={'If-None-Match': etag})
+        print(f"GET {URL} ({MENUS} menús)")
+        print(f"  sin caché: {miss:8.2f} ms")
+        print(f"  acierto:   {hit:8.2f} ms")
+        print(f"  304:       {revalidated:8.2f} ms")
+
+        reads, stale, final_ok = concurrent(app)
+        print(f"\nEscrituras concurrentes: {WRITES} escrituras, {reads} lecturas de {READERS} lectores")
+        print(f"  lecturas propias desactualizadas: {len(stale)}")
+        print(f"  estado final coherente: {'sí' if final_ok else 'NO'}")
+        print(f"  escritura durante la construcción descartada: {'sí' if race_during_build(app) else 'NO'}")
+        print(f"  {catalog_cache.stats()}")
@@ -0,0 +1,134 @@
+"""
+Lecturas y escrituras concurrentes con cada perfil de base de datos.
+
+Lanza procesos lectores (órdenes de un cliente, como GET
+/customers/<id>/orders) y escritores (una orden nueva por commit, como
+POST /orders) contra la misma base durante unos segundos, una vez con
+DATABASE_PROFILE='default' (diario de rollback, valores del driver) y otra
+con 'tuned' (WAL y demás pragmas). Reporta operaciones por segundo y
+errores ("database is locked") de cada tipo.
+
+Por defecto usa un SQLite en archivo temporal nuevo para cada perfil; con
+BENCH_DATABASE_URL se usa esa base (p. ej. PostgreSQL) y se recrean sus
+tablas, nunca la de DATABASE_URL.
+
+Uso (desde ms_delivery/):
+    python -m benchmarks.database_profile_bench [segundos]
+"""
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+# Configuración
+DEFAULT_SECONDS = 5
+READERS = 4
+WRITERS = 2
+CUSTOMERS = 50
+ORDERS = 5000
+PROFILES = ['default', 'tuned']
+
+
+def make_config(url, profile):
+    from config import Config
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = url
+        DATABASE_PROFILE = profile
+        POSITION_HISTORY_DIR = None
+        CACHE_BUS_URL = None
+    return BenchConfig
+
+
+def seed(url, profile):
+    from app import create_app, db
+    from app.business.models.customer import Customer
+    from app.business.models.menu import Menu
+    from app.business.models.order import Order
+    from app.business.models.product import Product
+    from app.business.models.restaurant import Restaurant
+
+    app = create_app(make_config(url, profile))
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        db.session.execute(Restaurant.__table__.insert(), [{'name': "R", 'address': "Calle 1", 'phone': "300"}])
+        db.session.execute(Product.__table__.insert(), [{'name': "P", 'price': 10.0}])
+        db.session.execute(Menu.__table__.insert(), [{'restaurant_id': 1, 'product_id': 1, 'price': 12.0}])
+        db.session.execute(Customer.__table__.insert(), [
+            {'name': f"C{n}", 'email': f"c{n}@x.co", 'phone': "300"} for n in range(CUSTOMERS)
+        ])
+        db.session.execute(Order.__table__.insert(), [
+            {'customer_id': 1 + n % CUSTOMERS, 'menu_id': 1, 'quantity': 1, 'total_price': 12.0, 'status': 'pending'}
+            for n in range(ORDERS)
+        ])
+        db.session.commit()
+
+
+def worker(role, url, profile, deadline, conn):
+    from sqlalchemy.exc import OperationalError
+
+    from app import create_app, db
+    from app.business.models.order import Order
+
+    app = create_app(make_config(url, profile))
+    ops = errors = n = 0
+    with app.app_context():
+        while time.time() < deadline:
+            n += 1
+            customer_id = 1 + n % CUSTOMERS
+            try:
+                if role == 'reader':
+                    Order.query.filter_by(customer_id=customer_id).order_by(Order.id).all()
+                else:
+                    db.session.add(Order(customer_id=customer_id, menu_id=1, quantity=1, total_price=12.0, status='pending'))
+                    db.session.commit()
+                ops += 1
+            except OperationalError:
+                db.session.rollback()
+                errors += 1
+            db.session.remove()
+    conn.send((ops, errors))
+    conn.close()
+
+
+def run(url, profile, seconds):
+    # La app aplica eventlet.monkey_patch al importarse: el proceso principal no la
+    # importa y los resultados vuelven por Pipe (el hilo alimentador de Queue no
+    # llega a correr con hilos verdes)
+    ctx = multiprocessing.get_context('spawn')
+    seeder = ctx.Process(target=seed, args=(url, profile))
+    seeder.start()
+    seeder.join()
+    # Margen para que los procesos terminen de arrancar antes de medir
+    deadline = time.time() + 5 + seconds
+    roles = ['reader'] * READERS + ['writer'] * WRITERS
+    pipes = [ctx.Pipe(duplex=False) for _ in roles]
+    processes = [
+        ctx.Process(target=worker, args=(role, url, profile, deadline, sender))
+        for role, (_, sender) in zip(roles, pipes)
+    ]
+    for process in processes:
+        process.start()
+    totals = {'reader': [0, 0], 'writer': [0, 0]}
+    for role, (receiver, _) in zip(roles, pipes):
+        ops, errors = receiver.recv()
+        totals[role][0] += ops
+        totals[role][1] += errors
+    for process in processes:
+        process.join()
+    return totals
+
+
+if __name__ == '__main__':
+    seconds = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SECONDS
+    print(f"{READERS} lectores, {WRITERS} escritores, {seconds} s por perfil")
+    print(f"{'perfil':>8} {'lecturas/s':>11} {'err':>5} {'escrituras/s':>13} {'err':>5}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for profile in PROFILES:
+            url = os.environ.get('BENCH_DATABASE_URL') or f"sqlite:///{os.path.join(tmp, f'{profile}.db')}"
+            totals = run(url, profile, seconds)
+            reads, read_errors = totals['reader']
+            writes, write_errors = totals['writer']
+            print(f"{profile:>8} {reads / seconds:>11.0f} {read_errors:>5} {writes / seconds:>13.0f} {write_errors:>5}")
@@ -0,0 +1,156 @@
+"""
+Despacho por lotes: tiempo de resolución y calidad de la asignación.
+
+1. Resolución de la matriz de costos (assignment.solve) para lotes de
+   hasta 1000 órdenes x 1000 motocicletas, cuadrados y rectangulares, con
+   restaurantes y motocicletas repartidos al azar en ~20 x 20 km. Se
+   compara la distancia total con el despacho uno por uno (cada orden, de
+   la más antigua a la más nueva, toma la motocicleta libre más cercana).
+   Con más órdenes que motocicletas el lote además elige qué órdenes
+   atender, mientras el uno por uno atiende las más antiguas.
+2. Ciclo completo de DispatchEngine.run_once con 1000 órdenes pendientes y
+   1000 motocicletas en turno sobre SQLite en archivo: consultas, matriz,
+   resolución y la transacción con todas las asignaciones.
+
+Uso (desde ms_delivery/):
+    python -m benchmarks.dispatch_bench
+"""
+import logging
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from config import Config
+from app import create_app, db, socketio
+from app.business.controllers.dispatch_controller import dispatch_engine
+from app.business.models.customer import Customer
+from app.business.models.driver import Driver
+from app.business.models.menu import Menu
+from app.business.models.motorcycle import Motorcycle
+from app.business.models.order import Order
+from app.business.models.product import Product
+from app.business.models.restaurant import Restaurant
+from app.business.models.shift import Shift
+from app.business.services.assignment import solve
+from app.business.services.route_loader import haversine
+
+# Configuración
+SIZES = [(100, 100), (250, 250), (500, 500), (1000, 1000), (1000, 300), (300, 1000)]
+REPEAT = 3
+RESTAURANTS = 200
+CYCLE = 1000
+# Zona de ~20 x 20 km
+LAT, LNG, SPAN = 4.60, -74.15, 0.18
+
+
+def points(rng, n):
+    return LAT + rng.uniform(0, SPAN, n), LNG + rng.uniform(0, SPAN, n)
+
+
+def instance(rng, orders, motorcycles):
+    restaurants = points(rng, RESTAURANTS)
+    picked = rng.integers(0, RESTAURANTS, orders)
+    order_lat, order_lng = restaurants[0][picked], restaurants[1][picked]
+    moto_lat, moto_lng = points(rng, motorcycles)
+    return haversine(order_lat[:, None], order_lng[:, None], moto_lat[None, :], moto_lng[None, :])
+
+
+def one_by_one(cost):
+    """Cada orden en orden de llegada toma la motocicleta libre más cercana"""
+    free = np.ones(cost.shape[1], dtype=bool)
+    total = 0.0
+    for row in cost[:min(cost.shape)] if cost.shape[0] > cost.shape[1] else cost:
+        column = np.where(free, row, np.inf).argmin()
+        free[column] = False
+        total += row[column]
+    return total
+
+
+def timed(fn, *args):
+    best, result = None, None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = fn(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000, result
+
+
+def solver():
+    rng = np.random.default_rng(7)
+    print(f"{'órdenes x motos':>16} {'subasta ms':>11} {'uno a uno ms':>13} {'km lote':>9} {'km uno a uno':>13} {'ahorro':>7}")
+    for orders, motorcycles in SIZES:
+        cost = instance(rng, orders, motorcycles)
+        batch_ms, (rows, columns) = timed(solve, cost)
+        greedy_ms, greedy = timed(one_by_one, cost)
+        batch = cost[rows, columns].sum()
+        print(f"{f'{orders} x {motorcycles}':>16} {batch_ms:>11.1f} {greedy_ms:>13.1f} {batch / 1000:>9.1f} "
+              f"{greedy / 1000:>13.1f} {1 - batch / greedy:>7.1%}")
+
+
+def make_config(path):
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+        POSITION_HISTORY_DIR = None
+        CACHE_BUS_URL = None
+        ORDER_EVENTS_URL = None
+        DISPATCH_INTERVAL = 0
+    return BenchConfig
+
+
+def seed(rng):
+    db.drop_all()
+    db.create_all()
+    rest_lat, rest_lng = points(rng, RESTAURANTS)
+    db.session.execute(Restaurant.__table__.insert(), [
+        {'name': f"R{n}", 'address': "Calle 1", 'phone': "300", 'latitude': lat, 'longitude': lng}
+        for n, (lat, lng) in enumerate(zip(rest_lat.tolist(), rest_lng.tolist()))
+    ])
+    db.session.execute(Product.__table__.insert(), [{'name': "P", 'price': 10.0}])
+    db.session.execute(Menu.__table__.insert(), [
+        {'restaurant_id': n + 1, 'product_id': 1, 'price': 12.0} for n in range(RESTAURANTS)
+    ])
+    db.session.execute(Customer.__table__.insert(), [{'name': "C", 'email': "c@example.com", 'phone': "300"}])
+    now = datetime.utcnow()
+    db.session.execute(Order.__table__.insert(), [
+        {'customer_id': 1, 'menu_id': int(rng.integers(1, RESTAURANTS + 1)), 'quantity': 1, 'total_price': 12.0,
+         'status': 'pending', 'created_at': now - timedelta(seconds=CYCLE - n)}
+        for n in range(CYCLE)
+    ])
+    db.session.execute(Motorcycle.__table__.insert(), [
+        {'license_plate': f"M{n:04d}", 'brand': "B", 'year': 2022, 'status': 'available'} for n in range(CYCLE)
+    ])
+    db.session.execute(Driver.__table__.insert(), [
+        {'name': f"D{n}", 'license_number': f"L{n}", 'phone': "300"} for n in range(CYCLE)
+    ])
+    db.session.execute(Shift.__table__.insert(), [
+        {'driver_id': n + 1, 'motorcycle_id': n + 1, 'start_time': now, 'status': 'active'} for n in range(CYCLE)
+    ])
+    db.session.commit()
+    moto_lat, moto_lng = points(rng, CYCLE)
+    for n, (lat, lng) in enumerate(zip(moto_lat.tolist(), moto_lng.tolist())):
+        dispatch_engine.index.update(f"M{n:04d}", lat, lng)
+
+
+def cycle():
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app(make_config(os.path.join(tmp, "bench.db")))
+        # Sin el registro de cada emisión de los eventos de órdenes
+        socketio.server.logger.setLevel(logging.WARNING)
+        with app.app_context():
+            seed(np.random.default_rng(11))
+            summary = dispatch_engine.run_once()
+            in_progress = Order.query.filter_by(status='in_progress').count()
+            in_use = Motorcycle.query.filter_by(status='in_use').count()
+    print(f"\nCiclo completo con {CYCLE} órdenes pendientes y {CYCLE} motocicletas en turno")
+    print(f"  asignadas: {summary['assigned']} (perdidas por concurrencia: {summary['lost']})")
+    print(f"  resolución: {summary['solve_ms']:.1f} ms, ciclo total: {summary['total_ms']:.1f} ms")
+    print(f"  en la base: {in_progress} órdenes in_progress, {in_use} motocicletas in_use")
+
+
+if __name__ == '__main__':
+    solver()
+    cycle()
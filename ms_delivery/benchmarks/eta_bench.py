@@ -0,0 +1,162 @@
+"""
+ETA de las órdenes: costo por consulta, costo por tick y emisiones.
+
+1. Costo de EtaService.estimate con rutas de 1.000 a 100.000 puntos: con el
+   destino ya proyectado (caché caliente) contra proyectarlo en cada
+   consulta, que es recorrer todos los segmentos de la ruta.
+2. Costo de EtaService.observe por tick (velocidades de todas las placas)
+   con 1.000 y 10.000 placas en transmisión.
+3. Emisiones del evento 'eta' con distintos umbrales: PLATES placas con una
+   orden cada una, entregada entre 0.5 y 4 km más adelante sobre la ruta,
+   durante MINUTES minutos simulados con ticks de 3 s y la velocidad de
+   cada placa variando como el tráfico (caminata aleatoria entre 2 y 15 m/s).
+   Al pasar por su destino la orden se da por entregada y deja de vigilarse;
+   las emisiones se cuentan por minuto de orden en reparto.
+
+Uso (desde ms_delivery/):
+    python -m benchmarks.eta_bench
+"""
+import statistics
+import time
+
+import numpy as np
+
+from app.business.services.eta import EtaService
+from app.business.services.fleet_scheduler import FleetScheduler
+from app.business.services.route_loader import Route
+
+# Configuración
+ROUTE_POINTS = [1000, 10000, 100000]
+QUERIES = 2000
+PLATES = [1000, 10000]
+TICKS = 50
+THRESHOLDS = [0, 10, 30, 60]
+PUSH_PLATES = 1000
+MINUTES = 10
+INTERVAL = 3.0
+LAT, LNG = 4.60, -74.15
+
+
+class EmitCounter:
+    """Cuenta las emisiones en lugar de enviarlas"""
+
+    def __init__(self):
+        self.count = 0
+
+    def emit(self, event, payload, to=None):
+        self.count += 1
+
+    def start_background_task(self, target, *args):
+        pass
+
+
+def make_route(rng, points):
+    # Caminata con pasos de ~10 m
+    steps = rng.normal(0, 0.0001, (points, 2)).cumsum(axis=0)
+    return Route(LAT + steps[:, 0], LNG + steps[:, 1])
+
+
+def make_fleet(route, plates, rng):
+    scheduler = FleetScheduler(EmitCounter(), interval=INTERVAL)
+    for n in range(plates):
+        scheduler.add(f"M{n:05d}", route)
+        scheduler.plates[f"M{n:05d}"].offset = float(rng.uniform(0, route.length))
+    return scheduler
+
+
+def per_query():
+    rng = np.random.default_rng(3)
+    print(f"{'puntos':>8} {'caliente µs':>12} {'sin caché µs':>13}")
+    for points in ROUTE_POINTS:
+        route = make_route(rng, points)
+        scheduler = make_fleet(route, 1, rng)
+        eta = EtaService(scheduler)
+        targets = [route.position_at(offset) for offset in rng.uniform(0, route.length, 50)]
+        for target in targets:
+            eta.destination(route, target['lat'], target['lng'])
+
+        start = time.perf_counter()
+        for n in range(QUERIES):
+            target = targets[n % len(targets)]
+            eta.estimate("M00000", target['lat'], target['lng'])
+        warm = (time.perf_counter() - start) / QUERIES * 1e6
+
+        # La alternativa: proyectar el destino sobre la ruta en cada consulta
+        queries = max(20, QUERIES // (points // 1000))
+        start = time.perf_counter()
+        for n in range(queries):
+            target = targets[n % len(targets)]
+            route.project(target['lat'], target['lng'])
+        cold = (time.perf_counter() - start) / queries * 1e6
+        print(f"{points:>8} {warm:>12.2f} {cold:>13.1f}")
+
+
+def per_tick():
+    rng = np.random.default_rng(5)
+    route = make_route(rng, 10000)
+    print(f"\n{'placas':>8} {'tick ms':>8} {'observe ms':>11} {'µs por placa':>13}")
+    for plates in PLATES:
+        scheduler = make_fleet(route, plates, rng)
+        eta = EtaService(scheduler)
+        ticks, observes = [], []
+        for _ in range(TICKS):
+            start = time.perf_counter()
+            frame = scheduler.tick()
+            ticks.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            eta.observe(frame)
+            observes.append(time.perf_counter() - start)
+        observe = statistics.median(observes) * 1000
+        print(f"{plates:>8} {statistics.median(ticks) * 1000:>8.2f} {observe:>11.2f} {observe * 1000 / plates:>13.2f}")
+
+
+def pushes():
+    route = make_route(np.random.default_rng(7), 10000)
+    ticks = int(MINUTES * 60 / INTERVAL)
+    print(f"\n{PUSH_PLATES} órdenes en reparto, {MINUTES} min con ticks de {INTERVAL:.0f} s")
+    print(f"{'umbral s':>9} {'emisiones':>10} {'por orden/min':>14} {'ticks por emisión':>18}")
+    for threshold in THRESHOLDS:
+        rng = np.random.default_rng(9)
+        scheduler = make_fleet(route, PUSH_PLATES, np.random.default_rng(11))
+        eta = EtaService(scheduler, threshold=threshold)
+        offsets = np.array([state.offset for state in scheduler.plates.values()])
+        targets = (offsets + rng.uniform(500, 4000, PUSH_PLATES)) % route.length
+        positions = route.positions_at(targets)
+        eta.watched = {
+            plate: [(n, lat, lng)]
+            for n, (plate, lat, lng) in enumerate(zip(scheduler.plates, *(p.tolist() for p in positions)))
+        }
+        speeds = np.full(PUSH_PLATES, 8.0)
+        walk = np.random.default_rng(13)
+        now = time.time()
+        remaining = {}
+        active = 0
+        for tick in range(ticks):
+            speeds = np.clip(speeds + walk.normal(0, 0.2, PUSH_PLATES), 2.0, 15.0)
+            for state, speed in zip(scheduler.plates.values(), speeds.tolist()):
+                state.speed = speed
+            frame = scheduler.tick()
+            ts = now + tick * INTERVAL
+            for item in frame:
+                item['ts'] = ts * 1000
+            eta.speeds.observe([(s.plate, s.offset, route.length) for s in scheduler.plates.values()], ts)
+            # Si la distancia restante creció, la placa pasó por el destino: entregada
+            for plate, orders in list(eta.watched.items()):
+                left = eta.estimate(plate, *orders[0][1:]).remaining
+                if left > remaining.get(plate, float('inf')):
+                    del eta.watched[plate]
+                else:
+                    remaining[plate] = left
+            active += len(eta.watched)
+            eta.push(ts)
+        # Cada emisión va a la sala JSON y a la binaria de la placa
+        emitted = scheduler.socketio.count // 2
+        minutes = active * INTERVAL / 60
+        print(f"{threshold:>9} {emitted:>10} {emitted / minutes:>14.2f} "
+              f"{active / emitted if emitted else float('inf'):>18.1f}")
+
+
+if __name__ == '__main__':
+    per_query()
+    per_tick()
+    pushes()
@@ -0,0 +1,117 @@
+"""
+Benchmark del scheduler de flota.
+
+Mide el CPU por tick y la latencia de emisión (codificación del paquete
+Socket.IO) para 100, 1k y 10k placas contra una emisión por placa, la que
+hacía _emit_coordinates:
+
+- placa JSON: un cliente JSON por placa, lo mismo que atendía la emisión
+  por placa; es la comparación directa. Cuesta alrededor de 1.5 veces más
+  por paquete porque cada frame lleva también la placa y el timestamp,
+  pero cada paquete va solo a los suscriptores de la placa y no a todos
+  los clientes conectados.
+- placa delta: un cliente binario por placa; cada sala paga además su
+  codificación delta, que se amortiza en salas con muchas placas.
+- todas: todas las salas ocupadas en sus dos variantes (placas, regiones,
+  JSON y binaria), el peor caso: el doble de paquetes que la emisión por
+  placa, cada uno con su codificación. Es trabajo para suscriptores que la
+  emisión por placa no podía atender.
+
+Las salas y variantes sin suscriptores no se agrupan ni se codifican, así
+que el costo crece con las salas suscritas y no con la flota.
+
+Uso (desde ms_delivery/):
+    python -m benchmarks.fleet_scheduler_bench
+"""
+import time
+from types import SimpleNamespace
+
+from socketio import packet
+
+from app.business.controllers.motorcycle_controller import ruta
+from app.business.services.fleet_scheduler import FleetScheduler, _PlateState
+from app.business.services.tracking_rooms import (
+    BINARY_SUFFIX, PLATE_PREFIX, binary_room, plate_room, tile_of, tile_room
+)
+
+# Configuración
+FLEET_SIZES = [100, 1000, 10000]
+TICKS = 20
+
+# Salas ocupadas de cada escenario
+SCENARIOS = {
+    'placa JSON': lambda room: room.startswith(PLATE_PREFIX) and not room.endswith(BINARY_SUFFIX),
+    'placa delta': lambda room: room.startswith(PLATE_PREFIX) and room.endswith(BINARY_SUFFIX),
+    'todas': lambda room: True,
+}
+
+
+def namespace_rooms(plates, occupied):
+    """Salas del namespace como las guarda el servidor, solo las ocupadas del escenario"""
+    rooms = [plate_room(plate) for plate in plates]
+    rooms += {tile_room(tile_of(lat, lng)) for lat, lng in zip(ruta.lats.tolist(), ruta.lngs.tolist())}
+    return {
+        variant: {'sid': 'eio'}
+        for room in rooms for variant in (room, binary_room(room)) if occupied(variant)
+    }
+
+
+class PacketSink:
+    """Destino de emisión que codifica el paquete igual que el servidor"""
+
+    def __init__(self, rooms):
+        self.packets = 0
+        self.server = SimpleNamespace(manager=SimpleNamespace(rooms={'/': rooms}))
+
+    def emit(self, event, data, to=None):
+        # Una tupla son varios argumentos, igual que en Flask-SocketIO
+        args = list(data) if isinstance(data, tuple) else [data]
+        packet.Packet(packet.EVENT, data=[event, *args]).encode()
+        self.packets += 1
+
+
+def run(fleet_size, occupied):
+    plates = [f"BENCH{n:05d}" for n in range(fleet_size)]
+    sink = PacketSink(namespace_rooms(plates, occupied))
+    scheduler = FleetScheduler(sink)
+    # Se registran directamente para no arrancar el ciclo en segundo plano
+    for plate in plates:
+        scheduler.plates[plate] = _PlateState(plate, ruta)
+
+    tick_cpu = 0.0
+    emit_wall = 0.0
+    legacy_emit_wall = 0.0
+    packets = 0
+    for _ in range(TICKS):
+        start = time.process_time()
+        frame = scheduler.tick()
+        tick_cpu += time.process_time() - start
+
+        sink.packets = 0
+        start = time.perf_counter()
+        scheduler.emit(frame)
+        emit_wall += time.perf_counter() - start
+        packets += sink.packets
+
+        # Una emisión por placa, como lo hacía _emit_coordinates
+        start = time.perf_counter()
+        for item in frame:
+            sink.emit(item['plate'], {'lat': item['lat'], 'lng': item['lng']})
+        legacy_emit_wall += time.perf_counter() - start
+
+    return {
+        'plates': fleet_size,
+        'tick_cpu_ms': tick_cpu / TICKS * 1000,
+        'emit_ms': emit_wall / TICKS * 1000,
+        'packets': packets // TICKS,
+        'legacy_emit_ms': legacy_emit_wall / TICKS * 1000,
+    }
+
+
+if __name__ == '__main__':
+    print(f"{'placas':>8} {'salas':>12} {'cpu/tick ms':>12} {'paquetes':>9} {'emit ms':>10} {'emit x placa ms':>16}")
+    for size in FLEET_SIZES:
+        for name, occupied in SCENARIOS.items():
+            r = run(size, occupied)
+            print(f"{r['plates']:>8} {name:>12} {r['tick_cpu_ms']:>12.3f} {r['packets']:>9} "
+                  f"{r['emit_ms']:>10.3f} {r['legacy_emit_ms']:>16.3f}")
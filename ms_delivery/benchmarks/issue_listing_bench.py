@@ -0,0 +1,99 @@
+"""
+Listado de reportes de novedades con sus fotos.
+
+Siembra reportes con varias fotos cada uno y cuenta sentencias SQL y
+tiempo de GET /issues (fotos por lotes), GET /issues?summary=1 (solo
+photo_count), GET /issues?fields=... con photo_count y del listado
+perezoso anterior. Comprueba que los listados hacen muchas menos
+sentencias que el perezoso (con photo_count y sin fotos, una sola) y que
+photo_count trae el conteo real con y sin summary.
+
+Uso (desde ms_delivery/):
+    python -m benchmarks.issue_listing_bench
+"""
+import time
+
+from sqlalchemy import event
+
+from config import Config
+from app import create_app, db
+from app.business.models.issue import Issue
+from app.business.models.motorcycle import Motorcycle
+from app.business.models.photo import Photo
+
+# Configuración
+SIZES = [100, 5000]
+PHOTOS_PER_ISSUE = 3
+MOTORCYCLES = 50
+
+
+class BenchConfig(Config):
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    POSITION_HISTORY_DIR = None
+
+
+def seed(issues):
+    db.drop_all()
+    db.create_all()
+    db.session.execute(Motorcycle.__table__.insert(), [
+        {'license_plate': f"ISS{n:04d}", 'brand': 'Bench', 'year': 2024, 'status': 'available'}
+        for n in range(MOTORCYCLES)
+    ])
+    db.session.execute(Issue.__table__.insert(), [
+        {'id': n + 1, 'motorcycle_id': 1 + n % MOTORCYCLES, 'description': 'Pinchazo', 'issue_type': 'breakdown'}
+        for n in range(issues)
+    ])
+    db.session.execute(Photo.__table__.insert(), [
+        {'issue_id': n + 1, 'image_url': f"/uploads/{n}-{p}.jpg", 'caption': 'Llanta'}
+        for n in range(issues) for p in range(PHOTOS_PER_ISSUE)
+    ])
+    db.session.commit()
+
+
+def measure(app, fetch):
+    statements = []
+
+    def before(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", before)
+        try:
+            start = time.perf_counter()
+            rows = fetch()
+            elapsed = time.perf_counter() - start
+        finally:
+            event.remove(db.engine, "before_cursor_execute", before)
+    return len(statements), rows, elapsed
+
+
+if __name__ == '__main__':
+    app = create_app(BenchConfig)
+    client = app.test_client()
+
+    def lazy():
+        # Listado anterior: una consulta de fotos por reporte
+        return [issue.to_dict() for issue in Issue.query.all()]
+
+    cases = {
+        'GET /issues': lambda: client.get('/issues').json,
+        'GET /issues?summary=1': lambda: client.get('/issues?summary=1').json,
+        'fields=id,photo_count': lambda: client.get('/issues?fields=id,photo_count').json,
+        'fields=id,photos,photo_count': lambda: client.get('/issues?fields=id,photos,photo_count').json,
+        'perezoso': lazy,
+    }
+    print(f"{'reportes':>9} {'consulta':>28} {'sentencias':>11} {'filas':>7} {'ms':>9}")
+    for size in SIZES:
+        with app.app_context():
+            seed(size)
+        for name, fetch in cases.items():
+            statements, rows, elapsed = measure(app, fetch)
+            print(f"{size:>9} {name:>28} {statements:>11} {len(rows):>7} {elapsed * 1000:>9.1f}")
+            assert len(rows) == size, name
+            if name == 'perezoso':
+                continue
+            assert statements <= 2 + size // 500, f"{name}: {statements} sentencias"
+            if 'photo_count' in rows[0]:
+                if 'photos' not in rows[0]:
+                    assert statements == 1, f"{name}: el conteo no se calculó en la misma consulta"
+                assert all(row['photo_count'] == PHOTOS_PER_ISSUE for row in rows), f"{name}: photo_count incorrecto"
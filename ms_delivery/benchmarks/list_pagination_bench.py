@@ -0,0 +1,57 @@
+"""
+Latencia de una página de listado según el tamaño de la tabla.
+
+Siembra motocicletas en SQLite en memoria y mide GET /motorcycles con
+`?limit=` al inicio y al final de la tabla (keyset con `after`), frente a
+la lista completa. El tiempo de una página debe mantenerse plano aunque la
+tabla crezca.
+
+Uso (desde ms_delivery/):
+    python -m benchmarks.list_pagination_bench
+"""
+import time
+
+from config import Config
+from app import create_app, db
+from app.business.models.motorcycle import Motorcycle
+
+# Configuración
+SIZES = [1000, 10000, 100000]
+PAGE = 100
+REPEAT = 20
+
+
+class BenchConfig(Config):
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    POSITION_HISTORY_DIR = None
+
+
+def seed(count):
+    db.drop_all()
+    db.create_all()
+    db.session.execute(Motorcycle.__table__.insert(), [
+        {'license_plate': f"BEN{n:06d}", 'brand': 'Bench', 'year': 2024, 'status': 'available'}
+        for n in range(count)
+    ])
+    db.session.commit()
+
+
+def measure(client, url, repeat=REPEAT):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        response = client.get(url)
+        assert response.status_code == 200, response.data
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+if __name__ == '__main__':
+    app = create_app(BenchConfig)
+    client = app.test_client()
+    print(f"{'filas':>8} {'primera pág ms':>15} {'última pág ms':>14} {'lista completa ms':>18}")
+    for size in SIZES:
+        with app.app_context():
+            seed(size)
+        first = measure(client, f"/motorcycles?limit={PAGE}")
+        last = measure(client, f"/motorcycles?limit={PAGE}&after={size - PAGE}")
+        full = measure(client, "/motorcycles", repeat=1)
+        print(f"{size:>8} {first:>15.2f} {last:>14.2f} {full:>18.1f}")
@@ -0,0 +1,95 @@
+"""
+Exportación de órdenes: lista completa frente a transmisión por lotes.
+
+Siembra N órdenes (con dirección, cliente y menú) en SQLite en memoria y
+mide para GET /orders, GET /orders?stream=1 y GET /orders con
+Accept: application/x-ndjson el tiempo al primer fragmento, el tiempo total
+y el pico de memoria de Python (tracemalloc) mientras se consume la
+respuesta.
+
+Uso (desde ms_delivery/):
+    python -m benchmarks.list_stream_bench [órdenes ...]
+"""
+import sys
+import time
+import tracemalloc
+
+from config import Config
+from app import create_app, db
+from app.business.models.address import Address
+from app.business.models.customer import Customer
+from app.business.models.menu import Menu
+from app.business.models.order import Order
+from app.business.models.product import Product
+from app.business.models.restaurant import Restaurant
+
+# Configuración
+DEFAULT_SIZES = [10000, 100000]
+CUSTOMERS = 1000
+MENUS = 50
+BATCH = 10000
+
+
+class BenchConfig(Config):
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    POSITION_HISTORY_DIR = None
+
+
+def _insert(model, rows):
+    for start in range(0, len(rows), BATCH):
+        db.session.execute(model.__table__.insert(), rows[start:start + BATCH])
+
+
+def seed(orders):
+    db.drop_all()
+    db.create_all()
+    _insert(Restaurant, [{'name': f"R{n}", 'address': "Calle 1", 'phone': "300"} for n in range(MENUS)])
+    _insert(Product, [{'name': f"P{n}", 'price': 10.0} for n in range(MENUS)])
+    _insert(Customer, [{'name': f"C{n}", 'email': f"c{n}@bench.co", 'phone': "300"} for n in range(CUSTOMERS)])
+    _insert(Menu, [{'restaurant_id': n + 1, 'product_id': n + 1, 'price': 12.0} for n in range(MENUS)])
+    for start in range(0, orders, BATCH):
+        ids = range(start + 1, min(start + BATCH, orders) + 1)
+        db.session.execute(Order.__table__.insert(), [
+            {'id': i, 'customer_id': 1 + i % CUSTOMERS, 'menu_id': 1 + i % MENUS, 'quantity': 1, 'total_price': 12.0}
+            for i in ids
+        ])
+        db.session.execute(Address.__table__.insert(), [
+            {'order_id': i, 'street': "Calle 2", 'city': "Manizales", 'state': "Caldas", 'postal_code': "170001"}
+            for i in ids
+        ])
+    db.session.commit()
+
+
+def measure(client, url, headers=None):
+    tracemalloc.start()
+    start = time.perf_counter()
+    response = client.get(url, headers=headers, buffered=False)
+    first = None
+    size = 0
+    for chunk in response.response:
+        if first is None:
+            first = time.perf_counter() - start
+        size += len(chunk)
+    response.close()
+    total = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return first * 1000, total, peak / 2 ** 20, size / 2 ** 20
+
+
+if __name__ == '__main__':
+    sizes = [int(n) for n in sys.argv[1:]] or DEFAULT_SIZES
+    app = create_app(BenchConfig)
+    client = app.test_client()
+    cases = {
+        'lista completa': ('/orders', None),
+        'stream=1 (JSON)': ('/orders?stream=1', None),
+        'NDJSON': ('/orders', {'Accept': 'application/x-ndjson'}),
+    }
+    print(f"{'órdenes':>8} {'modo':>16} {'1er byte ms':>12} {'total s':>8} {'pico MiB':>9} {'cuerpo MiB':>11}")
+    for size in sizes:
+        with app.app_context():
+            seed(size)
+        for name, (url, headers) in cases.items():
+            first, total, peak, body = measure(client, url, headers)
+            print(f"{size:>8} {name:>16} {first:>12.1f} {total:>8.2f} {peak:>9.1f} {body:>11.1f}")
@@ -0,0 +1,72 @@
+"""
+Cotización de órdenes con y sin la caché de menús.
+
+Compara la lectura del precio con Menu.query.get (como antes) frente a
+menu_cache.get para una carga sesgada (pocos menús concentran la mayoría
+de pedidos) y muestra la tasa de aciertos según el tamaño de la caché.
+
+Uso (desde ms_delivery/):
+    python -m benchmarks.menu_cache_bench
+"""
+import random
+import time
+
+from config import Config
+from app import create_app, db
+from app.business.models.menu import Menu
+from app.business.models.product import Product
+from app.business.models.restaurant import Restaurant
+from app.business.services.menu_cache import MenuCache
+
+# Configuración
+MENUS = 5000
+LOOKUPS = 20000
+CACHE_SIZES = [100, 1000, 5000]
+SKEW = 1.2
+
+
+class BenchConfig(Config):
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    POSITION_HISTORY_DIR = None
+    CACHE_BUS_URL = None
+
+
+def seed():
+    db.drop_all()
+    db.create_all()
+    db.session.execute(Restaurant.__table__.insert(), [{'name': "R", 'address': "Calle 1", 'phone': "300"}])
+    db.session.execute(Product.__table__.insert(), [{'name': "P", 'price': 10.0}])
+    db.session.execute(Menu.__table__.insert(), [
+        {'restaurant_id': 1, 'product_id': 1, 'price': 10.0 + n % 50} for n in range(MENUS)
+    ])
+    db.session.commit()
+
+
+def workload():
+    # Distribución de Zipf: el menú k se pide con probabilidad proporcional a 1/k^SKEW
+    rng = random.Random(7)
+    weights = [1 / (k ** SKEW) for k in range(1, MENUS + 1)]
+    return rng.choices(range(1, MENUS + 1), weights=weights, k=LOOKUPS)
+
+
+def timed(fn, ids):
+    start = time.perf_counter()
+    for menu_id in ids:
+        fn(menu_id)
+    return (time.perf_counter() - start) / len(ids) * 1e6
+
+
+if __name__ == '__main__':
+    app = create_app(BenchConfig)
+    with app.app_context():
+        seed()
+        ids = workload()
+        base = timed(lambda menu_id: db.session.get(Menu, menu_id).price, ids)
+        print(f"{'lectura':>18} {'µs/orden':>9} {'aciertos':>9} {'desalojos':>10}")
+        print(f"{'Menu.query.get':>18} {base:>9.1f} {'-':>9} {'-':>10}")
+        for size in CACHE_SIZES:
+            db.session.expunge_all()
+            cache = MenuCache(maxsize=size)
+            elapsed = timed(lambda menu_id: cache.get(menu_id).price, ids)
+            stats = cache.stats()
+            print(f"{f'caché {size}':>18} {elapsed:>9.1f} {stats['hit_rate']:>9.1%} {stats['evictions']:>10}")
@@ -0,0 +1,145 @@
+"""
+Planes y latencias antes y después de la migración v0001 (índices).
+
+Siembra una base grande, revierte la migración para medir sin índices,
+captura el plan (EXPLAIN QUERY PLAN en SQLite, EXPLAIN en otros motores)
+y la mediana de latencia de las consultas calientes, aplica la migración
+y repite.
+
+Uso (desde ms_delivery/):
+    python -m benchmarks.migration_v0001_bench [órdenes]
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.migration_v0001_bench
+"""
+import os
+import statistics
+import sys
+import time
+
+from sqlalchemy import text
+
+from config import Config
+from app import create_app, db, migrations
+from app.business.models.customer import Customer
+from app.business.models.driver import Driver
+from app.business.models.issue import Issue
+from app.business.models.menu import Menu
+from app.business.models.motorcycle import Motorcycle
+from app.business.models.order import Order
+from app.business.models.photo import Photo
+from app.business.models.product import Product
+from app.business.models.restaurant import Restaurant
+from app.business.models.shift import Shift
+
+# Configuración
+DEFAULT_ORDERS = 200000
+CUSTOMERS = 20000
+RESTAURANTS = 500
+MOTORCYCLES = 2000
+DRIVERS = 2000
+REPEAT = 50
+BATCH = 10000
+STATUSES = ['delivered'] * 18 + ['pending', 'in_progress']
+
+QUERIES = {
+    'órdenes de un cliente': (
+        "SELECT * FROM orders WHERE customer_id = :v AND id > 0 ORDER BY id LIMIT 100", 4242),
+    'órdenes pendientes': (
+        "SELECT * FROM orders WHERE status = :v ORDER BY id LIMIT 100", 'pending'),
+    'órdenes de una moto': (
+        "SELECT * FROM orders WHERE motorcycle_id = :v", 777),
+    'turnos de un conductor': (
+        "SELECT * FROM shifts WHERE driver_id = :v", 321),
+    'turno activo de una moto': (
+        "SELECT * FROM shifts WHERE motorcycle_id = :v AND status = 'active'", 654),
+    'novedades de una moto': (
+        "SELECT * FROM issues WHERE motorcycle_id = :v ORDER BY id LIMIT 100", 99),
+    'menús de un restaurante': (
+        "SELECT * FROM menus WHERE restaurant_id = :v", 123),
+    'fotos de una novedad': (
+        "SELECT * FROM photos WHERE issue_id = :v", 5000),
+    'moto por placa': (
+        "SELECT id FROM motorcycles WHERE license_plate = :v", 'BEN01234'),
+}
+
+
+class BenchConfig(Config):
+    # Variable propia: el benchmark borra y siembra la base, nunca debe tomar DATABASE_URL del .env
+    SQLALCHEMY_DATABASE_URI = os.environ.get('BENCH_DATABASE_URL') or 'sqlite://'
+    POSITION_HISTORY_DIR = None
+    AUTO_MIGRATE = False
+
+
+def _insert(model, rows):
+    rows = list(rows)
+    for start in range(0, len(rows), BATCH):
+        db.session.execute(model.__table__.insert(), rows[start:start + BATCH])
+
+
+def seed(orders):
+    db.drop_all()
+    db.create_all()
+    _insert(Restaurant, ({'name': f"R{n}", 'address': "Calle 1", 'phone': "300"} for n in range(RESTAURANTS)))
+    _insert(Product, ({'name': f"P{n}", 'price': 10.0} for n in range(RESTAURANTS)))
+    _insert(Menu, ({'restaurant_id': 1 + n % RESTAURANTS, 'product_id': 1 + n % RESTAURANTS, 'price': 12.0}
+                   for n in range(RESTAURANTS * 10)))
+    _insert(Customer, ({'name': f"C{n}", 'email': f"c{n}@bench.co", 'phone': "300"} for n in range(CUSTOMERS)))
+    _insert(Motorcycle, ({'license_plate': f"BEN{n:05d}", 'brand': 'Bench', 'year': 2024} for n in range(MOTORCYCLES)))
+    _insert(Driver, ({'name': f"D{n}", 'license_number': f"L{n}", 'phone': "300"} for n in range(DRIVERS)))
+    _insert(Order, ({'customer_id': 1 + n % CUSTOMERS, 'menu_id': 1 + n % (RESTAURANTS * 10),
+                     'motorcycle_id': 1 + n % MOTORCYCLES, 'quantity': 1, 'total_price': 12.0,
+                     'status': STATUSES[n % len(STATUSES)]} for n in range(orders)))
+    _insert(Shift, ({'driver_id': 1 + n % DRIVERS, 'motorcycle_id': 1 + n % MOTORCYCLES,
+                     'status': 'active' if n >= orders // 4 - MOTORCYCLES else 'completed'}
+                    for n in range(orders // 4)))
+    _insert(Issue, ({'motorcycle_id': 1 + n % MOTORCYCLES, 'description': 'Pinchazo', 'issue_type': 'breakdown'}
+                    for n in range(orders // 4)))
+    _insert(Photo, ({'issue_id': 1 + n % (orders // 4), 'image_url': f"/uploads/{n}.jpg"}
+                    for n in range(orders // 2)))
+    db.session.commit()
+
+
+def explain(connection, sql, value):
+    if connection.dialect.name == 'sqlite':
+        rows = connection.execute(text(f"EXPLAIN QUERY PLAN {sql}"), {'v': value})
+        return '; '.join(row[-1] for row in rows)
+    return '; '.join(row[0].strip() for row in connection.execute(text(f"EXPLAIN {sql}"), {'v': value}))
+
+
+def latency(connection, sql, value):
+    samples = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        connection.execute(text(sql), {'v': value}).fetchall()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1e6
+
+
+def capture():
+    results = {}
+    with db.engine.connect() as connection:
+        for name, (sql, value) in QUERIES.items():
+            results[name] = (explain(connection, sql, value), latency(connection, sql, value))
+    return results
+
+
+if __name__ == '__main__':
+    orders = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ORDERS
+    app = create_app(BenchConfig)
+    with app.app_context():
+        seed(orders)
+        # create_all ya creó los índices: registrar la migración y revertirla
+        migrations.upgrade(db.engine)
+        migrations.downgrade(db.engine, 0)
+        before = capture()
+        migrations.upgrade(db.engine)
+        after = capture()
+        dialect = db.engine.dialect.name
+
+    print(f"Motor: {dialect}, {orders} órdenes")
+    print(f"{'consulta':>26} {'antes µs':>10} {'después µs':>11} {'mejora':>8}")
+    for name in QUERIES:
+        b, a = before[name][1], after[name][1]
+        print(f"{name:>26} {b:>10.0f} {a:>11.0f} {b / a:>7.1f}x")
+    print()
+    for name in QUERIES:
+        print(f"{name}\n  antes:   {before[name][0]}\n  después: {after[name][0]}")
@@ -0,0 +1,91 @@
+"""
+Polling del listado de órdenes frente a eventos de estado por Socket.IO.
+
+Mide lo que cuesta a un cliente enterarse de sus órdenes:
+
+- polling: GET /customers/<id>/orders (latencia y bytes por consulta);
+- eventos: costo extra de publicar un cambio de estado en PATCH
+  /orders/<id>/status (con y sin suscriptores) y bytes por evento.
+
+Con esas medidas estima el tiempo de servidor por minuto para CLIENTS
+clientes que consultan cada POLL_SECONDS segundos, frente a CHANGES
+cambios de estado por minuto notificados con eventos.
+
+Uso (desde ms_delivery/):
+    python -m benchmarks.order_events_bench
+"""
+import json
+import statistics
+import time
+
+from config import Config
+from app import create_app, db, socketio
+from app.business.controllers.order_controller import order_events
+from benchmarks.order_queries_bench import CUSTOMERS, seed
+
+# Configuración
+ORDERS = 20000
+CUSTOMERS_WATCHING = 20
+REPEAT = 200
+CLIENTS = 1000
+POLL_SECONDS = 5
+CHANGES = 600
+STATUSES = ['pending', 'in_progress', 'delivered']
+
+
+class BenchConfig(Config):
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    POSITION_HISTORY_DIR = None
+    CACHE_BUS_URL = None
+    ORDER_EVENTS_URL = None
+
+
+def median_ms(fn):
+    samples = []
+    for n in range(REPEAT):
+        start = time.perf_counter()
+        fn(n)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def patch_status(client, n):
+    client.patch(f"/orders/{1 + n % 100}/status", json={'status': STATUSES[n % len(STATUSES)]})
+
+
+if __name__ == '__main__':
+    app = create_app(BenchConfig)
+    with app.app_context():
+        seed(ORDERS)
+    client = app.test_client()
+
+    poll_body = client.get('/customers/1/orders').get_data()
+    poll = median_ms(lambda n: client.get(f"/customers/{1 + n % CUSTOMERS_WATCHING}/orders"))
+
+    # Línea base sin publicar, luego publicando sin y con suscriptores
+    publisher = order_events.socketio
+    order_events.socketio = None
+    silent = median_ms(lambda n: patch_status(client, n))
+    order_events.socketio = publisher
+    unwatched = median_ms(lambda n: patch_status(client, n))
+    watchers = [socketio.test_client(app) for _ in range(CUSTOMERS_WATCHING)]
+    for n, watcher in enumerate(watchers):
+        watcher.emit('subscribe_orders', {'customer_id': 1 + n})
+        watcher.get_received()
+    watched = median_ms(lambda n: patch_status(client, n))
+    received = [message for watcher in watchers for message in watcher.get_received() if message['name'] == 'order_status']
+    event_bytes = statistics.median(len(json.dumps(message['args'][0], separators=(',', ':'))) for message in received)
+
+    orders_per_customer = ORDERS // CUSTOMERS
+    print(f"Polling GET /customers/<id>/orders (~{orders_per_customer} órdenes por cliente)")
+    print(f"  {poll:.2f} ms y {len(poll_body) / 1024:.0f} KiB por consulta")
+    print(f"Eventos en PATCH /orders/<id>/status ({silent:.2f} ms sin publicar)")
+    print(f"  publicar sin suscriptores: +{unwatched - silent:.2f} ms")
+    print(f"  publicar con suscriptores: +{watched - silent:.2f} ms, {event_bytes:.0f} bytes por mensaje")
+
+    polls = CLIENTS * 60 / POLL_SECONDS
+    print(f"\nPor minuto, {CLIENTS} clientes:")
+    print(f"  polling cada {POLL_SECONDS} s: {polls:,.0f} consultas, {polls * poll / 1000:.1f} s de servidor, "
+          f"{polls * len(poll_body) / 2 ** 20:,.0f} MiB")
+    print(f"  eventos ({CHANGES} cambios): {CHANGES * max(watched - silent, 0) / 1000:.2f} s de servidor, "
+          f"{CHANGES * 3 * event_bytes / 2 ** 20:.2f} MiB (3 salas por cambio)")
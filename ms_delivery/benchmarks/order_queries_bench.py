@@ -0,0 +1,101 @@
+"""
+Conteo de sentencias SQL al listar órdenes.
+
+Siembra una base SQLite en memoria con 10 y con 10.000 órdenes y cuenta
+las sentencias que ejecutan OrderController.get_all y
+get_by_customer_id. Con la carga anticipada la cantidad debe ser la misma
+en ambos tamaños; además compara con la carga perezosa anterior.
+
+Uso (desde ms_delivery/):
+    python -m benchmarks.order_queries_bench
+"""
+import time
+
+from sqlalchemy import event
+
+from config import Config
+from app import create_app, db
+from app.business.controllers.order_controller import OrderController
+from app.business.models.address import Address
+from app.business.models.customer import Customer
+from app.business.models.menu import Menu
+from app.business.models.order import Order
+from app.business.models.product import Product
+from app.business.models.restaurant import Restaurant
+
+# Configuración
+SIZES = [10, 10000]
+CUSTOMERS = 50
+RESTAURANTS = 20
+PRODUCTS = 40
+
+
+class BenchConfig(Config):
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    POSITION_HISTORY_DIR = None
+
+
+def seed(orders):
+    db.drop_all()
+    db.create_all()
+    db.session.add_all(Restaurant(name=f"R{n}", address="Calle 1", phone="300") for n in range(RESTAURANTS))
+    db.session.add_all(Product(name=f"P{n}", price=10.0 + n) for n in range(PRODUCTS))
+    db.session.add_all(Customer(name=f"C{n}", email=f"c{n}@bench.co", phone="300") for n in range(CUSTOMERS))
+    db.session.flush()
+    menus = [Menu(restaurant_id=1 + n % RESTAURANTS, product_id=1 + n % PRODUCTS, price=12.0) for n in range(PRODUCTS)]
+    db.session.add_all(menus)
+    db.session.flush()
+    db.session.add_all(
+        Order(customer_id=1 + n % CUSTOMERS, menu_id=menus[n % len(menus)].id, quantity=1, total_price=12.0)
+        for n in range(orders)
+    )
+    db.session.flush()
+    db.session.add_all(
+        Address(order_id=n + 1, street="Calle 2", city="Manizales", state="Caldas", postal_code="170001")
+        for n in range(orders)
+    )
+    db.session.commit()
+
+
+def count_statements(fn):
+    statements = []
+
+    def before(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    db.session.expunge_all()
+    event.listen(db.engine, "before_cursor_execute", before)
+    try:
+        start = time.perf_counter()
+        rows = fn()
+        elapsed = time.perf_counter() - start
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before)
+    return len(statements), len(rows), elapsed
+
+
+def lazy_get_all():
+    # Carga perezosa original, como referencia
+    return [order.to_dict() for order in Order.query.all()]
+
+
+if __name__ == '__main__':
+    app = create_app(BenchConfig)
+    with app.app_context():
+        counts = {}
+        print(f"{'órdenes':>8} {'consulta':>22} {'sentencias':>11} {'filas':>7} {'ms':>9}")
+        for size in SIZES:
+            seed(size)
+            cases = {
+                'get_all': OrderController.get_all,
+                'get_by_customer_id': lambda: OrderController.get_by_customer_id(1),
+                'get_all (perezoso)': lazy_get_all,
+            }
+            for name, fn in cases.items():
+                statements, rows, elapsed = count_statements(fn)
+                counts.setdefault(name, set()).add(statements)
+                print(f"{size:>8} {name:>22} {statements:>11} {rows:>7} {elapsed * 1000:>9.1f}")
+
+        for name in ('get_all', 'get_by_customer_id'):
+            assert len(counts[name]) == 1, f"{name} depende del número de órdenes: {counts[name]}"
+        print("OK: la cantidad de sentencias no depende del número de órdenes")
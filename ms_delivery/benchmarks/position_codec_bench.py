@@ -0,0 +1,96 @@
+"""
+Benchmark del formato de frames de posiciones.
+
+Compara bytes por segundo y tiempo de codificación (incluido el paquete
+Socket.IO) de tres formatos para 100, 1k y 10k placas en una sola sala:
+un dict JSON por placa (emisión original), el frame JSON por sala y el
+frame binario delta.
+
+Uso (desde ms_delivery/):
+    python -m benchmarks.position_codec_bench
+"""
+import time
+
+from socketio import packet
+
+from app.business.controllers.motorcycle_controller import ruta
+from app.business.services.fleet_scheduler import FleetScheduler, _PlateState
+from app.business.services.position_codec import DeltaFrameEncoder, decode_frame
+from app.business.services.route_loader import Route
+
+# Configuración
+FLEET_SIZES = [100, 1000, 10000]
+TICKS = 40
+INTERVAL = 3  # segundos entre ticks, como el scheduler en producción
+ROOM = 'bench'
+
+
+def _packet_size(event, *args):
+    encoded = packet.Packet(packet.EVENT, data=[event, *args]).encode()
+    if isinstance(encoded, list):
+        return sum(len(part) for part in encoded)
+    return len(encoded)
+
+
+def _frames(fleet_size):
+    scheduler = FleetScheduler(None)
+    for n in range(fleet_size):
+        plate = f"BENCH{n:05d}"
+        # Cada placa arranca en un punto distinto de la misma ruta
+        shift = n % len(ruta)
+        route = Route(
+            list(ruta.lats[shift:]) + list(ruta.lats[:shift]),
+            list(ruta.lngs[shift:]) + list(ruta.lngs[:shift]),
+        )
+        scheduler.plates[plate] = _PlateState(plate, route)
+    return scheduler, [scheduler.tick() for _ in range(TICKS)]
+
+
+def run(fleet_size):
+    scheduler, frames = _frames(fleet_size)
+    results = {}
+
+    start = time.perf_counter()
+    size = 0
+    for frame in frames:
+        for item in frame:
+            size += _packet_size(item['plate'], {'lat': item['lat'], 'lng': item['lng']})
+    results['dict x placa'] = (size, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    size = 0
+    for frame in frames:
+        size += _packet_size(FleetScheduler.EVENT, frame)
+    results['frame json'] = (size, time.perf_counter() - start)
+
+    encoder = DeltaFrameEncoder()
+    payloads = []
+    start = time.perf_counter()
+    size = 0
+    for frame in frames:
+        ids = [scheduler.plate_id(item['plate']) for item in frame]
+        seq, keyframe, payload = encoder.encode(
+            ROOM, ids, [item['lat'] for item in frame], [item['lng'] for item in frame]
+        )
+        meta = {'room': ROOM, 'seq': seq}
+        if keyframe:
+            meta['plates'] = {plate_id: item['plate'] for plate_id, item in zip(ids, frame)}
+        size += _packet_size(FleetScheduler.BINARY_EVENT, meta, payload)
+        payloads.append(payload)
+    results['frame delta'] = (size, time.perf_counter() - start)
+
+    # Verificar que la decodificación reproduce las posiciones a 1e-6 grados
+    state = {}
+    for frame, payload in zip(frames, payloads):
+        _, positions = decode_frame(payload, state)
+        for item, (_, lat, lng) in zip(frame, positions):
+            assert abs(item['lat'] - lat) <= 1e-6 and abs(item['lng'] - lng) <= 1e-6
+
+    return results
+
+
+if __name__ == '__main__':
+    print(f"{'placas':>8} {'formato':>14} {'bytes/s':>12} {'encode ms/tick':>15}")
+    for fleet_size in FLEET_SIZES:
+        for name, (size, elapsed) in run(fleet_size).items():
+            print(f"{fleet_size:>8} {name:>14} {size / (TICKS * INTERVAL):>12.0f} {elapsed / TICKS * 1000:>15.3f}")
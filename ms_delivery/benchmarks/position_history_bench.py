@@ -0,0 +1,90 @@
+"""
+Benchmark del historial de posiciones.
+
+Escribe los frames de 1k placas durante un día simulado de ticks de 3 s
+en segmentos pequeños y mide el costo de escritura por frame y la
+latencia de reproducir una hora de una placa con memoria mapeada.
+
+Después comprueba el historial con varios workers sobre el mismo
+directorio: dos escritores con sus propias particiones (los ids de placa
+coinciden entre ellos) y una placa que cambia de worker a mitad de
+camino; la lectura desde un tercer worker debe devolver cada placa
+completa, sin posiciones ajenas y en orden.
+
+Uso (desde ms_delivery/):
+    python -m benchmarks.position_history_bench
+"""
+import tempfile
+import time
+
+from app.business.services.position_history import PositionHistory
+
+# Configuración
+PLATES = 1000
+TICKS = 28800  # 24 h a un tick cada 3 s
+INTERVAL = 3
+SEGMENT_BYTES = 16 * 1024 * 1024
+REPLAYS = 20
+
+
+def run(directory):
+    history = PositionHistory(directory, segment_bytes=SEGMENT_BYTES)
+    plates = [f"BENCH{n:05d}" for n in range(PLATES)]
+    frame = [{'plate': plate, 'lat': 5.05 + n * 1e-5, 'lng': -75.49 - n * 1e-5} for n, plate in enumerate(plates)]
+
+    t0 = 1_700_000_000
+    start = time.perf_counter()
+    for tick in range(TICKS):
+        history.append_frame(frame, t0 + tick * INTERVAL)
+    history.flush()
+    write = time.perf_counter() - start
+
+    latencies = []
+    for n in range(REPLAYS):
+        begin = t0 + (n + 1) * 3600
+        start = time.perf_counter()
+        track = history.replay(plates[n * 37 % PLATES], begin, begin + 3600)
+        latencies.append(time.perf_counter() - start)
+        assert len(track) == 3600 // INTERVAL + 1
+
+    segments = len(history._segments())
+    history.close()
+    return write, segments, latencies
+
+
+def workers(directory):
+    writers = [PositionHistory(directory, worker_id=name) for name in ('a', 'b')]
+    reader = PositionHistory(directory, worker_id='c')
+    t0 = 1_700_000_000
+    for tick in range(200):
+        # MOVING es de 'a' y después de 'b'; cada worker tiene además su placa propia
+        owner = writers[tick >= 100]
+        owner.append_frame([{'plate': 'MOVING', 'lat': 5.0 + tick * 1e-4, 'lng': -75.0}], t0 + tick)
+        for name, writer in zip('ab', writers):
+            writer.append_frame([{'plate': f"ONLY-{name}", 'lat': 6.0 if name == 'a' else 7.0, 'lng': -75.0}],
+                                t0 + tick)
+    for writer in writers:
+        writer.flush()
+
+    moving = reader.replay('MOVING')
+    assert len(moving) == 200 and [ts for ts, _, _ in moving] == [t0 + tick for tick in range(200)]
+    assert reader.replay('MOVING', t0 + 90, t0 + 109) == moving[90:110]
+    assert reader.replay('MOVING', limit=5) == moving[:5]
+    for name, lat in (('a', 6.0), ('b', 7.0)):
+        track = reader.replay(f"ONLY-{name}")
+        assert len(track) == 200 and all(p_lat == lat for _, p_lat, _ in track), name
+    for history in writers + [reader]:
+        history.close()
+    print("varios workers: particiones separadas y replay unido correctamente")
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as directory:
+        write, segments, latencies = run(directory)
+    records = PLATES * TICKS
+    print(f"{records} registros en {segments} segmentos")
+    print(f"escritura: {write / TICKS * 1000:.3f} ms/frame ({records / write:,.0f} registros/s)")
+    print(f"replay de 1 h: {sum(latencies) / len(latencies) * 1000:.2f} ms en promedio, "
+          f"{max(latencies) * 1000:.2f} ms máximo")
+    with tempfile.TemporaryDirectory() as directory:
+        workers(directory)
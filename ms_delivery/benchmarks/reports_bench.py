@@ -0,0 +1,130 @@
+"""
+Reportes de órdenes: GROUP BY sobre orders frente a los rollups.
+
+Para cada tamaño siembra órdenes repartidas en DAYS días, restaurantes y
+motocicletas, llena los rollups con la migración v0002 y compara la
+latencia de cada reporte calculado directamente sobre orders con la del
+endpoint /reports/... (que lee order_rollups). Al final mide el costo que
+agrega el mantenimiento incremental a POST /orders.
+
+Uso (desde ms_delivery/):
+    python -m benchmarks.reports_bench [órdenes ...]
+"""
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import Date, func
+
+from config import Config
+from app import create_app, db
+from app.business.models.customer import Customer
+from app.business.models.menu import Menu
+from app.business.models.motorcycle import Motorcycle
+from app.business.models.order import Order
+from app.business.models.product import Product
+from app.business.models.restaurant import Restaurant
+from app.business.services import order_rollups
+from app.migrations import v0002_order_rollups
+
+# Configuración
+DEFAULT_SIZES = [10_000, 100_000, 500_000]
+DAYS = 90
+RESTAURANTS = 50
+MOTORCYCLES = 100
+REPEAT = 10
+WRITES = 300
+STATUSES = ['pending', 'in_progress', 'delivered', 'cancelled']
+
+
+class BenchConfig(Config):
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    POSITION_HISTORY_DIR = None
+    CACHE_BUS_URL = None
+
+
+def seed(orders):
+    db.drop_all()
+    db.create_all()
+    rng = random.Random(11)
+    start = datetime(2026, 1, 1)
+    db.session.execute(Restaurant.__table__.insert(), [{'name': f"R{n}", 'address': "Calle 1", 'phone': "300"} for n in range(RESTAURANTS)])
+    db.session.execute(Product.__table__.insert(), [{'name': "P", 'price': 10.0}])
+    db.session.execute(Menu.__table__.insert(), [
+        {'restaurant_id': 1 + n, 'product_id': 1, 'price': 10.0 + n % 7} for n in range(RESTAURANTS)
+    ])
+    db.session.execute(Customer.__table__.insert(), [{'name': "C", 'email': "c@x.co", 'phone': "300"}])
+    db.session.execute(Motorcycle.__table__.insert(), [
+        {'license_plate': f"ABC{n:03d}", 'brand': "Honda", 'year': 2022, 'status': 'available'} for n in range(MOTORCYCLES)
+    ])
+    db.session.execute(Order.__table__.insert(), [
+        {
+            'customer_id': 1,
+            'menu_id': rng.randint(1, RESTAURANTS),
+            'motorcycle_id': rng.choice([None, rng.randint(1, MOTORCYCLES)]),
+            'quantity': 1,
+            'total_price': 12.0,
+            'status': rng.choice(STATUSES),
+            'created_at': start + timedelta(seconds=rng.randrange(DAYS * 86400)),
+        }
+        for _ in range(orders)
+    ])
+    db.session.commit()
+    with db.engine.begin() as connection:
+        v0002_order_rollups.upgrade(connection)
+
+
+def direct_queries():
+    """Los mismos reportes agrupando todas las órdenes"""
+    day = func.date(Order.created_at, type_=Date)
+    count, revenue = func.count(Order.id), func.sum(Order.total_price)
+    return {
+        'orders-by-status': lambda: db.session.query(Order.status, count, revenue).group_by(Order.status).all(),
+        'orders-per-day': lambda: db.session.query(day, count, revenue).group_by(day).all(),
+        'orders-per-restaurant': lambda: db.session.query(Menu.restaurant_id, count, revenue)
+            .join(Menu, Order.menu_id == Menu.id).group_by(Menu.restaurant_id).all(),
+        'orders-per-motorcycle': lambda: db.session.query(Order.motorcycle_id, count, revenue)
+            .group_by(Order.motorcycle_id).all(),
+    }
+
+
+def timed(fn):
+    samples = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def write_cost(client, rollups):
+    record = order_rollups.record
+    if not rollups:
+        # Línea base: el mismo POST sin aplicar deltas
+        order_rollups.record = lambda added=(), removed=(): None
+    try:
+        start = time.perf_counter()
+        for n in range(WRITES):
+            client.post('/orders', json={'customer_id': 1, 'menu_id': 1 + n % RESTAURANTS, 'quantity': 1})
+        return (time.perf_counter() - start) / WRITES * 1000
+    finally:
+        order_rollups.record = record
+
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    app = create_app(BenchConfig)
+    client = app.test_client()
+    print(f"{'órdenes':>8} {'reporte':>22} {'GROUP BY orders':>16} {'rollups':>9}")
+    with app.app_context():
+        for orders in sizes:
+            seed(orders)
+            for name, query in direct_queries().items():
+                direct = timed(query)
+                rollup = timed(lambda: client.get(f"/reports/{name}"))
+                print(f"{orders:>8} {name:>22} {direct:>13.2f} ms {rollup:>6.2f} ms")
+        print(f"\nPOST /orders ({WRITES} órdenes)")
+        print(f"  sin rollups: {write_cost(client, False):.2f} ms por orden")
+        print(f"  con rollups: {write_cost(client, True):.2f} ms por orden")
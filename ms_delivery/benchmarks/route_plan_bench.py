@@ -0,0 +1,122 @@
+"""
+Planificación de paradas: calidad y latencia de 6 a 50 paradas.
+
+Cada orden aporta dos paradas (recogida en el restaurante y entrega), con
+restaurantes y entregas al azar en ~10 x 10 km y la motocicleta en un
+punto al azar. Para cada tamaño se promedian INSTANCES instancias:
+
+- distancia del vecino más cercano y de la ruta optimizada con varios
+  presupuestos de tiempo, y su mejora;
+- brecha contra el óptimo exacto (programación dinámica sobre subconjuntos
+  con precedencia) hasta EXACT_MAX paradas;
+- latencia mediana y p95 de RoutePlanner.plan, y la de construir la matriz
+  de distancias con la caché fría y caliente.
+
+Uso (desde ms_delivery/):
+    python -m benchmarks.route_plan_bench
+"""
+import gc
+import random
+import statistics
+import time
+
+from app.business.services.route_loader import haversine
+from app.business.services.route_planner import DistanceCache, RoutePlanner, point_key
+
+# Configuración
+STOPS = [6, 10, 20, 30, 40, 50]
+BUDGETS_MS = [10, 100]
+INSTANCES = 20
+EXACT_MAX = 12
+LAT, LNG, SPAN = 4.60, -74.15, 0.09
+
+
+def point(rng):
+    return LAT + rng.random() * SPAN, LNG + rng.random() * SPAN
+
+
+def instance(rng, stops):
+    orders = [(n, point(rng), point(rng)) for n in range(stops // 2)]
+    return orders, point(rng)
+
+
+def exact(orders, start):
+    """Distancia de la ruta óptima: DP sobre (paradas visitadas, última parada)"""
+    # Mismas coordenadas redondeadas que la caché del planificador
+    points = [point_key(*p) for p in [start] + [p for _, pickup, delivery in orders for p in (pickup, delivery)]]
+    n = len(points) - 1
+    dist = [[float(haversine(a[0], a[1], b[0], b[1])) for b in points] for a in points]
+    full = (1 << n) - 1
+    best = {(1 << k, k): dist[0][k + 1] for k in range(0, n, 2)}
+    for mask in range(1, full + 1):
+        for last in range(n):
+            value = best.get((mask, last))
+            if value is None:
+                continue
+            for k in range(n):
+                # Las paradas impares (entregas) requieren su recogida (k - 1) en el conjunto
+                if mask >> k & 1 or (k % 2 and not mask >> (k - 1) & 1):
+                    continue
+                key = (mask | 1 << k, k)
+                candidate = value + dist[last + 1][k + 1]
+                if candidate < best.get(key, float('inf')):
+                    best[key] = candidate
+    return min(best[(full, last)] for last in range(n) if (full, last) in best)
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def quality():
+    header = f"{'paradas':>7} {'vecino km':>10}"
+    for budget in BUDGETS_MS:
+        header += f" {f'{budget} ms km':>10} {'mejora':>7} {'p50 ms':>7} {'p95 ms':>7}"
+    print(header + f" {'brecha óptimo':>14}")
+    for stops in STOPS:
+        rng = random.Random(stops)
+        instances = [instance(rng, stops) for _ in range(INSTANCES)]
+        results = {}
+        for budget in BUDGETS_MS:
+            # Que la basura de la DP exacta no cobre su recolección dentro de las mediciones
+            gc.collect()
+            planner = RoutePlanner(budget=budget / 1000)
+            plans = [planner.plan(orders, start) for orders, start in instances]
+            results[budget] = plans
+        initial = statistics.mean(plan.initial_distance for plan in results[BUDGETS_MS[0]])
+        line = f"{stops:>7} {initial / 1000:>10.2f}"
+        for budget in BUDGETS_MS:
+            plans = results[budget]
+            distance = statistics.mean(plan.distance for plan in plans)
+            latencies = [plan.elapsed * 1000 for plan in plans]
+            line += (f" {distance / 1000:>10.2f} {1 - distance / initial:>7.1%}"
+                     f" {statistics.median(latencies):>7.1f} {percentile(latencies, 0.95):>7.1f}")
+        if stops <= EXACT_MAX:
+            best = results[BUDGETS_MS[-1]]
+            gaps = [plan.distance / exact(orders, start) - 1 for plan, (orders, start) in zip(best, instances)]
+            line += f" {statistics.mean(gaps):>14.2%}"
+        else:
+            line += f" {'-':>14}"
+        print(line)
+
+
+def matrix_cache():
+    rng = random.Random(1)
+    orders, _ = instance(rng, max(STOPS))
+    points = [p for _, pickup, delivery in orders for p in (pickup, delivery)]
+    cache = DistanceCache()
+    start = time.perf_counter()
+    cache.matrix([point(rng)] + points)
+    cold = (time.perf_counter() - start) * 1000
+    # La posición de la motocicleta cambia; las paradas se repiten
+    start = time.perf_counter()
+    cache.matrix([point(rng)] + points)
+    warm = (time.perf_counter() - start) * 1000
+    print(f"\nMatriz de {len(points) + 1} puntos: caché fría {cold:.2f} ms, caliente {warm:.2f} ms")
+    print(f"  {cache.stats()}")
+
+
+if __name__ == '__main__':
+    quality()
+    matrix_cache()
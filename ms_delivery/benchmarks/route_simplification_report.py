@@ -0,0 +1,47 @@
+"""
+Reporte de simplificación de rutas.
+
+Para cada archivo de `coordinates/routes/` muestra los puntos originales,
+los que quedan tras eliminar duplicados y tras Douglas–Peucker, la
+reducción y el error máximo (metros) de los puntos descartados.
+
+Uso (desde ms_delivery/):
+    python -m benchmarks.route_simplification_report [tolerancia_m ...]
+"""
+import glob
+import os
+import sys
+import time
+
+from app.business.services.route_loader import douglas_peucker, read_route_file
+
+ROUTES_GLOB = os.path.join("coordinates", "routes", "*.json")
+DEFAULT_TOLERANCES = [1.0, 5.0, 10.0]
+
+
+def report(path, tolerance):
+    coords, raw_count = read_route_file(path)
+    start = time.perf_counter()
+    keep, max_error = douglas_peucker(coords[:, 0], coords[:, 1], tolerance)
+    elapsed = time.perf_counter() - start
+    kept = int(keep.sum())
+    return {
+        'route': os.path.basename(path),
+        'tolerance': tolerance,
+        'raw': raw_count,
+        'deduped': len(coords),
+        'simplified': kept,
+        'reduction': 1 - kept / raw_count if raw_count else 0.0,
+        'max_error': max_error,
+        'ms': elapsed * 1000,
+    }
+
+
+if __name__ == '__main__':
+    tolerances = [float(t) for t in sys.argv[1:]] or DEFAULT_TOLERANCES
+    print(f"{'ruta':>16} {'tol m':>6} {'orig':>6} {'dedup':>6} {'simpl':>6} {'reduc':>7} {'err máx m':>10} {'ms':>7}")
+    for path in sorted(glob.glob(ROUTES_GLOB)):
+        for tolerance in tolerances:
+            r = report(path, tolerance)
+            print(f"{r['route']:>16} {r['tolerance']:>6.1f} {r['raw']:>6} {r['deduped']:>6} {r['simplified']:>6} "
+                  f"{r['reduction']:>7.1%} {r['max_error']:>10.2f} {r['ms']:>7.2f}")
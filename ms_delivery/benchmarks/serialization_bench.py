@@ -0,0 +1,150 @@
+"""
+Serialización de listados: instancias ORM + to_dict + json de Flask frente
+a filas Core + RowSerializer + orjson.
+
+Para Order, Menu y Shift (con las relaciones que incluye su to_dict) mide
+filas por segundo de cada etapa por separado y de punta a punta:
+
+- carga y armado de diccionarios: consulta con joinedload y to_dict, o
+  consulta de columnas con OUTER JOIN y el serializador precompilado;
+- codificación: proveedor JSON de Flask o el de orjson;
+- total: ambas etapas juntas, como en GET /orders, /menus y /shifts.
+
+También verifica que las dos vías producen el mismo documento JSON y
+que cada orden sale una sola vez aunque tenga dos direcciones (se siembra
+una segunda dirección en algunas órdenes; ambas vías usan la de menor id).
+
+Uso (desde ms_delivery/):
+    python -m benchmarks.serialization_bench [filas]
+"""
+import json
+import sys
+import time
+import warnings
+from datetime import datetime, timedelta
+
+from config import Config
+from app import create_app, db
+from app.business.controllers.menu_controller import MenuController
+from app.business.controllers.order_controller import OrderController
+from app.business.controllers.shift_controller import ShiftController
+from app.business.models.address import Address
+from app.business.models.customer import Customer
+from app.business.models.driver import Driver
+from app.business.models.menu import Menu
+from app.business.models.motorcycle import Motorcycle
+from app.business.models.order import Order
+from app.business.models.product import Product
+from app.business.models.restaurant import Restaurant
+from app.business.models.shift import Shift
+from app.business.services.json_provider import OrjsonProvider, orjson
+from flask.json.provider import DefaultJSONProvider
+
+# Configuración
+DEFAULT_ROWS = 20000
+REPEAT = 3
+
+
+class BenchConfig(Config):
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    POSITION_HISTORY_DIR = None
+    CACHE_BUS_URL = None
+
+
+def seed(rows):
+    db.drop_all()
+    db.create_all()
+    small = max(rows // 100, 1)
+    start = datetime(2026, 1, 1, 8)
+    db.session.execute(Restaurant.__table__.insert(), [
+        {'name': f"R{n}", 'address': "Calle 1", 'phone': "300", 'email': f"r{n}@bench.co"} for n in range(small)
+    ])
+    db.session.execute(Product.__table__.insert(), [
+        {'name': f"P{n}", 'description': "Plato", 'price': 10.0 + n % 9, 'category': "Comida"} for n in range(small)
+    ])
+    db.session.execute(Customer.__table__.insert(), [
+        {'name': f"C{n}", 'email': f"c{n}@bench.co", 'phone': "300"} for n in range(small)
+    ])
+    db.session.execute(Driver.__table__.insert(), [
+        {'name': f"D{n}", 'license_number': f"LIC{n}", 'phone': "300", 'status': 'on_shift'} for n in range(small)
+    ])
+    db.session.execute(Motorcycle.__table__.insert(), [
+        {'license_plate': f"ABC{n:04d}", 'brand': "Honda", 'year': 2022} for n in range(small)
+    ])
+    db.session.execute(Menu.__table__.insert(), [
+        {'restaurant_id': 1 + n % small, 'product_id': 1 + n % small, 'price': 12.5 + n % 7} for n in range(rows)
+    ])
+    db.session.execute(Order.__table__.insert(), [
+        {'customer_id': 1 + n % small, 'menu_id': 1 + n, 'motorcycle_id': 1 + n % small if n % 3 else None,
+         'quantity': 1 + n % 3, 'total_price': 12.5 * (1 + n % 3), 'status': 'delivered'}
+        for n in range(rows)
+    ])
+    db.session.execute(Address.__table__.insert(), [
+        {'order_id': 1 + n, 'street': "Cra 23 # 65-10", 'city': "Manizales", 'state': "Caldas", 'postal_code': "170001"}
+        for n in range(0, rows, 2)
+    ])
+    # Dirección duplicada: Order.address es uselist=False pero addresses.order_id no es único
+    db.session.execute(Address.__table__.insert(), [
+        {'order_id': 1 + n, 'street': "Calle duplicada", 'city': "Manizales", 'state': "Caldas",
+         'postal_code': "170002"}
+        for n in range(0, rows, 10)
+    ])
+    db.session.execute(Shift.__table__.insert(), [
+        {'driver_id': 1 + n % small, 'motorcycle_id': 1 + n % small, 'status': 'completed',
+         'start_time': start + timedelta(hours=n), 'end_time': start + timedelta(hours=n + 8),
+         'created_at': start + timedelta(hours=n)}
+        for n in range(rows)
+    ])
+    db.session.commit()
+
+
+def best(fn):
+    """Mejor tiempo de REPEAT corridas, con la sesión vacía para que la carga ORM sea real"""
+    times = []
+    for _ in range(REPEAT):
+        db.session.expunge_all()
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def run(name, model, controller, flask_json, fast_json):
+    eager = controller._eager()
+    rows = controller.ROWS
+    load_orm, items = best(lambda: [obj.to_dict() for obj in model.query.options(*eager).order_by(model.id)])
+    load_core, fast_items = best(lambda: [rows(row) for row in rows.select(model.query.order_by(model.id))])
+    # Como jsonify en las rutas: cuerpo compacto de la respuesta
+    encode_flask, body = best(lambda: flask_json.response(items).get_data())
+    encode_fast, fast_body = best(lambda: fast_json.response(fast_items).get_data()) if fast_json else (None, body)
+    # Flask escapa lo no ASCII y orjson escribe UTF-8: se compara el documento
+    same = json.loads(body) == json.loads(fast_body)
+    count = len(items)
+    assert len({item['id'] for item in fast_items}) == len(fast_items) == count, f"{name}: filas repetidas"
+    assert same, f"{name}: las dos vías producen JSON distinto"
+
+    def rate(seconds):
+        return f"{count / seconds:>10,.0f}" if seconds else f"{'-':>10}"
+
+    print(f"{name:>6} {'antes':>8} {rate(load_orm)} {rate(encode_flask)} {rate(load_orm + encode_flask)}")
+    after = load_core + (encode_fast if encode_fast else encode_flask)
+    print(f"{'':>6} {'después':>8} {rate(load_core)} {rate(encode_fast)} {rate(after)}"
+          f"   x{(load_orm + encode_flask) / after:.1f}  mismo JSON: {'sí' if same else 'NO'}")
+
+
+if __name__ == '__main__':
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS
+    # joinedload avisa de las direcciones duplicadas sembradas a propósito
+    warnings.filterwarnings('ignore', 'Multiple rows returned with uselist=False')
+    app = create_app(BenchConfig)
+    flask_json = DefaultJSONProvider(app)
+    fast_json = OrjsonProvider(app) if orjson else None
+    if not fast_json:
+        print("orjson no está instalado: la codificación rápida se omite")
+    with app.app_context():
+        seed(rows)
+        print(f"filas/s ({rows} filas por modelo)")
+        print(f"{'modelo':>6} {'vía':>8} {'carga':>10} {'json':>10} {'total':>10}")
+        run('Order', Order, OrderController, flask_json, fast_json)
+        run('Menu', Menu, MenuController, flask_json, fast_json)
+        run('Shift', Shift, ShiftController, flask_json, fast_json)
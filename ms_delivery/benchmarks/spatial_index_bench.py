@@ -0,0 +1,74 @@
+"""
+Benchmark del índice espacial de posiciones vivas.
+
+Mueve 10k placas dentro de un área urbana, mide el costo de actualizar el
+índice en cada tick y la latencia de la consulta de las k más cercanas,
+verificando el resultado contra una búsqueda exhaustiva.
+
+Uso (desde ms_delivery/):
+    python -m benchmarks.spatial_index_bench
+"""
+import random
+import time
+
+from app.business.services.spatial_index import SpatialGrid, _haversine
+
+# Configuración
+PLATES = 10000
+TICKS = 10
+QUERIES = 2000
+K = 10
+RADIUS = 2000  # metros
+CENTER = (5.0689, -75.5174)  # Manizales
+SPREAD = 0.1  # grados alrededor del centro
+STEP = 0.0003  # desplazamiento máximo por tick en grados (~33 m)
+
+
+def _percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def run():
+    rng = random.Random(7)
+    grid = SpatialGrid()
+    positions = {
+        f"BENCH{n:05d}": (CENTER[0] + rng.uniform(-SPREAD, SPREAD), CENTER[1] + rng.uniform(-SPREAD, SPREAD))
+        for n in range(PLATES)
+    }
+    for plate, (lat, lng) in positions.items():
+        grid.update(plate, lat, lng)
+
+    update_time = 0.0
+    for _ in range(TICKS):
+        for plate, (lat, lng) in positions.items():
+            positions[plate] = (lat + rng.uniform(-STEP, STEP), lng + rng.uniform(-STEP, STEP))
+        start = time.perf_counter()
+        for plate, (lat, lng) in positions.items():
+            grid.update(plate, lat, lng)
+        update_time += time.perf_counter() - start
+
+    latencies = []
+    for q in range(QUERIES):
+        lat = CENTER[0] + rng.uniform(-SPREAD, SPREAD)
+        lng = CENTER[1] + rng.uniform(-SPREAD, SPREAD)
+        start = time.perf_counter()
+        result = grid.nearest(lat, lng, k=K, radius=RADIUS)
+        latencies.append(time.perf_counter() - start)
+
+        if q < 50:
+            expected = sorted(
+                d for d in (_haversine(lat, lng, p_lat, p_lng) for p_lat, p_lng in positions.values())
+                if d <= RADIUS
+            )[:K]
+            assert [round(r[0], 6) for r in result] == [round(d, 6) for d in expected]
+
+    return update_time / TICKS, latencies
+
+
+if __name__ == '__main__':
+    update, latencies = run()
+    print(f"{PLATES} placas, k={K}, radio={RADIUS} m")
+    print(f"actualización por tick: {update * 1000:.2f} ms")
+    print(f"consulta p50: {_percentile(latencies, 0.5) * 1e6:.0f} µs  "
+          f"p99: {_percentile(latencies, 0.99) * 1e6:.0f} µs")
@@ -0,0 +1,100 @@
+"""
+Conteo de frames entregados por cliente con salas de placa y de región.
+
+Conecta clientes de prueba de Flask-SocketIO: la mitad se suscribe a una
+placa y la otra mitad a un viewport. Tras varios ticks compara las
+posiciones recibidas por cliente contra el broadcast global anterior, en el
+que cada cliente recibía todas las placas.
+
+Comprueba además el enrutamiento: cada suscriptor de placa recibe un frame
+por tick solo con su placa, cada suscriptor de región recibe exactamente
+las posiciones que cayeron dentro de sus celdas, y el total entregado es
+menor que el del broadcast.
+
+Uso (desde ms_delivery/):
+    python -m benchmarks.tracking_rooms_bench
+"""
+from config import Config
+from app import create_app, socketio
+from app.business.controllers.motorcycle_controller import ruta
+from app.business.services.fleet_scheduler import FleetScheduler, _PlateState
+from app.business.services.route_loader import Route
+from app.business.services.tracking_rooms import tile_of, tiles_for_bounds
+
+# Configuración
+PLATES = 1000
+CLIENTS = 50
+TICKS = 10
+
+
+class BenchConfig(Config):
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    POSITION_HISTORY_DIR = None
+
+
+def _offset_route(n):
+    # Cada placa arranca en un punto distinto de la misma ruta
+    shift = (n * 7) % len(ruta)
+    return Route(
+        list(ruta.lats[shift:]) + list(ruta.lats[:shift]),
+        list(ruta.lngs[shift:]) + list(ruta.lngs[:shift]),
+    )
+
+
+def run():
+    app = create_app(BenchConfig)
+    scheduler = FleetScheduler(socketio)
+    plates = [f"BENCH{n:05d}" for n in range(PLATES)]
+    for n, plate in enumerate(plates):
+        scheduler.plates[plate] = _PlateState(plate, _offset_route(n))
+
+    clients, wanted = [], []
+    for n in range(CLIENTS):
+        client = socketio.test_client(app)
+        if n % 2 == 0:
+            client.emit('subscribe_plate', {"plate": plates[n]})
+            wanted.append(plates[n])
+        else:
+            # Viewport pequeño alrededor de un punto de la ruta
+            lat, lng = ruta.lats.item(n), ruta.lngs.item(n)
+            bounds = {"south": lat - 0.002, "west": lng - 0.002, "north": lat + 0.002, "east": lng + 0.002}
+            client.emit('subscribe_region', bounds)
+            wanted.append(set(tiles_for_bounds(bounds['south'], bounds['west'], bounds['north'], bounds['east'])))
+        client.get_received()
+        clients.append(client)
+
+    frames = []
+    for _ in range(TICKS):
+        frame = scheduler.tick()
+        frames.append(frame)
+        scheduler.emit(frame)
+    broadcast_positions = sum(len(frame) for frame in frames)
+
+    results = []
+    for n, (client, target) in enumerate(zip(clients, wanted)):
+        received = [msg for msg in client.get_received() if msg['name'] == FleetScheduler.EVENT]
+        items = [(item['plate'], item['lat'], item['lng']) for msg in received for item in msg['args'][0]]
+        if isinstance(target, str):
+            assert len(received) == TICKS, f"cliente {n}: {len(received)} frames de su placa"
+            assert all(plate == target for plate, _, _ in items), f"cliente {n}: recibió otras placas"
+        else:
+            expected = [(item['plate'], item['lat'], item['lng']) for frame in frames for item in frame
+                        if tile_of(item['lat'], item['lng']) in target]
+            assert sorted(items) == sorted(expected), f"cliente {n}: posiciones fuera de sus celdas o faltantes"
+        results.append(('placa' if n % 2 == 0 else 'región', len(received), len(items)))
+        client.disconnect()
+
+    total = sum(positions for _, _, positions in results)
+    assert total < broadcast_positions * CLIENTS, "las salas no reducen lo entregado frente al broadcast"
+    return broadcast_positions, results
+
+
+if __name__ == '__main__':
+    broadcast_positions, results = run()
+    print(f"{PLATES} placas, {CLIENTS} clientes, {TICKS} ticks")
+    print(f"broadcast global: {broadcast_positions} posiciones por cliente")
+    print(f"{'cliente':>8} {'tipo':>7} {'frames':>7} {'posiciones':>11}")
+    for n, (kind, frames, positions) in enumerate(results):
+        print(f"{n:>8} {kind:>7} {frames:>7} {positions:>11}")
+    total = sum(r[2] for r in results)
+    print(f"total entregado: {total} posiciones (broadcast: {broadcast_positions * CLIENTS})")
@@ -6,4 +6,50 @@ load_dotenv()
 class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-key-for-development'
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///restaurant_delivery.db'
-    SQLALCHEMY_TRACK_MODIFICATIONS = False
\ No newline at end of file
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Perfil del motor (app/business/services/database_profile.py): 'tuned' aplica los pragmas
+    # de SQLite o el pool de bases de servidor; 'default' deja los valores del driver
+    DATABASE_PROFILE = os.environ.get('DATABASE_PROFILE', 'tuned')
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 10))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 20))
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 1800))
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', 30))
+    # Aplicar al iniciar las migraciones pendientes de app/migrations
+    AUTO_MIGRATE = os.environ.get('AUTO_MIGRATE', '1') != '0'
+    POSITION_HISTORY_DIR = os.environ.get('POSITION_HISTORY_DIR') or os.path.join('instance', 'position_history')
+    # Tracking simulado: tolerancia en metros de la simplificación Douglas–Peucker de la ruta,
+    # segundos entre emisiones de la flota (1 = 1 Hz, 5 = 0.2 Hz) y velocidad por defecto en m/s
+    ROUTE_TOLERANCE = float(os.environ.get('ROUTE_TOLERANCE', 5))
+    TRACKING_INTERVAL = float(os.environ.get('TRACKING_INTERVAL', 3))
+    TRACKING_SPEED = float(os.environ.get('TRACKING_SPEED', 10))
+    # Varios workers: estado del tracking y cola de Socket.IO compartidos (p. ej. redis://localhost:6379/0)
+    TRACKING_STATE_URL = os.environ.get('TRACKING_STATE_URL')
+    SOCKETIO_MESSAGE_QUEUE = os.environ.get('SOCKETIO_MESSAGE_QUEUE')
+    # Nombre del worker; también nombra su partición del historial de posiciones
+    TRACKING_WORKER_ID = os.environ.get('TRACKING_WORKER_ID')
+    # Invalidación de cachés en memoria entre workers; por defecto el mismo Redis del tracking
+    CACHE_BUS_URL = os.environ.get('CACHE_BUS_URL') or TRACKING_STATE_URL
+    MENU_CACHE_SIZE = int(os.environ.get('MENU_CACHE_SIZE', 4096))
+    # Secuencias y registro de los eventos de órdenes compartidos entre workers; por defecto el Redis del tracking
+    ORDER_EVENTS_URL = os.environ.get('ORDER_EVENTS_URL') or TRACKING_STATE_URL
+    ORDER_EVENTS_BUFFER = int(os.environ.get('ORDER_EVENTS_BUFFER', 200))
+    # Despacho por lotes: segundos entre ciclos (0 lo desactiva), distancia máxima en metros
+    # de la motocicleta al restaurante, máximo de órdenes pendientes por ciclo y metros
+    # que compensa cada segundo de espera de una orden
+    DISPATCH_INTERVAL = float(os.environ.get('DISPATCH_INTERVAL', 10))
+    DISPATCH_MAX_DISTANCE = float(os.environ.get('DISPATCH_MAX_DISTANCE', 10000))
+    DISPATCH_BATCH = int(os.environ.get('DISPATCH_BATCH', 2000))
+    DISPATCH_WAIT_WEIGHT = float(os.environ.get('DISPATCH_WAIT_WEIGHT', 1.0))
+    # Planificación de paradas: presupuesto de tiempo en ms y pares de puntos en la caché de distancias
+    ROUTE_PLAN_BUDGET_MS = float(os.environ.get('ROUTE_PLAN_BUDGET_MS', 100))
+    ROUTE_PLAN_CACHE_SIZE = int(os.environ.get('ROUTE_PLAN_CACHE_SIZE', 200000))
+    # ETA de las órdenes: segundos que debe moverse la hora de llegada para emitirla,
+    # vida media en segundos del promedio de velocidad por placa, segundos entre
+    # lecturas de las órdenes vigiladas y destinos proyectados en la caché
+    ETA_PUSH_THRESHOLD = float(os.environ.get('ETA_PUSH_THRESHOLD', 30))
+    ETA_SPEED_HALF_LIFE = float(os.environ.get('ETA_SPEED_HALF_LIFE', 30))
+    ETA_REFRESH = float(os.environ.get('ETA_REFRESH', 15))
+    ETA_CACHE_SIZE = int(os.environ.get('ETA_CACHE_SIZE', 10000))
+    RESPONSE_CACHE_SIZE = int(os.environ.get('RESPONSE_CACHE_SIZE', 256))
+    # Codificador JSON: 'auto' usa orjson si está instalado, 'orjson' lo exige, 'default' es el de Flask
+    JSON_PROVIDER = os.environ.get('JSON_PROVIDER', 'auto')
@@ -0,0 +1,193 @@
+"""
+Generador de carga para el tracking de la flota.
+
+Registra N motocicletas, inicia su transmisión en paralelo con
+`run.iniciar_tracking`, conecta M clientes Socket.IO suscritos a placas y
+mide durante el tiempo indicado la latencia emisión→recepción, los
+mensajes por segundo y el CPU del servidor. Al final detiene el tracking
+con `stop.detener_tracking` y escribe un reporte JSON.
+
+La latencia usa el campo `ts` que el servidor agrega a cada posición, así
+que servidor y generador deben compartir reloj (mismo host o NTP). El CPU
+del servidor se lee de /proc cuando se indica --server-pid.
+
+Uso (desde ms_delivery/, con el servidor corriendo):
+    python coordinates/load_test.py --motorcycles 1000 --clients 50 --duration 60
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+import socketio
+
+from run import BASE_URL, iniciar_tracking
+from stop import detener_tracking
+
+PLATE_PREFIX = "LOAD"
+
+
+def _percentile(values, p):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def _process_cpu_seconds(pid):
+    """CPU (usuario + sistema) consumido por el proceso, o None si no se puede leer"""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+    except (OSError, IndexError):
+        return None
+    # utime y stime son los campos 14 y 15 de stat (11 y 12 tras el nombre)
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def seed_motorcycles(base_url, count, http):
+    """Crea las motocicletas de carga que aún no existen y devuelve sus placas"""
+    plates = [f"{PLATE_PREFIX}{n:05d}" for n in range(count)]
+    response = http.get(f"{base_url}/motorcycles")
+    response.raise_for_status()
+    existing = {m["license_plate"] for m in response.json()}
+
+    missing = [plate for plate in plates if plate not in existing]
+    for plate in missing:
+        http.post(f"{base_url}/motorcycles", json={
+            "license_plate": plate, "brand": "LoadTest", "year": 2024, "status": "available"
+        }).raise_for_status()
+    return plates, len(missing)
+
+
+class TrackingClient:
+    """Cliente Socket.IO que cuenta mensajes y latencias de las placas suscritas"""
+
+    def __init__(self, base_url, plates):
+        self.base_url = base_url
+        self.plates = plates
+        self.messages = 0
+        self.positions = 0
+        self.latencies = []
+        self._lock = threading.Lock()
+        self.sio = socketio.Client(reconnection=False)
+        self.sio.on("positions", self._on_positions)
+        self.sio.on("connect", self._on_connect)
+
+    def _on_connect(self):
+        for plate in self.plates:
+            self.sio.emit("subscribe_plate", {"plate": plate})
+
+    def _on_positions(self, frame):
+        now = time.time() * 1000
+        with self._lock:
+            self.messages += 1
+            self.positions += len(frame)
+            self.latencies.extend(now - item["ts"] for item in frame if "ts" in item)
+
+    def connect(self):
+        self.sio.connect(self.base_url, transports=["websocket"])
+
+    def reset(self):
+        with self._lock:
+            self.messages = 0
+            self.positions = 0
+            self.latencies = []
+
+    def disconnect(self):
+        self.sio.disconnect()
+
+
+def run(args):
+    http = requests.Session()
+    plates, created = seed_motorcycles(args.base_url, args.motorcycles, http)
+    print(f"🏍️  {len(plates)} motocicletas listas ({created} creadas)")
+
+    clients = [
+        TrackingClient(args.base_url, [plates[(c * args.subscriptions + s) % len(plates)] for s in range(args.subscriptions)])
+        for c in range(args.clients)
+    ]
+    for client in clients:
+        client.connect()
+    print(f"🔌 {len(clients)} clientes conectados")
+
+    # Iniciar todas las placas a la vez
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        started = sum(pool.map(lambda p: iniciar_tracking(p, args.base_url, http, verbose=False), plates))
+    start_seconds = time.perf_counter() - start
+    print(f"🚀 {started} transmisiones iniciadas en {start_seconds:.2f} s")
+
+    # Descartar el calentamiento y medir la ventana
+    time.sleep(args.warmup)
+    for client in clients:
+        client.reset()
+    cpu_before = _process_cpu_seconds(args.server_pid) if args.server_pid else None
+    window_start = time.perf_counter()
+    time.sleep(args.duration)
+    window = time.perf_counter() - window_start
+    cpu_after = _process_cpu_seconds(args.server_pid) if args.server_pid else None
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(lambda p: detener_tracking(p, args.base_url, http, verbose=False), plates))
+    for client in clients:
+        client.disconnect()
+
+    latencies = [latency for client in clients for latency in client.latencies]
+    messages = sum(client.messages for client in clients)
+    positions = sum(client.positions for client in clients)
+    server_cpu = None
+    if cpu_before is not None and cpu_after is not None:
+        server_cpu = (cpu_after - cpu_before) / window * 100
+
+    return {
+        "config": {
+            "base_url": args.base_url,
+            "motorcycles": len(plates),
+            "clients": len(clients),
+            "subscriptions_per_client": args.subscriptions,
+            "duration_s": args.duration,
+            "warmup_s": args.warmup,
+        },
+        "tracking_started": started,
+        "start_all_s": round(start_seconds, 3),
+        "window_s": round(window, 3),
+        "messages": messages,
+        "messages_per_s": round(messages / window, 2),
+        "positions_per_s": round(positions / window, 2),
+        "latency_ms": {
+            "samples": len(latencies),
+            "p50": _percentile(latencies, 0.50),
+            "p90": _percentile(latencies, 0.90),
+            "p99": _percentile(latencies, 0.99),
+            "max": max(latencies) if latencies else None,
+        },
+        "server_cpu_percent": None if server_cpu is None else round(server_cpu, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generador de carga del tracking de motocicletas")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--motorcycles", type=int, default=100, help="N motocicletas a transmitir")
+    parser.add_argument("--clients", type=int, default=10, help="M clientes Socket.IO")
+    parser.add_argument("--subscriptions", type=int, default=1, help="placas suscritas por cliente")
+    parser.add_argument("--duration", type=float, default=30, help="segundos de medición")
+    parser.add_argument("--warmup", type=float, default=5, help="segundos descartados al inicio")
+    parser.add_argument("--concurrency", type=int, default=32, help="peticiones HTTP en paralelo")
+    parser.add_argument("--server-pid", type=int, help="PID del servidor para medir su CPU")
+    parser.add_argument("--output", default="load_report.json")
+    args = parser.parse_args()
+
+    report = run(args)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+    print(f"📄 Reporte escrito en {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,17 +8,20 @@ BASE_URL = "http://localhost:5000"
 PLATE = "ABC124"
 
 
-def iniciar_tracking():
-    url = f"{BASE_URL}/motorcycles/track/{PLATE}"
+def iniciar_tracking(plate=PLATE, base_url=BASE_URL, http=requests, verbose=True):
+    url = f"{base_url}/motorcycles/track/{plate}"
     try:
-        print(f"🚀 Enviando solicitud POST a {url}")
-        response = requests.post(url)
+        if verbose:
+            print(f"🚀 Enviando solicitud POST a {url}")
+        response = http.post(url)
         response.raise_for_status()
-        print(f"🔁 Respuesta del servidor: {response.json()}")
+        if verbose:
+            print(f"🔁 Respuesta del servidor: {response.json()}")
     except requests.RequestException as e:
         print(f"❌ Error al iniciar el tracking: {e}")
         return False
     return True
 
 
-iniciar_tracking()
+if __name__ == "__main__":
+    iniciar_tracking()